@@ -0,0 +1,89 @@
+# assets.py
+# Carregamento de texturas em segundo plano: os PNGs são decodificados e redimensionados
+# num pool de threads, e o envio para o GL (que só pode acontecer na thread principal)
+# é feito aos poucos, com um limite de tempo por frame.
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+from OpenGL.GL import *
+
+from render import FULL_UV
+
+ASSET_WORKERS = 2
+UPLOAD_BUDGET = 0.002 # segundos de upload para o GL por frame
+
+def decode_image(filename, size=None):
+    # Roda fora da thread principal, então não pode usar convert_alpha (depende da janela).
+    # O frombuffer em RGBA dá uma superfície de 32 bits, com o mesmo resultado no smoothscale.
+    img = pygame.image.load(filename)
+    img = pygame.image.frombuffer(pygame.image.tostring(img, "RGBA"), img.get_size(), "RGBA")
+    if size:
+        img = pygame.transform.smoothscale(img, size)
+    width, height = img.get_size()
+    return pygame.image.tostring(img, "RGBA", True), width, height
+
+def upload_texture(img_data, width, height):
+    tex_id = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, tex_id)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, img_data)
+    return tex_id, width, height, FULL_UV
+
+class AssetManager:
+    def __init__(self, workers=ASSET_WORKERS, upload_budget=UPLOAD_BUDGET):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.upload_budget = upload_budget
+        # (arquivo, tamanho) -> textura pronta, ou Future da decodificação ainda não enviada ao GL
+        self.textures = {}
+        self.pending = {}
+
+    def request(self, filename, size=None):
+        # Agenda a decodificação sem bloquear; pedidos repetidos são ignorados
+        key = (filename, tuple(size) if size else None)
+        if key in self.textures or key in self.pending:
+            return
+        if not os.path.exists(filename):
+            print(f"Erro: Arquivo de textura não encontrado: {filename}")
+            self.textures[key] = None
+            return
+        self.pending[key] = self.executor.submit(decode_image, filename, size)
+
+    def _finish(self, key):
+        future = self.pending.pop(key)
+        try:
+            texture = upload_texture(*future.result())
+        except (pygame.error, OSError, ValueError) as e:
+            print(f"Erro: Não foi possível carregar a textura {key[0]}: {e}")
+            texture = None
+        self.textures[key] = texture
+        return texture
+
+    def pump(self, budget=None):
+        # Chamado uma vez por frame na thread principal: envia ao GL as imagens já decodificadas
+        # até estourar o orçamento de tempo (budget=0 envia tudo o que estiver pronto)
+        if budget is None:
+            budget = self.upload_budget
+        start = time.perf_counter()
+        for key, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            self._finish(key)
+            if budget and time.perf_counter() - start >= budget:
+                break
+
+    def get(self, filename, size=None):
+        # Mesmo formato do load_texture. Se a imagem ainda não estiver pronta, espera por ela
+        key = (filename, tuple(size) if size else None)
+        if key in self.textures:
+            return self.textures[key]
+        self.request(filename, size)
+        if key in self.pending:
+            return self._finish(key)
+        return self.textures[key]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
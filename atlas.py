@@ -0,0 +1,143 @@
+# atlas.py
+# Empacota os sprites pequenos numa única textura (atlas) com tabela de coordenadas UV.
+# O resultado fica em cache no disco, indexado pelo hash dos arquivos de origem, para que
+# as próximas execuções não precisem decodificar nem redimensionar os PNGs.
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+ATLAS_VERSION = 1
+ATLAS_CACHE_DIR = '.cache'
+PADDING = 2 # borda repetida em volta de cada sprite para o filtro linear não "vazar" para o vizinho
+
+def _file_digest(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _cache_key(entries):
+    h = hashlib.sha1(f"atlas-v{ATLAS_VERSION}-pad{PADDING}".encode())
+    for filename, size in entries:
+        h.update(f"{filename}:{size[0]}x{size[1]}:{_file_digest(filename)};".encode())
+    return h.hexdigest()
+
+def _decode(filename, size):
+    # Mesmo caminho do load_texture: convert_alpha, smoothscale e linhas de baixo para cima
+    img = pygame.image.load(filename).convert_alpha()
+    img = pygame.transform.smoothscale(img, size)
+    pixels = np.frombuffer(pygame.image.tostring(img, "RGBA", True), np.uint8)
+    return pixels.reshape(size[1], size[0], 4)
+
+def _pack(sizes, width):
+    # Empacotamento em prateleiras, dos sprites mais altos para os mais baixos
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions = [None] * len(sizes)
+    x = y = shelf_h = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width:
+            x = 0
+            y += shelf_h
+            shelf_h = 0
+        positions[i] = (x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+    return positions, y + shelf_h
+
+def _build(entries):
+    tiles = [np.pad(_decode(filename, size), ((PADDING, PADDING), (PADDING, PADDING), (0, 0)), mode='edge')
+             for filename, size in entries]
+    sizes = [(tile.shape[1], tile.shape[0]) for tile in tiles]
+
+    # A largura começa grande o bastante para o sprite mais largo caber numa prateleira
+    width = 64
+    while width < max(w for w, h in sizes):
+        width *= 2
+    while True:
+        positions, used_h = _pack(sizes, width)
+        height = 64
+        while height < used_h:
+            height *= 2
+        if height <= width:
+            break
+        width *= 2
+
+    pixels = np.zeros((height, width, 4), np.uint8)
+    regions = []
+    for tile, (x, y), (filename, size) in zip(tiles, positions, entries):
+        pixels[y:y + tile.shape[0], x:x + tile.shape[1]] = tile
+        regions.append((x + PADDING, y + PADDING, size[0], size[1]))
+    return pixels, regions
+
+def _load_cache(meta_path, data_path):
+    with open(meta_path, 'r') as f:
+        meta = json.load(f)
+    width, height = meta["width"], meta["height"]
+    pixels = np.fromfile(data_path, np.uint8)
+    if pixels.size != width * height * 4:
+        raise ValueError("atlas em cache com tamanho inválido")
+    return pixels.reshape(height, width, 4), [tuple(r) for r in meta["regions"]]
+
+def _save_cache(meta_path, data_path, pixels, regions):
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    # Grava primeiro os pixels e só depois o .json, sempre via arquivo temporário + rename
+    pixels.tofile(data_path + '.tmp')
+    os.replace(data_path + '.tmp', data_path)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump({"width": pixels.shape[1], "height": pixels.shape[0], "regions": regions}, f)
+    os.replace(meta_path + '.tmp', meta_path)
+
+def _evict(cache_dir, key):
+    # Remove os atlas de versões anteriores da arte: só o atual fica no cache
+    keep = (f"atlas-{key}.json", f"atlas-{key}.rgba")
+    for name in os.listdir(cache_dir):
+        if name.startswith("atlas-") and name not in keep:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError as e:
+                print(f"Aviso: não foi possível remover o atlas antigo {name}: {e}")
+
+def _upload(pixels):
+    tex_id = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, tex_id)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, pixels.shape[1], pixels.shape[0], 0, GL_RGBA, GL_UNSIGNED_BYTE, pixels)
+    return tex_id
+
+def load_atlas(entries, cache_dir=ATLAS_CACHE_DIR):
+    # entries: lista de (arquivo, (largura, altura)); devolve {(arquivo, (largura, altura)): (tex_id, w, h, uv)}
+    found = []
+    for filename, size in entries:
+        if not os.path.exists(filename):
+            print(f"Erro: Arquivo de textura não encontrado: {filename}")
+            continue
+        if (filename, tuple(size)) not in found:
+            found.append((filename, tuple(size)))
+    if not found:
+        return {}
+
+    key = _cache_key(found)
+    meta_path = os.path.join(cache_dir, f"atlas-{key}.json")
+    data_path = os.path.join(cache_dir, f"atlas-{key}.rgba")
+    try:
+        pixels, regions = _load_cache(meta_path, data_path)
+    except (OSError, ValueError, KeyError):
+        pixels, regions = _build(found)
+        try:
+            _save_cache(meta_path, data_path, pixels, regions)
+            _evict(cache_dir, key)
+        except OSError as e:
+            print(f"Aviso: não foi possível salvar o atlas em cache: {e}")
+
+    tex_id = _upload(pixels)
+    height, width = pixels.shape[:2]
+    sprites = {}
+    for entry, (x, y, w, h) in zip(found, regions):
+        uv = (x / width, y / height, (x + w) / width, (y + h) / height)
+        sprites[entry] = (tex_id, w, h, uv)
+    return sprites
@@ -0,0 +1,215 @@
+# audio.py
+# Efeitos sonoros: cada arquivo é decodificado uma única vez por processo (SoundBank) e
+# tocado por um gerenciador de vozes com canais próprios. Cada som tem um limite de vozes
+# simultâneas, uma prioridade e um intervalo mínimo entre disparos, então uma rajada de
+# tiros custa o mesmo número de canais que um tiro só.
+# A música (MusicPlayer) é decodificada inteira para a memória em segundo plano (não é
+# streaming) e continua tocando entre as telas.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+# nome -> (arquivo, vozes simultâneas, prioridade, intervalo mínimo em segundos)
+SOUND_EFFECTS = {
+    "tiro": ('tiro.mp3', 2, 1, 0.05),
+    "tiro_alien": ('tiro_alien.mp3', 2, 1, 0.05),
+    "explosao": ('explosao.mp3', 3, 2, 0.03),
+    "perde_vida": ('perde_vida.mp3', 1, 3, 0.0)
+}
+NUM_VOICES = 8 # canais reservados para os efeitos
+MUSIC_FILE = 'musica.mp3'
+MUSIC_CHANNELS = (NUM_VOICES, NUM_VOICES + 1) # duas faixas, para o crossfade
+MUSIC_FADE_MS = 800
+
+def reserve_channels(count):
+    # Os primeiros canais ficam fora do Sound.play() automático do pygame
+    if pygame.mixer.get_num_channels() < count:
+        pygame.mixer.set_num_channels(count)
+    pygame.mixer.set_reserved(max(count, MUSIC_CHANNELS[-1] + 1))
+
+class SoundBank:
+    def __init__(self):
+        self.sounds = {}
+        # A música é decodificada numa thread (o pygame solta o GIL durante a decodificação).
+        # A trava só protege o dicionário: decodificar fora dela deixa a thread principal pegar
+        # os efeitos já prontos enquanto a música ainda está sendo decodificada. O SDL_mixer
+        # decodifica um arquivo por vez, então os efeitos devem ser carregados antes da música
+        self.lock = threading.Lock()
+
+    def get(self, filename):
+        with self.lock:
+            sound = self.sounds.get(filename)
+        if sound is not None:
+            return sound
+        try:
+            sound = pygame.mixer.Sound(filename)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Erro: não foi possível carregar o som {filename}: {e}")
+            return None
+        with self.lock:
+            # Se outra thread decodificou o mesmo arquivo ao mesmo tempo, fica o primeiro
+            return self.sounds.setdefault(filename, sound)
+
+sound_bank = SoundBank()
+
+class Voice:
+    # Mesmo uso de um pygame.mixer.Sound (som.play()), mas passando pelo gerenciador
+    __slots__ = ('manager', 'name')
+
+    def __init__(self, manager, name):
+        self.manager = manager
+        self.name = name
+
+    def play(self):
+        return self.manager.play(self.name)
+
+class VoiceManager:
+    def __init__(self, effects=SOUND_EFFECTS, num_voices=NUM_VOICES, bank=sound_bank):
+        self.effects = effects
+        self.bank = bank
+        reserve_channels(num_voices)
+        self.channels = [pygame.mixer.Channel(i) for i in range(num_voices)]
+        # Por canal: nome do som tocando e quando começou
+        self.playing = [None] * num_voices
+        self.started = [0.0] * num_voices
+        self.last_play = {}
+        self.sounds = {name: bank.get(effect[0]) for name, effect in effects.items()}
+
+    def voice(self, name):
+        return Voice(self, name)
+
+    def voices(self):
+        return {name: Voice(self, name) for name in self.effects}
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        _, max_voices, priority, min_interval = self.effects[name]
+        now = time.perf_counter()
+        # Disparos mais próximos que min_interval são ignorados
+        if now - self.last_play.get(name, -min_interval) < min_interval:
+            return None
+
+        free = None
+        same = []
+        victim = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                self.playing[i] = None
+                if free is None:
+                    free = i
+            elif self.playing[i] == name:
+                same.append(i)
+            elif self.playing[i] and self.effects[self.playing[i]][2] < priority:
+                # Voz de prioridade menor que pode ser roubada: a mais antiga
+                if victim is None or self.started[i] < self.started[victim]:
+                    victim = i
+
+        if len(same) >= max_voices:
+            # No limite de vozes deste som: reinicia a mais antiga
+            index = min(same, key=self.started.__getitem__)
+        elif free is not None:
+            index = free
+        elif victim is not None:
+            index = victim
+        else:
+            return None
+
+        channel = self.channels[index]
+        channel.play(sound)
+        self.playing[index] = name
+        self.started[index] = now
+        self.last_play[name] = now
+        return channel
+
+    def stop(self):
+        for i, channel in enumerate(self.channels):
+            channel.stop()
+            self.playing[i] = None
+
+class MusicPlayer:
+    # A faixa fica decodificada na memória e toca num canal próprio: trocar de tela, pausar
+    # ou começar um jogo novo nunca recarrega o arquivo
+    def __init__(self, bank=sound_bank, channels=MUSIC_CHANNELS):
+        self.bank = bank
+        self.channel_ids = channels
+        self.channels = None
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.prefetched = {}
+        self.track = None
+        self.current = 0
+        # Pedido feito antes da decodificação terminar: (arquivo, loops, fade_ms), tocado em update()
+        self.wanted = None
+        self.paused = False
+
+    def prefetch(self, filename):
+        # Decodifica a próxima faixa em segundo plano
+        if filename not in self.prefetched:
+            self.prefetched[filename] = self.executor.submit(self.bank.get, filename)
+
+    def _channel(self, index):
+        if self.channels is None:
+            reserve_channels(max(self.channel_ids) + 1)
+            self.channels = [pygame.mixer.Channel(i) for i in self.channel_ids]
+        return self.channels[index]
+
+    def play(self, filename=MUSIC_FILE, loops=-1, fade_ms=MUSIC_FADE_MS, restart=False):
+        # Continua a faixa se ela já estiver tocando; senão (ou com restart) faz o crossfade
+        # da faixa atual para o começo da nova
+        if filename == self.track and not restart and self._channel(self.current).get_busy():
+            self.resume()
+            return
+        self.prefetch(filename)
+        future = self.prefetched[filename]
+        if not future.done():
+            # Ainda decodificando: o jogo começa sem esperar e a música entra no update()
+            self.wanted = (filename, loops, fade_ms)
+            return
+        sound = future.result()
+        self.wanted = None
+        if sound is None:
+            return
+        old = self._channel(self.current)
+        if old.get_busy():
+            old.fadeout(fade_ms)
+            self.current = 1 - self.current
+        self._channel(self.current).play(sound, loops=loops, fade_ms=fade_ms)
+        self.track = filename
+        self.paused = False
+
+    def update(self):
+        # Chamado a cada frame: começa a faixa pedida assim que ela estiver decodificada
+        if self.wanted and self.prefetched[self.wanted[0]].done():
+            filename, loops, fade_ms = self.wanted
+            self.play(filename, loops, fade_ms, restart=True)
+
+    def pause(self):
+        if self.channels:
+            for channel in self.channels:
+                channel.pause()
+        self.paused = True
+
+    def resume(self):
+        if self.channels and self.paused:
+            for channel in self.channels:
+                channel.unpause()
+        self.paused = False
+
+    def stop(self, fade_ms=0):
+        self.wanted = None
+        if self.channels:
+            for channel in self.channels:
+                if fade_ms:
+                    channel.fadeout(fade_ms)
+                else:
+                    channel.stop()
+        self.track = None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+music = MusicPlayer()
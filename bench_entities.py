@@ -0,0 +1,84 @@
+# bench_entities.py
+# Memória por entidade e tempo de construção da formação (normal e com 10.000 aliens)
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+from game import GameState, SHIP_ATTRIBUTES, WIDTH, HEIGHT
+
+def measure(build, repeat):
+    # Menor tempo entre as repetições e bytes alocados (e não liberados) pela última construção
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    del result
+    tracemalloc.stop()
+    return best, used
+
+def bench_formation(state, repeat):
+    def rebuild():
+        state.formation.clear()
+        state.spawn_formation()
+    fresh = lambda: GameState(SHIP_ATTRIBUTES["nave.png"])
+    count = state.formation.count
+    t_new, _ = measure(fresh, repeat)
+    t_rebuild, _ = measure(rebuild, repeat)
+    print(f"formação completa ({count} aliens): GameState novo {t_new * 1e3:.3f} ms, "
+          f"recriar a formação {t_rebuild * 1e3:.3f} ms ({t_rebuild / count * 1e6:.2f} us/alien)")
+
+def bench_wave(size, repeat):
+    xs = [random.uniform(0, WIDTH) for _ in range(size)]
+    ys = [random.uniform(HEIGHT / 2, HEIGHT) for _ in range(size)]
+    kinds = [random.randrange(4) for _ in range(size)]
+
+    def first_wave():
+        state = GameState(SHIP_ATTRIBUTES["nave.png"])
+        state.formation.clear()
+        state.spawn_aliens(xs, ys, kinds)
+        return state
+
+    state = first_wave()
+    def next_wave():
+        state.formation.clear()
+        state.spawn_aliens(xs, ys, kinds)
+
+    t_first, used = measure(first_wave, repeat)
+    t_next, _ = measure(next_wave, repeat)
+    print(f"onda de {size} aliens: primeira {t_first * 1e3:.2f} ms ({used / size:.1f} bytes/alien com os arrays), "
+          f"seguintes {t_next * 1e3:.2f} ms")
+
+def bench_sizes(state):
+    alien = state.aliens[0]
+    sizes = {
+        "Alien": sys.getsizeof(alien),
+        "Ship": sys.getsizeof(state.ship),
+        "linha da AlienFormation": sum(column.itemsize for column in
+                                       (getattr(state.formation, name) for name in state.formation.COLUMNS))
+    }
+    for name, size in sizes.items():
+        print(f"{name}: {size} bytes")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória e construção das entidades")
+    parser.add_argument("--wave", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    state = GameState(SHIP_ATTRIBUTES["nave.png"])
+    bench_sizes(state)
+    bench_formation(state, args.repeat)
+    bench_wave(args.wave, max(1, args.repeat // 4))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+# benchmarks.py
+# Cenários fixos da lógica do jogo (sem janela), com semente fixa, medindo o custo de cada
+# tick (p50/p99) e as alocações. O resultado sai em JSON e pode ser comparado com uma base
+# salva antes, para pegar regressões no passo do jogo, no Boss.update e nas colisões.
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from game import GameState, ScriptedInput, SHIP_ATTRIBUTES, WIDTH, HEIGHT, INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE
+from replay import state_digest
+
+BASELINE_FILE = 'bench_baseline.json'
+SCENARIO_LIVES = 10**6 # nenhum cenário deve terminar por falta de vidas
+
+def sweep(ticks=40):
+    # Vai e volta pela tela atirando sem parar
+    return [INPUT_LEFT | INPUT_FIRE] * ticks + [INPUT_RIGHT | INPUT_FIRE] * (2 * ticks) + [INPUT_LEFT | INPUT_FIRE] * ticks
+
+def new_state(seed):
+    state = GameState(SHIP_ATTRIBUTES["nave.png"], seed=seed)
+    state.ship.lives = SCENARIO_LIVES
+    return state
+
+def revive_formation(state):
+    formation = state.formation
+    formation.alive[:formation.count] = True
+
+# Cada cenário recebe a semente e devolve (estado, entrada, ajuste feito antes de cada tick, fora da medição)
+def formation_double_shot(seed):
+    state = new_state(seed)
+    def before(state):
+        # Formação de 5 linhas sempre cheia e tiro duplo sempre ativo
+        revive_formation(state)
+        if not state.ship.powerups["double_shot"]["active"]:
+            state.ship.activate_powerup("double_shot")
+    return state, ScriptedInput(sweep(), loop=True), before
+
+def boss_tracking(seed):
+    state = new_state(seed)
+    state.formation.clear()
+    state.aliens = []
+    state.nivel = 3
+    state.spawn_boss("boss_1")
+    state.boss.health = state.boss.max_health = 10**9
+    return state, ScriptedInput(sweep(), loop=True), None
+
+def boss_spread_dense(seed):
+    state = new_state(seed)
+    state.formation.clear()
+    state.aliens = []
+    state.nivel = 6
+    state.spawn_boss("boss_2")
+    # Rajada a cada 2 ticks: algumas centenas de tiros na tela ao mesmo tempo
+    state.boss.health = state.boss.max_health = 10**9
+    state.boss.max_cooldown = 2
+    return state, ScriptedInput(sweep(), loop=True), None
+
+def level_transition(seed):
+    state = new_state(seed)
+    def before(state):
+        # Todo tick mede a troca de nível: formação morta, nível 1 -> 2 (sem boss)
+        state.formation.alive[:state.formation.count] = False
+        state.nivel = 1
+        state.alien_speed = 2
+        state.attack_interval = 40
+    return state, ScriptedInput([INPUT_FIRE], loop=True), before
+
+def alien_stress_wave(seed):
+    state = new_state(seed)
+    rows, cols = 14, 25 # 10x a formação normal de 35 aliens
+    xs = np.tile(WIDTH / 2 - (cols - 1) * 15 + np.arange(cols) * 30, rows)
+    ys = np.repeat(HEIGHT - 60 - np.arange(rows) * 18, cols)
+    kinds = [state.formation_rng.randrange(len(state.alien_archetypes)) for _ in range(rows * cols)]
+    state.formation.clear()
+    state.spawn_aliens(xs, ys, kinds)
+    state.attack_interval = 2
+    return state, ScriptedInput(sweep(), loop=True), revive_formation
+
+SCENARIOS = {
+    "formation_double_shot": formation_double_shot,
+    "boss_1_tracking_shot": boss_tracking,
+    "boss_2_spread_shot_dense": boss_spread_dense,
+    "level_transition": level_transition,
+    "alien_stress_wave_10x": alien_stress_wave
+}
+
+def run_ticks(state, controls, before, ticks, times=None):
+    perf_counter_ns = time.perf_counter_ns
+    for i in range(ticks):
+        if before:
+            before(state)
+        actions = controls.read(state)
+        start = perf_counter_ns()
+        state.step(actions)
+        if times is not None:
+            times[i] = perf_counter_ns() - start
+
+def run_scenario(build, seed, ticks, warmup, repeat):
+    # Cada repetição refaz o cenário do zero; fica a repetição com menor p50, a menos
+    # afetada por ruído da máquina
+    best = None
+    for _ in range(repeat):
+        state, controls, before = build(seed)
+        run_ticks(state, controls, before, warmup)
+        times = np.zeros(ticks, np.int64)
+        run_ticks(state, controls, before, ticks, times)
+        if best is None or np.percentile(times, 50) < np.percentile(best, 50):
+            best = times
+    digest = state_digest(state)
+
+    # Alocações numa segunda execução idêntica: o tracemalloc deixaria os tempos bem mais lentos
+    state, controls, before = build(seed)
+    run_ticks(state, controls, before, warmup)
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    run_ticks(state, controls, before, ticks)
+    end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    us = best / 1e3
+    return {
+        "ticks": ticks,
+        "p50_us": round(float(np.percentile(us, 50)), 2),
+        "p99_us": round(float(np.percentile(us, 99)), 2),
+        "mean_us": round(float(us.mean()), 2),
+        "max_us": round(float(us.max()), 2),
+        "alloc_peak_kb": round((peak_bytes - start_bytes) / 1024, 1),
+        "alloc_net_bytes_per_tick": round((end_bytes - start_bytes) / ticks, 1),
+        "digest": digest
+    }
+
+def compare(results, baseline, tolerance):
+    # Uma regressão é p50 ou p99 acima da base mais a tolerância (0.25 = 25%)
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            print(f"{name}: sem base para comparar", file=sys.stderr)
+            continue
+        if base.get("digest") != result["digest"] or base.get("ticks") != result["ticks"]:
+            print(f"{name}: aviso: o cenário não termina no mesmo estado da base, os tempos não são comparáveis", file=sys.stderr)
+        for metric in ("p50_us", "p99_us"):
+            change = result[metric] / base[metric] - 1 if base[metric] else 0.0
+            status = "REGRESSÃO" if change > tolerance else "ok"
+            print(f"{name} {metric}: base {base[metric]:.1f} atual {result[metric]:.1f} ({change:+.0%}) {status}", file=sys.stderr)
+            if change > tolerance:
+                regressions.append((name, metric))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos cenários fixos da lógica do jogo")
+    parser.add_argument("scenarios", nargs="*", metavar="cenário", help="cenários a rodar (padrão: todos): " + ", ".join(SCENARIOS))
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: só na tela)")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE_FILE, help="compara com uma base salva")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE_FILE, help="salva o resultado como a nova base")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"cenário desconhecido: {name}")
+
+    results = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "scenarios": {}
+    }
+    for name in args.scenarios or SCENARIOS:
+        results["scenarios"][name] = run_scenario(SCENARIOS[name], args.seed, args.ticks, args.warmup, args.repeat)
+        print(f"{name}: {results['scenarios'][name]}", file=sys.stderr)
+
+    # O JSON vai para a saída padrão (ou --output); o resto das mensagens, para stderr
+    text = json.dumps(results, indent=2)
+    if not args.output:
+        print(text)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                f.write(text + "\n")
+
+    if args.baseline:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Erro: não foi possível ler a base {args.baseline}: {e}")
+            sys.exit(2)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,20 @@
 # boss.py
 
 import pygame
-from OpenGL.GL import *
-import random
 import math
+import numpy as np
+from entities import BulletPool
 
 WIDTH, HEIGHT = 800, 600
 
+# Tipos de tiro do boss (coluna "kind" do BulletPool de tiros)
+BULLET_SPREAD = 0
+BULLET_TRACKING = 1
+
 # Dicionário de configurações dos bosses
+# Chaves opcionais para padrões de tiro: "bullet_count", "spread_angle" e "bullet_speed" (spread_shot),
+# "homing_speed" e "turn_rate" em graus por tick (tiros teleguiados), "bullet_capacity" (tamanho
+# inicial do pool de tiros, que dobra quando enche)
 BOSS_CONFIGS = {
     "boss_1": {
         "health": 200,
@@ -27,10 +34,31 @@ BOSS_CONFIGS = {
     }
 }
 
+def steer_homing(x, y, vx, vy, target_x, target_y, speed, turn_rate):
+    # Mesma conta do tiro teleguiado original, feita para todos os tiros de uma vez:
+    # gira a direção atual em direção ao alvo, no máximo turn_rate radianos por tick
+    current_angle = np.arctan2(vy, vx)
+    desired_angle = np.arctan2(target_y - y, target_x - x)
+
+    angle_diff = desired_angle - current_angle
+    angle_diff = np.where(angle_diff > math.pi, angle_diff - 2 * math.pi,
+                          np.where(angle_diff < -math.pi, angle_diff + 2 * math.pi, angle_diff))
+    angle_diff = np.clip(angle_diff, -turn_rate, turn_rate)
+
+    new_angle = current_angle + angle_diff
+    return np.cos(new_angle) * speed, np.sin(new_angle) * speed
+
 class Boss:
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'texture', 'tex_w', 'tex_h', 'health', 'max_health', 'speed',
+                 'max_cooldown', 'attack_type', 'bullet_count', 'spread_angle', 'bullet_speed', 'homing_speed',
+                 'turn_rate', 'spread_dx', 'spread_dy', 'bullets', 'bullet_texture', 'bullet_tex_w', 'bullet_tex_h',
+                 'som_tiro', 'move_dir', 'cooldown')
+
     def __init__(self, config, texture, bullet_texture, som_tiro):
         self.x = WIDTH // 2
         self.y = HEIGHT - 100
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.texture = texture
         self.tex_w = texture[1]
         self.tex_h = texture[2]
@@ -41,8 +69,19 @@ class Boss:
         self.speed = config["speed"]
         self.max_cooldown = config["max_cooldown"]
         self.attack_type = config["attack_type"]
+        self.bullet_count = config.get("bullet_count", 5)
+        self.spread_angle = config.get("spread_angle", 60)
+        self.bullet_speed = config.get("bullet_speed", 4)
+        self.homing_speed = config.get("homing_speed", 4)
+        self.turn_rate = math.radians(config.get("turn_rate", 3))
+
+        # Direções da rajada são fixas: calculadas uma vez aqui, e não a cada tiro
+        start_angle = 270 - (self.spread_angle / 2)
+        angles = np.radians(start_angle + np.arange(self.bullet_count) * (self.spread_angle / max(self.bullet_count - 1, 1)))
+        self.spread_dx = np.cos(angles) * self.bullet_speed
+        self.spread_dy = np.sin(angles) * self.bullet_speed
         
-        self.bullets = []
+        self.bullets = BulletPool(config.get("bullet_capacity", 512))
         self.bullet_texture = bullet_texture
         self.bullet_tex_w = bullet_texture[1]
         self.bullet_tex_h = bullet_texture[2]
@@ -61,63 +100,24 @@ class Boss:
             self.shoot(ship)
             self.cooldown = 0
         
-        for b in self.bullets:
-            current_bullet_speed = 4
-            # Ponto a partir do qual as balas param de seguir
-            tracking_limit = HEIGHT / 2
-            if b[4] == "tracking" and b[1] > tracking_limit:
-                # Posição atual do tiro
-                bullet_x, bullet_y = b[0], b[1]
-                
-                # Vetor para o jogador
-                target_x, target_y = ship.x, ship.y
-                
-                # Calcula o ângulo atual do tiro
-                current_angle = math.atan2(b[3], b[2])
-                
-                # Calcula o ângulo desejado para o jogador
-                desired_angle = math.atan2(target_y - bullet_y, target_x - bullet_x)
-                
-                angle_diff = desired_angle - current_angle
-                
-                if angle_diff > math.pi:
-                    angle_diff -= 2 * math.pi
-                elif angle_diff < -math.pi:
-                    angle_diff += 2 * math.pi
-                
-                turn_rate = math.radians(3)
-                
-                if angle_diff > turn_rate:
-                    angle_diff = turn_rate
-                elif angle_diff < -turn_rate:
-                    angle_diff = -turn_rate
-                
-                new_angle = current_angle + angle_diff
-                
-                b[2] = math.cos(new_angle) * current_bullet_speed
-                b[3] = math.sin(new_angle) * current_bullet_speed
-            
-            # Move o tiro
-            b[0] += b[2] 
-            b[1] += b[3]
+        bullets = self.bullets
+        n = bullets.count
+        # Ponto a partir do qual as balas param de seguir
+        tracking_limit = HEIGHT / 2
+        homing = np.flatnonzero((bullets.kind[:n] == BULLET_TRACKING) & (bullets.y[:n] > tracking_limit))
+        if homing.size:
+            bullets.vx[homing], bullets.vy[homing] = steer_homing(
+                bullets.x[homing], bullets.y[homing], bullets.vx[homing], bullets.vy[homing],
+                ship.x, ship.y, self.homing_speed, self.turn_rate)
 
-        self.bullets = [b for b in self.bullets if b[1] > 0 and b[1] < HEIGHT and b[0] > 0 and b[0] < WIDTH]
+        # Move todos os tiros de uma vez e descarta os que saíram da tela
+        bullets.move()
+        bullets.keep_inside(0, 0, WIDTH, HEIGHT)
 
     def shoot(self, ship):
         if self.attack_type == "spread_shot":
-            num_bullets = 5
-            spread_angle = 60
-            bullet_speed = 4
-            
-            start_angle = 270 - (spread_angle / 2)
-            
-            for i in range(num_bullets):
-                angle = start_angle + i * (spread_angle / (num_bullets - 1))
-                dx = math.cos(math.radians(angle)) * bullet_speed
-                dy = math.sin(math.radians(angle)) * bullet_speed
-                
-                # Adiciona o tipo de ataque 'spread' para consistência
-                self.bullets.append([self.x, self.y - self.tex_h // 2, dx, dy, "spread"])
+            # Todos os tiros da rajada são criados de uma vez
+            self.bullets.spawn_many(self.x, self.y - self.tex_h // 2, self.spread_dx, self.spread_dy, BULLET_SPREAD)
             
         elif self.attack_type == "tracking_shot":
             bullet_speed = 3
@@ -131,13 +131,13 @@ class Boss:
             angle1 = base_angle - math.radians(offset_angle_degrees)
             dx1 = math.cos(angle1) * bullet_speed
             dy1 = math.sin(angle1) * bullet_speed
-            self.bullets.append([self.x, self.y - self.tex_h // 2, dx1, dy1, "tracking"])
+            self.bullets.spawn(self.x, self.y - self.tex_h // 2, dx1, dy1, BULLET_TRACKING)
 
             # --- Segundo Tiro (desviado para a direita) ---
             angle2 = base_angle + math.radians(offset_angle_degrees)
             dx2 = math.cos(angle2) * bullet_speed
             dy2 = math.sin(angle2) * bullet_speed
-            self.bullets.append([self.x, self.y - self.tex_h // 2, dx2, dy2, "tracking"])
+            self.bullets.spawn(self.x, self.y - self.tex_h // 2, dx2, dy2, BULLET_TRACKING)
         
         if self.som_tiro:
             self.som_tiro.play()
@@ -146,38 +146,27 @@ class Boss:
         self.health -= damage
         return self.health <= 0
 
-    def draw(self, is_lit):
+    def draw(self, batch, is_lit, alpha=1.0):
+        boss_x = self.prev_x + (self.x - self.prev_x) * alpha
+        boss_y = self.prev_y + (self.y - self.prev_y) * alpha
         if self.health > 0:
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            glEnable(GL_TEXTURE_2D)
-            glBindTexture(GL_TEXTURE_2D, self.texture[0])
-            glColor4f(1, 1, 1, 1)
-            x = self.x - self.tex_w // 2
-            y = self.y - self.tex_h // 2
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex2f(x, y)
-            glTexCoord2f(1, 0); glVertex2f(x + self.tex_w, y)
-            glTexCoord2f(1, 1); glVertex2f(x + self.tex_w, y + self.tex_h)
-            glTexCoord2f(0, 1); glVertex2f(x, y + self.tex_h)
-            glEnd()
-            glDisable(GL_TEXTURE_2D)
-            glDisable(GL_BLEND)
+            x = boss_x - self.tex_w // 2
+            y = boss_y - self.tex_h // 2
+            batch.add(self.texture[0], x, y, self.tex_w, self.tex_h, uv=self.texture[3])
             
             # --- Lógica da barra de vida fixa e centralizada ---
             fixed_bar_width = 100 # Largura fixa da barra de vida (em pixels)
             fixed_bar_height = 8 # Altura fixa da barra de vida (em pixels)
             
             # Posição central da barra (alinhada com o boss)
-            bar_center_x = self.x
-            bar_y = self.y + self.tex_h // 2 + 10 # Posição Y, um pouco abaixo do boss
+            bar_center_x = boss_x
+            bar_y = boss_y + self.tex_h // 2 + 10 # Posição Y, um pouco abaixo do boss
 
             # Posição inicial (canto esquerdo) da barra de vida
             bar_start_x = bar_center_x - (fixed_bar_width / 2)
             
             # Desenha a barra de fundo (barra vazia)
-            glColor3f(0.3, 0.3, 0.3) # Cor cinza escuro para o fundo da barra
-            glRectf(bar_start_x, bar_y, bar_start_x + fixed_bar_width, bar_y + fixed_bar_height)
+            batch.add_rect(bar_start_x, bar_y, bar_start_x + fixed_bar_width, bar_y + fixed_bar_height, (0.3, 0.3, 0.3, 1)) # Cinza escuro
 
             # Calcula a porcentagem de vida atual
             health_percentage = self.health / self.max_health
@@ -186,23 +175,13 @@ class Boss:
             current_bar_width = fixed_bar_width * health_percentage
             
             # Desenha a barra de vida preenchida
-            glColor3f(1, 0, 0) 
-            glRectf(bar_start_x, bar_y, bar_start_x + current_bar_width, bar_y + fixed_bar_height)
+            batch.add_rect(bar_start_x, bar_y, bar_start_x + current_bar_width, bar_y + fixed_bar_height, (1, 0, 0, 1))
         
-        for b in self.bullets:
-            if self.bullet_texture:
-                glEnable(GL_BLEND)
-                glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-                glEnable(GL_TEXTURE_2D)
-                glBindTexture(GL_TEXTURE_2D, self.bullet_texture[0])
-                glColor4f(1, 1, 1, 1)
-                bx = b[0] - self.bullet_texture[1] // 2
-                by = b[1]
-                glBegin(GL_QUADS)
-                glTexCoord2f(0, 0); glVertex2f(bx, by)
-                glTexCoord2f(1, 0); glVertex2f(bx + self.bullet_texture[1], by)
-                glTexCoord2f(1, 1); glVertex2f(bx + self.bullet_texture[1], by + self.bullet_texture[2])
-                glTexCoord2f(0, 1); glVertex2f(bx, by + self.bullet_texture[2])
-                glEnd()
-                glDisable(GL_TEXTURE_2D)
-                glDisable(GL_BLEND)
\ No newline at end of file
+        # Todos os tiros numa única chamada, recuados pela velocidade para interpolar
+        if self.bullet_texture:
+            n = self.bullets.count
+            back = alpha - 1
+            xs = self.bullets.x[:n] + back * self.bullets.vx[:n]
+            ys = self.bullets.y[:n] + back * self.bullets.vy[:n]
+            batch.add_many(self.bullet_texture[0], xs - self.bullet_texture[1] // 2, ys,
+                           self.bullet_texture[1], self.bullet_texture[2], uv=self.bullet_texture[3])
@@ -0,0 +1,48 @@
+# collision.py
+# Broadphase de colisões com hash espacial em grade uniforme
+
+import math
+import numpy as np
+
+def overlaps(x1, y1, x2, y2, half_w, half_h):
+    # Teste exato usado pelo jogo: distância em cada eixo estritamente menor que a meia-largura/altura
+    return abs(x1 - x2) < half_w and abs(y1 - y2) < half_h
+
+class SpatialHash:
+    def __init__(self, cell_w, cell_h):
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, key, x, y):
+        cell = (math.floor(x / self.cell_w), math.floor(y / self.cell_h))
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            self.cells[cell] = [key]
+        else:
+            bucket.append(key)
+
+    def query(self, x, y, half_w, half_h):
+        # Devolve as chaves das células que tocam a caixa [x-half_w, x+half_w] x [y-half_h, y+half_h].
+        # Todo ponto que passa em overlaps() está numa dessas células; o teste exato fica com quem chama.
+        cells = self.cells
+        if not cells:
+            return []
+        cx0 = math.floor((x - half_w) / self.cell_w)
+        cx1 = math.floor((x + half_w) / self.cell_w)
+        cy0 = math.floor((y - half_h) / self.cell_h)
+        cy1 = math.floor((y + half_h) / self.cell_h)
+        found = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+def box_hits(xs, ys, x, y, half_w, half_h):
+    # Versão vetorizada de overlaps() para muitos pontos contra uma única caixa (ex.: tiros do boss na nave)
+    return (np.abs(xs - x) < half_w) & (np.abs(ys - y) < half_h)
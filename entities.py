@@ -0,0 +1,170 @@
+# entities.py
+# Armazenamento das entidades em estrutura de arrays (SoA) com NumPy:
+# uma coluna por atributo e as entidades ativas nas posições [0, count)
+
+import numpy as np
+
+class EntityStore:
+    COLUMNS = {
+        "x": np.float64,
+        "y": np.float64,
+        "vx": np.float64,
+        "vy": np.float64,
+        "alive": np.bool_,
+        "kind": np.int16
+    }
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.capacity = 0
+        self._resize(capacity)
+
+    def _resize(self, capacity):
+        for name, dtype in self.COLUMNS.items():
+            column = np.zeros(capacity, dtype)
+            if self.capacity:
+                column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, vx=0.0, vy=0.0, kind=0):
+        if self.count == self.capacity:
+            self._resize(self.capacity * 2)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.alive[i] = True
+        self.kind[i] = kind
+        self.count += 1
+        return i
+
+    def spawn_many(self, x, y, vx, vy, kind=0):
+        # Cria várias entidades de uma vez (x, y, vx e vy podem ser escalares ou arrays)
+        k = max(np.size(x), np.size(y), np.size(vx), np.size(vy), np.size(kind))
+        while self.count + k > self.capacity:
+            self._resize(self.capacity * 2)
+        rows = slice(self.count, self.count + k)
+        self.x[rows] = x
+        self.y[rows] = y
+        self.vx[rows] = vx
+        self.vy[rows] = vy
+        self.alive[rows] = True
+        self.kind[rows] = kind
+        self.count += k
+
+    def clear(self):
+        self.count = 0
+
+    def move(self):
+        n = self.count
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+
+    def compact(self, keep=None):
+        # Remove as linhas fora da máscara preservando a ordem de criação
+        n = self.count
+        if keep is None:
+            keep = self.alive[:n]
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:k] = column[:n][keep]
+        self.count = k
+
+class AlienFormation(EntityStore):
+    # Cada alien tem no máximo um tiro, guardado na própria linha
+    COLUMNS = dict(EntityStore.COLUMNS, attacking=np.bool_, bullet_x=np.float64, bullet_y=np.float64, prev_x=np.float64)
+
+    def spawn(self, x, y, vx=0.0, vy=0.0, kind=0):
+        i = EntityStore.spawn(self, x, y, vx, vy, kind)
+        self.attacking[i] = False
+        self.prev_x[i] = x
+        return i
+
+    def spawn_many(self, x, y, vx, vy, kind=0):
+        start = self.count
+        EntityStore.spawn_many(self, x, y, vx, vy, kind)
+        self.attacking[start:self.count] = False
+        self.prev_x[start:self.count] = self.x[start:self.count]
+
+    def save_positions(self):
+        # Guarda o x do fim do tick anterior (a formação só anda na horizontal)
+        self.prev_x[:self.count] = self.x[:self.count]
+
+    def any_alive(self):
+        return bool(self.alive[:self.count].any())
+
+    def edges(self):
+        xs = self.x[:self.count][self.alive[:self.count]]
+        if not xs.size:
+            return None
+        return xs.min(), xs.max()
+
+    def advance(self, dx):
+        n = self.count
+        self.x[:n][self.alive[:n]] += dx
+
+    def attackers(self):
+        n = self.count
+        return np.flatnonzero(self.alive[:n] & ~self.attacking[:n])
+
+    def attack(self, i, bullet_y):
+        self.attacking[i] = True
+        self.bullet_x[i] = self.x[i]
+        self.bullet_y[i] = bullet_y
+
+    def update_bullets(self, speed):
+        # Os tiros continuam descendo mesmo depois que o dono morre
+        n = self.count
+        attacking = self.attacking[:n]
+        bullet_y = self.bullet_y[:n]
+        bullet_y[attacking] -= speed
+        attacking[bullet_y < 0] = False
+
+class BulletPool(EntityStore):
+    # Tiros: todos os arrays (inclusive máscaras e área de trabalho da compactação) são
+    # alocados junto com as colunas, então atirar, mover e expirar não alocam nada. Nenhum
+    # tiro é descartado: com o pool cheio, tudo dobra de tamanho como no EntityStore.
+    def __init__(self, capacity=256):
+        EntityStore.__init__(self, capacity)
+
+    def _resize(self, capacity):
+        EntityStore._resize(self, capacity)
+        self._keep = np.zeros(capacity, np.bool_)
+        self._test = np.zeros(capacity, np.bool_)
+        self._scratch = {dtype: np.zeros(capacity, dtype) for dtype in set(self.COLUMNS.values())}
+
+    def compact(self, keep=None):
+        n = self.count
+        if keep is None:
+            keep = self.alive[:n]
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return
+        for name, dtype in self.COLUMNS.items():
+            column = getattr(self, name)
+            scratch = self._scratch[dtype]
+            np.compress(keep, column[:n], out=scratch[:k])
+            column[:k] = scratch[:k]
+        self.count = k
+
+    def keep_inside(self, x_min, y_min, x_max, y_max):
+        # Descarta os tiros fora do retângulo aberto (x_min, x_max) x (y_min, y_max)
+        n = self.count
+        keep = self._keep[:n]
+        test = self._test[:n]
+        np.greater(self.x[:n], x_min, out=keep)
+        np.less(self.x[:n], x_max, out=test)
+        keep &= test
+        np.greater(self.y[:n], y_min, out=test)
+        keep &= test
+        np.less(self.y[:n], y_max, out=test)
+        keep &= test
+        self.compact(keep)
@@ -0,0 +1,162 @@
+# env.py
+# Ambiente no estilo Gym para avaliar agentes sem janela: reset(seed) e step(ação), com a
+# observação em arrays NumPy alocados uma vez e sobrescritos a cada passo (quem quiser
+# guardar uma observação deve copiá-la). GalaxianVecEnv roda N jogos independentes por chamada.
+#
+# Ação: a mesma máscara de entrada do jogo (INPUT_LEFT | INPUT_RIGHT | INPUT_FIRE), de 0 a 7.
+# Recompensa: pontos feitos no passo.
+
+import argparse
+import time
+
+import numpy as np
+
+from game import GameState, SHIP_ATTRIBUTES, SHIP_BULLET_CAPACITY, SIM_RATE
+
+NUM_ACTIONS = 8
+MAX_EPISODE_TICKS = SIM_RATE * 60 * 10 # 10 minutos de jogo
+MAX_ALIENS = 64 # linhas de aliens na observação; a formação normal tem 35
+MAX_POWERUPS = 16
+MAX_BOSS_BULLETS = 512
+
+# nome -> (formato, tipo); as colunas de cada array estão descritas ao lado
+OBSERVATION_SPACE = {
+    "ship": ((9,), np.float32), # x, y, vidas, cooldown, speed, fire_rate, shield, double_shot, speed ativo
+    "game": ((5,), np.float32), # nível, ticks, score, coins, attack_timer
+    "aliens": ((MAX_ALIENS, 7), np.float32), # vivo, x, y, tipo, atacando, x do tiro, y do tiro
+    "ship_bullets": ((SHIP_BULLET_CAPACITY, 2), np.float32), # x, y
+    "powerups": ((MAX_POWERUPS, 3), np.float32), # x, y, tipo (índice em POWERUP_TYPES)
+    "boss": ((5,), np.float32), # presente, x, y, vida, cooldown
+    "boss_bullets": ((MAX_BOSS_BULLETS, 4), np.float32), # x, y, vx, vy
+    "counts": ((4,), np.int32) # linhas válidas em aliens, ship_bullets, powerups, boss_bullets
+}
+
+def make_observation(num_envs=None):
+    lead = () if num_envs is None else (num_envs,)
+    return {name: np.zeros(lead + shape, dtype) for name, (shape, dtype) in OBSERVATION_SPACE.items()}
+
+def _fill(out, n, columns):
+    # Copia as n primeiras linhas de cada coluna para out e zera o resto
+    n = min(n, len(out))
+    for j, column in enumerate(columns):
+        out[:n, j] = column[:n]
+    out[n:] = 0
+    return n
+
+class GalaxianEnv:
+    def __init__(self, ship="nave.png", max_ticks=MAX_EPISODE_TICKS, obs=None):
+        self.ship_attributes = SHIP_ATTRIBUTES[ship]
+        self.max_ticks = max_ticks
+        # obs pode ser uma fatia dos arrays do GalaxianVecEnv: cada jogo escreve direto na sua linha
+        self.obs = make_observation() if obs is None else obs
+        self.state = None
+
+    def reset(self, seed=None):
+        self.state = GameState(self.ship_attributes, seed=seed)
+        self._observe()
+        return self.obs, self._info()
+
+    def step(self, action):
+        state = self.state
+        score = state.ship.score
+        state.step(int(action))
+        self._observe()
+        terminated = not state.running
+        truncated = not terminated and state.ticks >= self.max_ticks
+        return self.obs, state.ship.score - score, terminated, truncated, self._info()
+
+    def _info(self):
+        state = self.state
+        return {"seed": state.seed, "score": state.ship.score, "nivel": state.nivel, "ticks": state.ticks}
+
+    def _observe(self):
+        state = self.state
+        obs = self.obs
+        ship = state.ship
+        powerups = ship.powerups
+        obs["ship"][:] = (ship.x, ship.y, ship.lives, ship.cooldown, ship.speed, ship.fire_rate,
+                          powerups["shield"]["active"], powerups["double_shot"]["active"], powerups["speed"]["active"])
+        obs["game"][:] = (state.nivel, state.ticks, ship.score, ship.coins, state.attack_timer)
+
+        counts = obs["counts"]
+        f = state.formation
+        counts[0] = _fill(obs["aliens"], f.count, (f.alive, f.x, f.y, f.kind, f.attacking, f.bullet_x, f.bullet_y))
+        b = ship.bullets
+        counts[1] = _fill(obs["ship_bullets"], b.count, (b.x, b.y))
+        p = state.powerup_store
+        counts[2] = _fill(obs["powerups"], p.count, (p.x, p.y, p.kind))
+
+        boss = state.boss
+        if boss:
+            obs["boss"][:] = (1, boss.x, boss.y, boss.health, boss.cooldown)
+            b = boss.bullets
+            counts[3] = _fill(obs["boss_bullets"], b.count, (b.x, b.y, b.vx, b.vy))
+        else:
+            obs["boss"][:] = 0
+            counts[3] = _fill(obs["boss_bullets"], 0, ())
+
+class GalaxianVecEnv:
+    # N jogos independentes. Um jogo que termina é reiniciado no mesmo step (a observação
+    # devolvida já é a do jogo novo); o resultado do que terminou fica em infos[i]["final"]
+    def __init__(self, num_envs, ship="nave.png", max_ticks=MAX_EPISODE_TICKS):
+        self.num_envs = num_envs
+        self.obs = make_observation(num_envs)
+        self.envs = [GalaxianEnv(ship, max_ticks, {name: array[i] for name, array in self.obs.items()})
+                     for i in range(num_envs)]
+        self.rewards = np.zeros(num_envs, np.float32)
+        self.terminated = np.zeros(num_envs, np.bool_)
+        self.truncated = np.zeros(num_envs, np.bool_)
+        self.next_seed = None
+
+    def _seed(self):
+        # Com semente, os jogos recebem seed, seed + 1, ... na ordem em que começam
+        if self.next_seed is None:
+            return None
+        seed = self.next_seed
+        self.next_seed += 1
+        return seed
+
+    def reset(self, seed=None):
+        self.next_seed = seed
+        infos = [env.reset(self._seed())[1] for env in self.envs]
+        return self.obs, infos
+
+    def step(self, actions):
+        infos = []
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            _, reward, terminated, truncated, info = env.step(action)
+            self.rewards[i] = reward
+            self.terminated[i] = terminated
+            self.truncated[i] = truncated
+            if terminated or truncated:
+                final = info
+                info = env.reset(self._seed())[1]
+                info["final"] = final
+            infos.append(info)
+        return self.obs, self.rewards, self.terminated, self.truncated, infos
+
+def main():
+    # Avalia um agente aleatório e mede quantos episódios por segundo o ambiente aguenta
+    parser = argparse.ArgumentParser(description="Avaliação em lote de agentes sem janela")
+    parser.add_argument("--envs", type=int, default=16)
+    parser.add_argument("--episodes", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ship", default="nave.png", choices=sorted(SHIP_ATTRIBUTES))
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    env = GalaxianVecEnv(args.envs, args.ship)
+    env.reset(args.seed)
+    scores = []
+    steps = 0
+    start = time.perf_counter()
+    while len(scores) < args.episodes:
+        _, _, _, _, infos = env.step(rng.integers(0, NUM_ACTIONS, args.envs))
+        steps += args.envs
+        scores += [info["final"]["score"] for info in infos if "final" in info]
+    elapsed = time.perf_counter() - start
+    print(f"{len(scores)} episódios, score médio {np.mean(scores):.1f}, {steps} passos em {elapsed:.2f}s "
+          f"({steps / elapsed:.0f} passos/s, {len(scores) / elapsed:.1f} episódios/s)")
+
+if __name__ == '__main__':
+    main()
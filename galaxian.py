@@ -2,311 +2,38 @@ import pygame
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
-import random
+import time
 import os
-import json
-from menu import show_menu, show_game_over, show_shop
-from boss import Boss, BOSS_CONFIGS
-
-WIDTH, HEIGHT = 800, 600
-SHIP_WIDTH, SHIP_HEIGHT = 60, 20
-ALIEN_WIDTH, ALIEN_HEIGHT = 40, 20
-BULLET_WIDTH, BULLET_HEIGHT = 5, 10
-POWERUP_SIZE = 32
+import subprocess
+import sys
+from menu import show_menu, show_game_over, show_shop, screen_layer
+from boss import BOSS_CONFIGS
+from render import SpriteBatch, FULL_UV
+from atlas import load_atlas
+from text import draw_text, text_size
+from assets import AssetManager
+from starfield import Starfield
+from layers import draw_tiled_bg
+from hud import Hud, draw_lives, draw_score, draw_nivel
+from profiler import FrameProfiler
+from persistence import store
+from leaderboard import leaderboard
+from audio import VoiceManager, music, MUSIC_FILE
+from snapshot import snapshot, restore, SnapshotRing
+from game import (WIDTH, HEIGHT, POWERUP_SIZE, SIM_RATE, ALIEN_TEXTURE_FILES, SHIP_ATTRIBUTES, INPUT_LEFT,
+                  INPUT_RIGHT, INPUT_FIRE, GameState, RecordingInput)
+from replay import Replay
 
 NUM_STARS = 100
 
-class Star:
-    def __init__(self):
-        self.x = random.randint(0, WIDTH)
-        self.y = random.randint(0, HEIGHT)
-        self.speed = random.uniform(1, 3)
-        self.size = random.uniform(1, 2)
-        self.color = (random.random(), random.random(), random.random())
-
-    def update(self):
-        self.y -= self.speed
-        if self.y < 0:
-            self.y = HEIGHT
-            self.x = random.randint(0, WIDTH)
-
-    def draw(self):
-        glPointSize(self.size)
-        glColor3f(*self.color)
-        glBegin(GL_POINTS)
-        glVertex2f(self.x, self.y)
-        glEnd()
-
-def draw_tiled_bg(tex_id, tw, th):
-    glEnable(GL_TEXTURE_2D)
-    glBindTexture(GL_TEXTURE_2D, tex_id)
-    glColor3f(1, 1, 1)
-    for x in range(0, WIDTH, tw):
-        for y in range(0, HEIGHT, th):
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex2f(x, y)
-            glTexCoord2f(1, 0); glVertex2f(x + tw, y)
-            glTexCoord2f(1, 1); glVertex2f(x + tw, y + th)
-            glTexCoord2f(0, 1); glVertex2f(x, y + th)
-            glEnd()
-    glDisable(GL_TEXTURE_2D)
-
-def draw_num(x, y, num, textures):
-    for digit in str(num):
-        idx = int(digit)
-        tex = textures[idx]
-        if tex:
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            glEnable(GL_TEXTURE_2D)
-            glBindTexture(GL_TEXTURE_2D, tex[0])
-            glColor4f(1, 1, 1, 1)
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex2f(x, y)
-            glTexCoord2f(1, 0); glVertex2f(x + tex[1], y)
-            glTexCoord2f(1, 1); glVertex2f(x + tex[1], y + tex[2])
-            glTexCoord2f(0, 1); glVertex2f(x, y + tex[2])
-            glEnd()
-            glDisable(GL_TEXTURE_2D)
-            glDisable(GL_BLEND)
-            x += tex[1] + 2
-
-class Ship:
-    def __init__(self, texture=None, tex_w=60, tex_h=60, bullet_texture=None, bullet_tex_w=16, bullet_tex_h=16):
-        self.x = WIDTH // 2
-        self.y = 40
-        self.lives = 3
-        self.score = 0
-        self.coins = 0
-        self.bullets = []
-        self.cooldown = 0
-        self.texture = texture
-        self.tex_w = tex_w
-        self.tex_h = tex_h
-        self.bullet_texture = bullet_texture
-        self.bullet_tex_w = bullet_tex_w
-        self.bullet_tex_h = bullet_tex_h
-        self.som_tiro = None
-        self.speed = 5
-        self.fire_rate = 10
-        self.powerups = {
-            "speed": {"active": False, "timer": 0, "duration": 300},
-            "shield": {"active": False, "timer": 0, "duration": 300},
-            "double_shot": {"active": False, "timer": 0, "duration": 300}
-        }
-        self.initial_speed = self.speed
-        self.initial_fire_rate = self.fire_rate
-        self.shield_texture = None
-
-    def move(self, dx):
-        self.x += dx * self.speed
-        self.x = max(SHIP_WIDTH//2, min(WIDTH-SHIP_WIDTH//2, self.x))
-
-    def shoot(self):
-        if self.cooldown == 0:
-            if self.powerups["double_shot"]["active"]:
-                self.bullets.append([self.x - 10, self.y + SHIP_HEIGHT//2])
-                self.bullets.append([self.x + 10, self.y + SHIP_HEIGHT//2])
-            else:
-                self.bullets.append([self.x, self.y + SHIP_HEIGHT//2])
-            self.cooldown = self.fire_rate
-            if self.som_tiro:
-                self.som_tiro.play()
-
-    def update(self):
-        if self.cooldown > 0:
-            self.cooldown -= 1
-        for b in self.bullets:
-            b[1] += 5
-        self.bullets = [b for b in self.bullets if b[1] < HEIGHT]
-
-        for pu_type in self.powerups:
-            if self.powerups[pu_type]["active"]:
-                self.powerups[pu_type]["timer"] -= 1
-                if self.powerups[pu_type]["timer"] <= 0:
-                    self.deactivate_powerup(pu_type)
-        
-    def activate_powerup(self, pu_type):
-        if pu_type == "speed":
-            self.powerups["speed"]["active"] = True
-            self.powerups["speed"]["timer"] = self.powerups["speed"]["duration"]
-            self.speed = self.initial_speed * 1.5
-        elif pu_type == "shield":
-            self.powerups["shield"]["active"] = True
-            self.powerups["shield"]["timer"] = self.powerups["shield"]["duration"]
-        elif pu_type == "double_shot":
-            self.powerups["double_shot"]["active"] = True
-            self.powerups["double_shot"]["timer"] = self.powerups["double_shot"]["duration"]
-            self.fire_rate = self.initial_fire_rate // 2
-
-    def deactivate_powerup(self, pu_type):
-        self.powerups[pu_type]["active"] = False
-        if pu_type == "speed":
-            self.speed = self.initial_speed
-        elif pu_type == "double_shot":
-            self.fire_rate = self.initial_fire_rate
-
-    def draw(self, is_lit):
-        if self.texture:
-            glEnable(GL_TEXTURE_2D)
-            glBindTexture(GL_TEXTURE_2D, self.texture)
-            color_factor = 1.0 if is_lit else 0.5
-            glColor3f(color_factor, color_factor, color_factor)
-            x = self.x - self.tex_w // 2
-            y = self.y - self.tex_h // 2
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex2f(x, y)
-            glTexCoord2f(1, 0); glVertex2f(x + self.tex_w, y)
-            glTexCoord2f(1, 1); glVertex2f(x + self.tex_w, y + self.tex_h)
-            glTexCoord2f(0, 1); glVertex2f(x, y + self.tex_h)
-            glEnd()
-            glDisable(GL_TEXTURE_2D)
-        else:
-            glColor3f(0, 1, 1)
-            glRectf(self.x-SHIP_WIDTH//2, self.y-SHIP_HEIGHT//2, self.x+SHIP_WIDTH//2, self.y+SHIP_HEIGHT//2)
-        
-        if self.powerups["shield"]["active"] and self.shield_texture:
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            glEnable(GL_TEXTURE_2D)
-            glBindTexture(GL_TEXTURE_2D, self.shield_texture[0])
-            glColor4f(1, 1, 1, 1)
-            shield_size = 80
-            sx = self.x - shield_size / 2
-            sy = self.y - shield_size / 2
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex2f(sx, sy)
-            glTexCoord2f(1, 0); glVertex2f(sx + shield_size, sy)
-            glTexCoord2f(1, 1); glVertex2f(sx + shield_size, sy + shield_size)
-            glTexCoord2f(0, 1); glVertex2f(sx, sy + shield_size)
-            glEnd()
-            glDisable(GL_TEXTURE_2D)
-            glDisable(GL_BLEND)
-
-        for b in self.bullets:
-            if self.bullet_texture:
-                glEnable(GL_BLEND)
-                glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-                glEnable(GL_TEXTURE_2D)
-                glBindTexture(GL_TEXTURE_2D, self.bullet_texture)
-                glColor4f(1, 1, 1, 1)
-                bx = b[0] - self.bullet_tex_w // 2
-                by = b[1]
-                glBegin(GL_QUADS)
-                glTexCoord2f(0, 0); glVertex2f(bx, by)
-                glTexCoord2f(1, 0); glVertex2f(bx + self.bullet_tex_w, by)
-                glTexCoord2f(1, 1); glVertex2f(bx + self.bullet_tex_w, by + self.bullet_tex_h)
-                glTexCoord2f(0, 1); glVertex2f(bx, by + self.bullet_tex_h)
-                glEnd()
-                glDisable(GL_TEXTURE_2D)
-                glDisable(GL_BLEND)
-            else:
-                glColor3f(1, 1, 0)
-                glRectf(b[0]-BULLET_WIDTH//2, b[1], b[0]+BULLET_WIDTH//2, b[1]+BULLET_HEIGHT)
-
-class Alien:
-    def __init__(self, x, y, texture=None, tex_w=40, tex_h=20, bullet_texture=None, bullet_tex_w=16, bullet_tex_h=16):
-        self.x = x
-        self.y = y
-        self.alive = True
-        self.attacking = False
-        self.bullet = None
-        self.texture = texture
-        self.tex_w = tex_w
-        self.tex_h = tex_h
-        self.bullet_texture = bullet_texture
-        self.bullet_tex_w = bullet_tex_w
-        self.bullet_tex_h = bullet_tex_h
-        self.som_tiro = None
-
-    def attack(self):
-        self.attacking = True
-        self.bullet = [self.x, self.y-ALIEN_HEIGHT//2]
-        if self.som_tiro:
-            self.som_tiro.play()
-
-    def update(self):
-        if self.attacking and self.bullet:
-            self.bullet[1] -= 4
-            if self.bullet[1] < 0:
-                self.attacking = False
-                self.bullet = None
-
-    def draw(self, is_lit):
-        if self.alive:
-            if self.texture:
-                glEnable(GL_TEXTURE_2D)
-                glBindTexture(GL_TEXTURE_2D, self.texture)
-                color_factor = 1.0 if is_lit else 0.5
-                glColor3f(color_factor, color_factor, color_factor)
-                x = self.x - self.tex_w // 2
-                y = self.y - self.tex_h // 2
-                glBegin(GL_QUADS)
-                glTexCoord2f(0, 0); glVertex2f(x, y)
-                glTexCoord2f(1, 0); glVertex2f(x + self.tex_w, y)
-                glTexCoord2f(1, 1); glVertex2f(x + self.tex_w, y + self.tex_h)
-                glTexCoord2f(0, 1); glVertex2f(x, y + self.tex_h)
-                glEnd()
-                glDisable(GL_TEXTURE_2D)
-            else:
-                glColor3f(1, 0, 0)
-                glRectf(self.x-ALIEN_WIDTH//2, self.y-ALIEN_HEIGHT//2, self.x+ALIEN_WIDTH//2, self.y+ALIEN_HEIGHT//2)
-        if self.attacking and self.bullet:
-            if self.bullet_texture:
-                glEnable(GL_BLEND)
-                glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-                glEnable(GL_TEXTURE_2D)
-                glBindTexture(GL_TEXTURE_2D, self.bullet_texture)
-                glColor4f(1, 1, 1, 1)
-                bx = self.bullet[0] - self.bullet_tex_w // 2
-                by = self.bullet[1]
-                glBegin(GL_QUADS)
-                glTexCoord2f(0, 0); glVertex2f(bx, by)
-                glTexCoord2f(1, 0); glVertex2f(bx + self.bullet_tex_w, by)
-                glTexCoord2f(1, 1); glVertex2f(bx + self.bullet_tex_w, by + self.bullet_tex_h)
-                glTexCoord2f(0, 1); glVertex2f(bx, by + self.bullet_tex_h)
-                glEnd()
-                glDisable(GL_TEXTURE_2D)
-                glDisable(GL_BLEND)
-            else:
-                glColor3f(1, 1, 1)
-                glRectf(self.bullet[0]-BULLET_WIDTH//2, self.bullet[1], self.bullet[0]+BULLET_WIDTH//2, self.bullet[1]+BULLET_HEIGHT)
-
-class PowerUp:
-    def __init__(self, x, y, pu_type, texture):
-        self.x = x
-        self.y = y
-        self.pu_type = pu_type
-        self.texture = texture
-        self.size = POWERUP_SIZE
-
-    def update(self):
-        self.y -= 1
-
-    def draw(self):
-        if self.texture:
-            glEnable(GL_TEXTURE_2D)
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            glBindTexture(GL_TEXTURE_2D, self.texture[0])
-            glColor4f(1, 1, 1, 1)
-            x = self.x - self.size // 2
-            y = self.y - self.size // 2
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex2f(x, y)
-            glTexCoord2f(1, 0); glVertex2f(x + self.size, y)
-            glTexCoord2f(1, 1); glVertex2f(x + self.size, y + self.size)
-            glTexCoord2f(0, 1); glVertex2f(x, y + self.size)
-            glEnd()
-            glDisable(GL_TEXTURE_2D)
-            glDisable(GL_BLEND)
-
-def draw_text(x, y, text, size=24):
-    font = pygame.font.SysFont('Arial', size)
-    text_surface = font.render(text, True, (255,255,255), (0,0,0))
-    text_data = pygame.image.tostring(text_surface, "RGBA", True)
-    glRasterPos2i(x, HEIGHT - y - text_surface.get_height())
-    glDrawPixels(text_surface.get_width(), text_surface.get_height(), GL_RGBA, GL_UNSIGNED_BYTE, text_data)
+# A simulação roda em SIM_RATE ticks por segundo (game.py). A renderização roda em RENDER_FPS
+# (0 = sem limite) e interpola entre os dois últimos estados.
+RENDER_FPS = 60
+MAX_FRAME_TIME = 0.25 # evita a "espiral da morte" depois de um travamento longo
+SNAPSHOT_INTERVAL = 6 # ticks entre as fotografias do estado guardadas para voltar no tempo
+REWIND_SECONDS = 10 # quanto tempo de jogo fica guardado
+REWIND_STEP = 1 # segundos que cada BACKSPACE volta
+REPLAY_DIR = 'replays'
 
 def load_texture(filename, size=None):
     if not os.path.exists(filename):
@@ -322,51 +49,84 @@ def load_texture(filename, size=None):
     glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
     glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
     glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, img_data)
-    return tex_id, width, height
-
-def save_highscores(scores):
-    with open('highscores.json', 'w') as f:
-        json.dump(scores, f)
+    return tex_id, width, height, FULL_UV
+
+# Sprites pequenos empacotados no atlas: (arquivo, tamanho depois do smoothscale)
+ATLAS_SPRITES = ([('vidas.png', (24, 24)), ('coin.png', (16, 16)), ('shield1.png', (128, 128)),
+                  ('disparoNave.png', (8, 16)), ('disparoAlien.png', (8, 16)),
+                  ('bold_silver.png', (POWERUP_SIZE, POWERUP_SIZE)), ('shield_silver.png', (POWERUP_SIZE, POWERUP_SIZE)),
+                  ('star_silver.png', (POWERUP_SIZE, POWERUP_SIZE))] +
+                 [(f, (32, 32)) for f in list(SHIP_ATTRIBUTES) + ALIEN_TEXTURE_FILES] +
+                 [(f'img_numbers/{i}.png', (24, 32)) for i in range(10)])
+
+def load_game_textures():
+    # O fundo é repetido em mosaico e fica numa textura própria; o resto vem do atlas
+    atlas = load_atlas(ATLAS_SPRITES)
+    sprite = lambda filename, size: atlas.get((filename, size))
+    return {
+        "bg": load_texture('space_bg.png', (128, 128)),
+        "vidas": sprite('vidas.png', (24, 24)),
+        "ships": {f: sprite(f, (32, 32)) for f in SHIP_ATTRIBUTES},
+        "aliens": [tex for tex in (sprite(f, (32, 32)) for f in ALIEN_TEXTURE_FILES) if tex],
+        "bullet_ship": sprite('disparoNave.png', (8, 16)),
+        "bullet_alien": sprite('disparoAlien.png', (8, 16)),
+        "numeros": [sprite(f'img_numbers/{i}.png', (24, 32)) for i in range(10)],
+        "coin": sprite('coin.png', (16, 16)),
+        "powerups": {
+            "life": sprite('nave.png', (POWERUP_SIZE, POWERUP_SIZE)),
+            "speed": sprite('bold_silver.png', (POWERUP_SIZE, POWERUP_SIZE)),
+            "shield": sprite('shield_silver.png', (POWERUP_SIZE, POWERUP_SIZE)),
+            "double_shot": sprite('star_silver.png', (POWERUP_SIZE, POWERUP_SIZE))
+        },
+        "shield": sprite('shield1.png', (128, 128))
+    }
 
 def load_highscores():
-    if os.path.exists('highscores.json'):
-        with open('highscores.json', 'r') as f:
-            return json.load(f)
-    return []
+    # Top 10 do placar em SQLite (o highscores.json antigo é importado na primeira vez)
+    return leaderboard.top(10)
 
+# Leituras vêm da memória e as gravações são atômicas, feitas em segundo plano (persistence.py)
 def save_player_data(data):
-    with open('player_data.json', 'w') as f:
-        json.dump(data, f, indent=4)
+    store.save('player_data.json', data, indent=4)
 
 def load_player_data():
-    if os.path.exists('player_data.json'):
-        with open('player_data.json', 'r') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                print("player_data.json está vazio ou corrompido. Criando novo arquivo...")
-    
-    default_data = {"coins": 0, "current_ship": "nave.png", "unlocked_ships": ["nave.png"]}
-    save_player_data(default_data)
-    return default_data
-
-def enter_initials_screen(bg_texture, clock, score):
+    data = store.load('player_data.json')
+    if data is None:
+        print("player_data.json não existe ou está corrompido. Criando novo arquivo...")
+        data = {"coins": 0, "current_ship": "nave.png", "unlocked_ships": ["nave.png"]}
+        save_player_data(data)
+    return data
+
+# A pontuação enviada é verificada pelo verifier.py num processo separado: refazer uma partida
+# longa leva alguns segundos e a janela continua respondendo. Se o jogo fechar antes, o processo
+# termina sozinho e grava o resultado no banco
+VERIFIER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'verifier.py')
+
+def start_verification(submission_id):
+    return subprocess.Popen([sys.executable, VERIFIER_SCRIPT, "--ids", str(submission_id), "--workers", "0",
+                             "--db", leaderboard.path], stdout=subprocess.DEVNULL)
+
+def finish_verifications(verifications):
+    # Tira da lista os processos que terminaram; True se algum terminou (o placar pode ter mudado)
+    done = [process for process in verifications if process.poll() is not None]
+    for process in done:
+        verifications.remove(process)
+    return bool(done)
+
+def enter_initials_screen(bg_texture, clock, score, replay, ship=None):
     initials = ['A', 'A', 'A']
     selected_char = 0
     run_initials = True
+    batch = SpriteBatch()
 
     while run_initials:
         for event in pygame.event.get():
             if event.type == QUIT:
-                return "quit", score
+                return "quit", score, None
             if event.type == KEYDOWN:
                 if event.key == K_RETURN:
-                    highscores = load_highscores()
-                    highscores.append({'initials': ''.join(initials), 'score': score})
-                    highscores.sort(key=lambda x: x['score'], reverse=True)
-                    highscores = highscores[:10]
-                    save_highscores(highscores)
-                    return "game_over", score
+                    # Vai com o replay da partida; só entra no placar depois de verificada
+                    return "game_over", score, leaderboard.submit(''.join(initials), replay, ship)
                 if event.key == K_LEFT:
                     selected_char = (selected_char - 1) % 3
                 if event.key == K_RIGHT:
@@ -380,354 +140,263 @@ def enter_initials_screen(bg_texture, clock, score):
                     char_code = char_code - 1 if char_code > ord('A') else ord('Z')
                     initials[selected_char] = chr(char_code)
         
-        glClear(GL_COLOR_BUFFER_BIT)
-        if bg_texture:
-            draw_tiled_bg(bg_texture[0], bg_texture[1], bg_texture[2])
+        def render():
+            glClear(GL_COLOR_BUFFER_BIT)
+            if bg_texture:
+                draw_tiled_bg(batch, bg_texture[0], bg_texture[1], bg_texture[2])
+                batch.flush()
 
-        draw_text(WIDTH // 2 - 160, HEIGHT // 2 - 100, "NEW HIGHSCORE!", size=48)
-        draw_text(WIDTH // 2 - 100, HEIGHT // 2 - 40, "Enter your initials:", size=24)
-        draw_text(WIDTH // 2 - 50, HEIGHT // 2 + 10, "".join(initials), size=48)
-        
-        x_pos_cursor = (WIDTH // 2 - 50) + (selected_char * 35)
-        draw_text(x_pos_cursor, HEIGHT // 2 + 50, "_", size=48)
+            draw_text(WIDTH // 2 - 160, HEIGHT // 2 - 100, "NEW HIGHSCORE!", size=48)
+            draw_text(WIDTH // 2 - 100, HEIGHT // 2 - 40, "Enter your initials:", size=24)
+            draw_text(WIDTH // 2 - 50, HEIGHT // 2 + 10, "".join(initials), size=48)
+
+            x_pos_cursor = (WIDTH // 2 - 50) + (selected_char * 35)
+            draw_text(x_pos_cursor, HEIGHT // 2 + 50, "_", size=48)
 
+        screen_layer.draw(("initials", bg_texture, tuple(initials), selected_char), render)
         pygame.display.flip()
         clock.tick(30)
         
     
 def get_text_width(text, size=24):
-    font = pygame.font.SysFont('Arial', size)
-    text_surface = font.render(text, True, (255,255,255))
-    return text_surface.get_width()
+    return text_size(text, size)[0]
 
 def draw_button(x, y, text, size=24, color=(255, 255, 255)):
-    font = pygame.font.SysFont('Arial', size)
-    text_surface = font.render(text, True, color)
-    text_data = pygame.image.tostring(text_surface, "RGBA", True)
-    width, height = text_surface.get_size()
-    
-    glRasterPos2i(x, HEIGHT - y - height)
-    glDrawPixels(width, height, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
-    
+    width, height = draw_text(x, y, text, size, color, background=None)
     return pygame.Rect(x, y, width, height)
 
-def run_game(bg_texture, vidas_texture, ship_texture_data, alien_textures, bullet_ship_tex, bullet_alien_tex, numeros_texture, ship_attributes, powerup_textures, shield_texture):
-    pygame.mixer.music.load('musica.mp3')
-    pygame.mixer.music.play(-1)
-
-    som_tiro = pygame.mixer.Sound('tiro.mp3')
-    som_tiro_alien = pygame.mixer.Sound('tiro_alien.mp3')
-    som_explosao = pygame.mixer.Sound('explosao.mp3')
-    som_perde_vida = pygame.mixer.Sound('perde_vida.mp3')
-
-    ship = Ship(texture=ship_texture_data[0], tex_w=ship_texture_data[1], tex_h=ship_texture_data[2],
-                bullet_texture=bullet_ship_tex[0] if bullet_ship_tex else None,
-                bullet_tex_w=bullet_ship_tex[1] if bullet_ship_tex else 16,
-                bullet_tex_h=bullet_ship_tex[2] if bullet_ship_tex else 16)
-    
-    ship.lives = ship_attributes["lives"]
-    ship.speed = ship_attributes["speed"]
-    ship.initial_speed = ship.speed
-    ship.fire_rate = ship_attributes["fire_rate"]
-    ship.initial_fire_rate = ship.fire_rate
-    ship.som_tiro = som_tiro
-    ship.shield_texture = shield_texture
-
-    aliens = []
-    powerups = []
-    linhas = 5
-    base = 5
-    espacamento_x = 60
-    espacamento_y = 40
-    boss = None
+class KeyboardInput:
+    def read(self, state):
+        keys = pygame.key.get_pressed()
+        actions = 0
+        if keys[K_LEFT]:
+            actions |= INPUT_LEFT
+        if keys[K_RIGHT]:
+            actions |= INPUT_RIGHT
+        if keys[K_SPACE] or keys[K_LCTRL]:
+            actions |= INPUT_FIRE
+        return actions
+
+def draw_paused(batch, state, is_lit, bg_texture, vidas_texture, numeros_texture):
+    glClear(GL_COLOR_BUFFER_BIT)
+    if bg_texture:
+        draw_tiled_bg(batch, bg_texture[0], bg_texture[1], bg_texture[2])
+    state.ship.draw(batch, is_lit)
+    for alien in state.aliens:
+        alien.draw(batch, is_lit)
+    draw_lives(batch, state.ship.lives, vidas_texture)
+
+    draw_nivel(batch, state.nivel, numeros_texture)
+
+    batch.add_rect(0, 0, WIDTH, HEIGHT, (0, 0, 0, 0.5), blend=True)
+    batch.flush()
+
+    titulo = "PAUSADO"
+    draw_text(WIDTH//2 - get_text_width(titulo, 36)//2, HEIGHT//2 - 10, titulo, size=36)
+
+    subtitulo = "Pressione ESC para continuar"
+    draw_text(WIDTH//2 - get_text_width(subtitulo, 24)//2, HEIGHT//2 + 30, subtitulo, size=24)
+
+    voltar = "Voltar ao menu (Pressione ENTER ou M)"
+    draw_text(WIDTH//2 - get_text_width(voltar, 28)//2, HEIGHT//2 + 80, voltar, size=28)
+
+def draw_game(batch, state, stars, is_lit, bg_texture, vidas_texture, numeros_texture, alpha=1.0, hud=None, profiler=None):
+    glClear(GL_COLOR_BUFFER_BIT)
+    if bg_texture:
+        draw_tiled_bg(batch, bg_texture[0], bg_texture[1], bg_texture[2])
+        batch.flush()
+    stars.draw(alpha)
+
+    ship = state.ship
+    ship.draw(batch, is_lit, alpha)
+    for alien in state.aliens:
+        alien.draw(batch, is_lit, alpha)
+    for pu in state.powerups:
+        pu.draw(batch, alpha)
+    if state.boss:
+        state.boss.draw(batch, is_lit, alpha)
+
+    if hud:
+        batch.flush()
+        if profiler:
+            profiler.mark("draw")
+        hud.draw(batch, ship, state.nivel)
+        if profiler:
+            profiler.mark("text")
+        return
+
+    draw_lives(batch, ship.lives, vidas_texture)
+    draw_score(batch, ship.score, numeros_texture)
+    draw_nivel(batch, state.nivel, numeros_texture)
+    batch.flush()
+    if profiler:
+        profiler.mark("draw")
+    draw_text(60, 50, f"Coins: {ship.coins}", size=24)
+    if profiler:
+        profiler.mark("text")
+
+def save_replay(replay, state):
+    replay.finish(state)
+    path = os.path.join(REPLAY_DIR, time.strftime("%Y%m%d-%H%M%S") + f"-{state.seed}.glxr")
+    try:
+        replay.save(path)
+    except OSError as e:
+        print(f"Erro: não foi possível salvar o replay: {e}")
+
+def run_game(bg_texture, vidas_texture, ship_texture_data, alien_textures, bullet_ship_tex, bullet_alien_tex, numeros_texture, ship_attributes, powerup_textures, shield_texture,
+             render_fps=RENDER_FPS, assets=None, num_stars=NUM_STARS, voices=None):
+    # A música já está decodificada (main faz o prefetch) e continua tocando entre as telas;
+    # cada jogo novo faz o crossfade para o começo da faixa
+    music.play(MUSIC_FILE, restart=True)
+
+    # Os efeitos já decodificados (uma vez por processo) tocam pelo gerenciador de vozes,
+    # com limite de vozes e de disparos por som
+    if voices is None:
+        voices = VoiceManager()
+    sounds = voices.voices()
+
+    # Com o gerenciador de assets, a textura do boss já vem decodificada (ou do cache) e não trava o frame
+    texture_loader = assets.get if assets else load_texture
+    state = GameState(ship_attributes, ship_texture_data, alien_textures, bullet_ship_tex, bullet_alien_tex,
+                      powerup_textures, shield_texture, sounds, texture_loader=texture_loader)
+    # Toda partida é gravada (semente + entradas por tick) e pode ser refeita com replay.py
+    replay = Replay(ship_attributes, state.seed)
+    controls = RecordingInput(KeyboardInput(), replay)
     paused = False
-    
-    powerup_spawn_counter = 0
-    powerup_spawn_threshold = random.randint(10, 30)
-
-    for l in range(linhas):
-        n_aliens = base + l
-        largura_total = (n_aliens-1) * espacamento_x
-        y = HEIGHT - 60 - l*espacamento_y
-        for i in range(n_aliens):
-            x = WIDTH//2 - largura_total//2 + i*espacamento_x
-            tex = random.choice(alien_textures) if alien_textures else None
-            alien = Alien(x, y,
-                texture=tex[0] if tex else None,
-                tex_w=tex[1] if tex else 40,
-                tex_h=tex[2] if tex else 20,
-                bullet_texture=bullet_alien_tex[0] if bullet_alien_tex else None,
-                bullet_tex_w=bullet_alien_tex[1] if bullet_alien_tex else 16,
-                bullet_tex_h=bullet_alien_tex[2] if bullet_alien_tex else 16)
-            alien.som_tiro = som_tiro_alien
-            aliens.append(alien)
-    
-    running = True
-    attack_timer = 0
-    alien_dir = 1
-    alien_speed = 2
-    attack_interval = 40
-    nivel = 1
-    
+    # Fotografias dos últimos REWIND_SECONDS (BACKSPACE volta no tempo) e o save-state do F5/F9.
+    # O replay tem uma entrada por tick, então voltar para o tick t só corta as entradas depois dele;
+    # a partida fica marcada como assistida e não vai para o placar
+    rewind = SnapshotRing(REWIND_SECONDS * SIM_RATE // SNAPSHOT_INTERVAL)
+    rewind.push(snapshot(state))
+    save_state = None
+
     clock = pygame.time.Clock()
-    stars = [Star() for _ in range(NUM_STARS)]
+    stars = Starfield(num_stars)
     is_lit = True
-
-    while running:
+    batch = SpriteBatch()
+    hud = Hud(vidas_texture, numeros_texture)
+    profiler = FrameProfiler()
+
+    sim_dt = 1.0 / SIM_RATE
+    accumulator = 0.0
+    last_time = time.perf_counter()
+
+    while state.running:
+        # Com o profiler desligado, prof é None e cada marca custa só o "if"
+        prof = profiler if profiler.enabled else None
+        state.profiler = prof
+        if prof:
+            prof.begin_frame()
         for event in pygame.event.get():
             if event.type == QUIT:
-                running = False
+                state.running = False
             elif event.type == KEYDOWN:
                 if event.key == K_ESCAPE:
                     paused = not paused
                     if paused:
-                        pygame.mixer.music.pause()
+                        # O jogo parado é desenhado uma vez e reaproveitado enquanto durar a pausa
+                        screen_layer.invalidate()
+                        music.pause()
                     else:
-                        pygame.mixer.music.unpause()
+                        music.resume()
                 elif event.key in (K_RETURN, K_m):
-                    pygame.mixer.music.stop()
-                    return "menu", ship.score
+                    music.resume()
+                    hud.release()
+                    save_replay(replay, state)
+                    return "menu", state.ship.score, replay
                 elif event.key == K_l:
                     is_lit = not is_lit
-        
-        if paused:
-            glClear(GL_COLOR_BUFFER_BIT)
-            if bg_texture:
-                draw_tiled_bg(bg_texture[0], bg_texture[1], bg_texture[2])
-            ship.draw(is_lit)
-            for alien in aliens:
-                alien.draw(is_lit)
-            if vidas_texture:
-                glEnable(GL_BLEND)
-                glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-                glEnable(GL_TEXTURE_2D)
-                glBindTexture(GL_TEXTURE_2D, vidas_texture[0])
-                for i in range(ship.lives):
-                    x = 20 + i*28
-                    y = HEIGHT-28
-                    glColor4f(1, 1, 1, 1)
-                    glBegin(GL_QUADS)
-                    glTexCoord2f(0, 0); glVertex2f(x, y)
-                    glTexCoord2f(1, 0); glVertex2f(x + vidas_texture[1], y)
-                    glTexCoord2f(1, 1); glVertex2f(x + vidas_texture[1], y + vidas_texture[2])
-                    glTexCoord2f(0, 1); glVertex2f(x, y + vidas_texture[2])
-                    glEnd()
-                glDisable(GL_TEXTURE_2D)
-                glDisable(GL_BLEND)
-
-            draw_num(WIDTH//2 - 20, HEIGHT - 40, nivel, numeros_texture)
-
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            glColor4f(0, 0, 0, 0.5)
-            glBegin(GL_QUADS)
-            glVertex2f(0, 0); glVertex2f(WIDTH, 0)
-            glVertex2f(WIDTH, HEIGHT); glVertex2f(0, HEIGHT)
-            glEnd()
-            glDisable(GL_BLEND)
-
-            titulo = "PAUSADO"
-            draw_text(WIDTH//2 - get_text_width(titulo, 36)//2, HEIGHT//2 - 10, titulo, size=36)
-
-            subtitulo = "Pressione ESC para continuar"
-            draw_text(WIDTH//2 - get_text_width(subtitulo, 24)//2, HEIGHT//2 + 30, subtitulo, size=24)
-
-            voltar = "Voltar ao menu (Pressione ENTER ou M)"
-            draw_text(WIDTH//2 - get_text_width(voltar, 28)//2, HEIGHT//2 + 80, voltar, size=28)
+                elif event.key == K_BACKSPACE:
+                    restore(state, rewind.rewind(REWIND_STEP * SIM_RATE // SNAPSHOT_INTERVAL))
+                    del replay.inputs[state.ticks:]
+                    replay.assisted = True
+                    screen_layer.invalidate()
+                elif event.key == K_F5:
+                    save_state = (snapshot(state), bytes(replay.inputs))
+                elif event.key == K_F9 and save_state:
+                    restore(state, save_state[0])
+                    replay.inputs[:] = save_state[1]
+                    replay.assisted = True
+                    rewind.clear()
+                    rewind.push(save_state[0])
+                    screen_layer.invalidate()
+                elif event.key == K_F3:
+                    profiler.toggle()
+                elif event.key == K_F4:
+                    try:
+                        print(f"Frames salvos em {profiler.dump_csv()}")
+                    except OSError as e:
+                        print(f"Erro: não foi possível salvar os frames: {e}")
+        if not state.running:
+            break
+
+        now = time.perf_counter()
+        frame_time = min(now - last_time, MAX_FRAME_TIME)
+        last_time = now
 
+        if paused:
+            screen_layer.draw(("paused", is_lit),
+                              lambda: draw_paused(batch, state, is_lit, bg_texture, vidas_texture, numeros_texture))
+            if prof:
+                prof.mark("draw")
+                profiler.draw(batch)
+                prof.mark("overlay")
             pygame.display.flip()
-            clock.tick(30)
+            if prof:
+                prof.mark("flip")
+            clock.tick(render_fps)
+            if prof:
+                prof.mark("wait")
+                prof.end_frame()
             continue
 
-        keys = pygame.key.get_pressed()
-        if keys[K_LEFT]:
-            ship.move(-5)
-        if keys[K_RIGHT]:
-            ship.move(5)
-        if keys[K_SPACE] or keys[K_LCTRL]:
-            ship.shoot()
-
-        ship.update()
-        
-        for pu in powerups[:]:
-            pu.update()
-            if pu.y < 0:
-                powerups.remove(pu)
-            
-            if abs(pu.x - ship.x) < SHIP_WIDTH/2 and abs(pu.y - ship.y) < SHIP_HEIGHT/2:
-                powerups.remove(pu)
-                if pu.pu_type == "life":
-                    if ship.lives < 5:
-                        ship.lives += 1
-                elif pu.pu_type in ["speed", "shield", "double_shot"]:
-                    ship.activate_powerup(pu.pu_type)
-        
-        attack_timer += 1
-        if aliens and not boss:
-            if attack_timer > attack_interval:
-                attack_timer = 0
-                attackers = [a for a in aliens if a.alive and not a.attacking]
-                if attackers:
-                    random.choice(attackers).attack()
-            borda_direita = max([alien.x for alien in aliens if alien.alive], default=0) + ALIEN_WIDTH//2
-            borda_esquerda = min([alien.x for alien in aliens if alien.alive], default=WIDTH) - ALIEN_WIDTH//2
-            if borda_direita >= WIDTH:
-                alien_dir = -1
-            if borda_esquerda <= 0:
-                alien_dir = 1
-            for alien in aliens:
-                if alien.alive:
-                    alien.x += alien_dir * alien_speed
-                alien.update()
-            for b in ship.bullets[:]:
-                for alien in aliens:
-                    if alien.alive and abs(b[0]-alien.x)<ALIEN_WIDTH//2 and abs(b[1]-alien.y)<ALIEN_HEIGHT//2:
-                        alien.alive = False
-                        ship.score += 1
-                        ship.coins += 1
-                        ship.bullets.remove(b)
-                        som_explosao.play()
-                        
-                        powerup_spawn_counter += 1
-                        if powerup_spawn_counter >= powerup_spawn_threshold:
-                            pu_type = random.choice(list(powerup_textures.keys()))
-                            powerups.append(PowerUp(alien.x, alien.y, pu_type, powerup_textures[pu_type]))
-                            powerup_spawn_counter = 0
-                            powerup_spawn_threshold = random.randint(10, 30)
-                        
-                        break
-            for alien in aliens:
-                if alien.attacking and alien.bullet:
-                    if abs(alien.bullet[0]-ship.x)<SHIP_WIDTH//2 and abs(alien.bullet[1]-ship.y)<SHIP_HEIGHT//2:
-                        if not ship.powerups["shield"]["active"]:
-                            ship.lives -= 1
-                            som_perde_vida.play()
-                        alien.attacking = False
-                        alien.bullet = None
-        
-        for star in stars:
-            star.update()
-
-        glClear(GL_COLOR_BUFFER_BIT)
-        if bg_texture:
-            draw_tiled_bg(bg_texture[0], bg_texture[1], bg_texture[2])
-        for star in stars:
-            star.draw()
-            
-        ship.draw(is_lit)
-        for alien in aliens:
-            alien.draw(is_lit)
-        for pu in powerups:
-            pu.draw()
-        
-        if boss:
-            boss.update(ship)
-            boss.draw(is_lit)
-
-            if boss:
-                for b in ship.bullets[:]:
-                    if (b[0] > boss.x - boss.tex_w / 2 and b[0] < boss.x + boss.tex_w / 2 and
-                        b[1] > boss.y - boss.tex_h / 2 and b[1] < boss.y + boss.tex_h / 2):
-                        
-                        ship.bullets.remove(b)
-                        if boss.take_damage(5):
-                            boss = None
-                            som_explosao.play()
-                            ship.score += 100
-                            ship.coins += 10
-                            break
-            
-            if boss:
-                for b in boss.bullets[:]:
-                    if (abs(b[0] - ship.x) < SHIP_WIDTH / 2 and
-                        abs(b[1] - ship.y) < SHIP_HEIGHT / 2):
-                        if not ship.powerups["shield"]["active"]:
-                            ship.lives -= 1
-                            som_perde_vida.play()
-                        boss.bullets.remove(b)
-
-        if vidas_texture:
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            glEnable(GL_TEXTURE_2D)
-            glBindTexture(GL_TEXTURE_2D, vidas_texture[0])
-            for i in range(ship.lives):
-                x = 20 + i*28
-                y = HEIGHT-28
-                glColor4f(1, 1, 1, 1)
-                glBegin(GL_QUADS)
-                glTexCoord2f(0, 0); glVertex2f(x, y)
-                glTexCoord2f(1, 0); glVertex2f(x + vidas_texture[1], y)
-                glTexCoord2f(1, 1); glVertex2f(x + vidas_texture[1], y + vidas_texture[2])
-                glTexCoord2f(0, 1); glVertex2f(x, y + vidas_texture[2])
-                glEnd()
-            glDisable(GL_TEXTURE_2D)
-            glDisable(GL_BLEND)
-        else:
-            for i in range(ship.lives):
-                glColor3f(1, 0, 0)
-                glRectf(20 + i*25, HEIGHT-30, 35 + i*25, HEIGHT-10)
-        
-        score_str = str(ship.score)
-        score_w = sum(numeros_texture[int(d)][1] + 2 for d in score_str)
-        draw_num(WIDTH - score_w - 20, HEIGHT - 40, ship.score, numeros_texture)
-        
-        draw_num(WIDTH//2 - 20, HEIGHT - 40, nivel, numeros_texture)
-        draw_text(60, 50, f"Coins: {ship.coins}", size=24)
+        # Roda quantos ticks fixos couberem no tempo real acumulado; o resto vira a interpolação
+        accumulator += frame_time
+        if prof:
+            prof.mark("input")
+        while accumulator >= sim_dt and state.running:
+            actions = controls.read(state)
+            if prof:
+                prof.mark("input")
+            state.step(actions)
+            if state.ticks % SNAPSHOT_INTERVAL == 0:
+                rewind.push(snapshot(state))
+            stars.update()
+            if prof:
+                prof.mark("stars")
+            accumulator -= sim_dt
+
+        draw_game(batch, state, stars, is_lit, bg_texture, vidas_texture, numeros_texture, accumulator / sim_dt, hud, prof)
+        if assets:
+            assets.pump()
+        music.update()
+        if prof:
+            prof.mark("draw")
+            profiler.draw(batch)
+            prof.mark("overlay")
 
         pygame.display.flip()
-        clock.tick(30)
-        
-        if not any(a.alive for a in aliens) and not boss:
-            nivel += 1
-            alien_speed += 1
-            attack_interval = max(10, attack_interval - 5)
-            aliens = []
-            
-            powerup_spawn_counter = 0
-            powerup_spawn_threshold = random.randint(10, 30)
-
-            if nivel == 3:
-                boss_config = BOSS_CONFIGS["boss_1"]
-                boss_tex = load_texture(boss_config["texture_file"], boss_config["texture_size"])
-                boss = Boss(boss_config, boss_tex, bullet_alien_tex, som_tiro_alien)
-            elif nivel == 6:
-                boss_config = BOSS_CONFIGS["boss_2"]
-                boss_tex = load_texture(boss_config["texture_file"], boss_config["texture_size"])
-                boss = Boss(boss_config, boss_tex, bullet_alien_tex, som_tiro_alien)
-            else:
-                for l in range(linhas):
-                    n_aliens = base + l
-                    largura_total = (n_aliens-1) * espacamento_x
-                    y = HEIGHT - 60 - l*espacamento_y
-                    for i in range(n_aliens):
-                        x = WIDTH//2 - largura_total//2 + i*espacamento_x
-                        tex = random.choice(alien_textures) if alien_textures else None
-                        alien = Alien(x, y,
-                            texture=tex[0] if tex else None,
-                            tex_w=tex[1] if tex else 40,
-                            tex_h=tex[2] if tex else 20,
-                            bullet_texture=bullet_alien_tex[0] if bullet_alien_tex else None,
-                            bullet_tex_w=bullet_alien_tex[1] if bullet_alien_tex else 16,
-                            bullet_tex_h=bullet_alien_tex[2] if bullet_alien_tex else 16)
-                        alien.som_tiro = som_tiro_alien
-                        aliens.append(alien)
-        if ship.lives <= 0:
-            running = False
-
-    highscores = load_highscores()
-    is_new_highscore = False
-    if not highscores or ship.score > highscores[-1]['score'] or len(highscores) < 10:
-        is_new_highscore = True
-    
+        if prof:
+            prof.mark("flip")
+        clock.tick(render_fps)
+        if prof:
+            prof.mark("wait")
+            prof.end_frame()
+
+    hud.release()
+    save_replay(replay, state)
+    ship = state.ship
+    # Partidas com volta no tempo ou save-state não entram no placar
+    is_new_highscore = not replay.assisted and leaderboard.qualifies(ship.score)
+
     player_data = load_player_data()
     player_data["coins"] += ship.coins
     save_player_data(player_data)
 
     if is_new_highscore:
-        return "enter_initials", ship.score
+        return "enter_initials", ship.score, replay
     else:
-        return "game_over", ship.score
+        return "game_over", ship.score, replay
 
 def main():
     pygame.init()
@@ -737,53 +406,37 @@ def main():
     gluOrtho2D(0, WIDTH, 0, HEIGHT)
     glClearColor(0, 0, 0, 1)
 
-    bg_texture = load_texture('space_bg.png', (128, 128))
-    vidas_texture = load_texture('vidas.png', (24, 24))
-    
-    ship_textures = {
-        "nave.png": load_texture('nave.png', (32, 32)),
-        "playerShip1_red.png": load_texture('playerShip1_red.png', (32, 32)),
-        "playerShip2_orange.png": load_texture('playerShip2_orange.png', (32, 32)),
-        "playerShip3_green.png": load_texture('playerShip3_green.png', (32, 32))
-    }
-    
-    alien_textures = []
-    for fname in ['ufoBlue.png', 'ufoGreen.png', 'ufoRed.png', 'ufoYellow.png']:
-        tex = load_texture(fname, (32, 32))
-        if tex:
-            alien_textures.append(tex)
-
-    bullet_ship_tex = load_texture('disparoNave.png', (8, 16))
-    bullet_alien_tex = load_texture('disparoAlien.png', (8, 16))
-    numeros_texture = []
-    for i in range(10):
-        tex = load_texture(f'img_numbers/{i}.png', (24, 32))
-        numeros_texture.append(tex)
-    coin_texture = load_texture('coin.png', (16, 16))
-    
-    powerup_textures = {
-        "life": load_texture('nave.png', (POWERUP_SIZE, POWERUP_SIZE)),
-        "speed": load_texture('bold_silver.png', (POWERUP_SIZE, POWERUP_SIZE)),
-        "shield": load_texture('shield_silver.png', (POWERUP_SIZE, POWERUP_SIZE)),
-        "double_shot": load_texture('star_silver.png', (POWERUP_SIZE, POWERUP_SIZE))
-    }
-    
-    shield_texture = load_texture('shield1.png', (128, 128))
+    textures = load_game_textures()
+    bg_texture = textures["bg"]
+    vidas_texture = textures["vidas"]
+    ship_textures = textures["ships"]
+    alien_textures = textures["aliens"]
+    bullet_ship_tex = textures["bullet_ship"]
+    bullet_alien_tex = textures["bullet_alien"]
+    numeros_texture = textures["numeros"]
+    coin_texture = textures["coin"]
+    powerup_textures = textures["powerups"]
+    shield_texture = textures["shield"]
+
+    # As imagens dos bosses são as maiores do jogo: decodifica em segundo plano enquanto o menu roda
+    assets = AssetManager()
+    for config in BOSS_CONFIGS.values():
+        assets.request(config["texture_file"], config["texture_size"])
 
     player_data = load_player_data()
+    # Os efeitos primeiro: o SDL_mixer decodifica um arquivo por vez, e um efeito pedido durante
+    # a decodificação da música esperaria por ela
+    voices = VoiceManager()
+    music.prefetch(MUSIC_FILE)
     
     clock = pygame.time.Clock()
     game_state = "menu"
     final_score = 0
-    
-    ship_attributes_dict = {
-        "nave.png": {"speed": 1.5, "lives": 3, "fire_rate": 10},
-        "playerShip1_red.png": {"speed": 3, "lives": 2, "fire_rate": 10},
-        "playerShip2_orange.png": {"speed": 0.75, "lives": 5, "fire_rate": 10},
-        "playerShip3_green.png": {"speed": 2, "lives": 3, "fire_rate": 7}
-    }
+    final_replay = None
+    verifications = []
 
     while game_state != "quit":
+        assets.pump(0)
         if game_state == "menu":
             game_state = show_menu(bg_texture, clock)
         elif game_state == "shop":
@@ -791,14 +444,24 @@ def main():
         elif game_state == "start_game":
             ship_file = player_data["current_ship"]
             ship_texture_data = ship_textures[ship_file]
-            selected_ship_attrs = ship_attributes_dict[ship_file]
+            selected_ship_attrs = SHIP_ATTRIBUTES[ship_file]
             
-            game_state, final_score = run_game(bg_texture, vidas_texture, ship_texture_data, alien_textures, bullet_ship_tex, bullet_alien_tex, numeros_texture, selected_ship_attrs, powerup_textures, shield_texture)
+            game_state, final_score, final_replay = run_game(bg_texture, vidas_texture, ship_texture_data, alien_textures, bullet_ship_tex, bullet_alien_tex, numeros_texture, selected_ship_attrs, powerup_textures, shield_texture,
+                                               assets=assets, voices=voices)
         elif game_state == "enter_initials":
-            game_state, final_score = enter_initials_screen(bg_texture, clock, final_score)
+            game_state, final_score, submission_id = enter_initials_screen(bg_texture, clock, final_score, final_replay,
+                                                                           player_data["current_ship"])
+            if submission_id is not None:
+                verifications.append(start_verification(submission_id))
         elif game_state == "game_over":
-            game_state, final_score = show_game_over(bg_texture, clock, load_highscores(), final_score)
+            # O placar é relido quando uma verificação termina
+            refresh = lambda: load_highscores() if finish_verifications(verifications) else None
+            game_state, final_score = show_game_over(bg_texture, clock, load_highscores(), final_score, refresh)
     
+    assets.shutdown()
+    music.shutdown()
+    store.close()
+    leaderboard.close()
     pygame.quit()
     quit()
 
@@ -0,0 +1,603 @@
+# game.py
+# A simulação do jogo, sem janela, GL ou mixer: constantes, nave, aliens, power-ups, as fontes
+# de entrada por tick e o GameState. O jogo com janela (galaxian.py), os replays, o ambiente de
+# treino e os benchmarks montam a partida a partir daqui.
+
+import numpy as np
+
+from boss import Boss, BOSS_CONFIGS
+from collision import SpatialHash, overlaps, box_hits
+from entities import EntityStore, AlienFormation, BulletPool
+from render import FULL_UV
+from rng import RandomStreams
+
+WIDTH, HEIGHT = 800, 600
+SHIP_WIDTH, SHIP_HEIGHT = 60, 20
+ALIEN_WIDTH, ALIEN_HEIGHT = 40, 20
+BULLET_WIDTH, BULLET_HEIGHT = 5, 10
+POWERUP_SIZE = 32
+
+# Passo fixo da simulação: a lógica roda sempre a 30 ticks por segundo. Velocidades, cooldowns
+# e durações contam em ticks (e os replays guardam uma entrada por tick), então SIM_RATE não é
+# configurável: mudar o valor mudaria a velocidade do jogo.
+SIM_RATE = 30
+ALIEN_BULLET_SPEED = 4
+SHIP_BULLET_CAPACITY = 128
+
+ALIEN_TEXTURE_FILES = ['ufoBlue.png', 'ufoGreen.png', 'ufoRed.png', 'ufoYellow.png']
+POWERUP_TYPES = ["life", "speed", "shield", "double_shot"]
+
+SHIP_ATTRIBUTES = {
+    "nave.png": {"speed": 1.5, "lives": 3, "fire_rate": 10},
+    "playerShip1_red.png": {"speed": 3, "lives": 2, "fire_rate": 10},
+    "playerShip2_orange.png": {"speed": 0.75, "lives": 5, "fire_rate": 10},
+    "playerShip3_green.png": {"speed": 2, "lives": 3, "fire_rate": 7}
+}
+
+class Ship:
+    __slots__ = ('x', 'y', 'prev_x', 'lives', 'score', 'coins', 'bullets', 'cooldown',
+                 'texture', 'tex_w', 'tex_h', 'tex_uv', 'bullet_texture', 'bullet_tex_w', 'bullet_tex_h', 'bullet_tex_uv',
+                 'som_tiro', 'speed', 'fire_rate', 'powerups', 'initial_speed', 'initial_fire_rate', 'shield_texture')
+
+    def __init__(self, texture=None, tex_w=60, tex_h=60, bullet_texture=None, bullet_tex_w=16, bullet_tex_h=16,
+                 tex_uv=FULL_UV, bullet_tex_uv=FULL_UV):
+        self.x = WIDTH // 2
+        self.y = 40
+        self.prev_x = self.x
+        self.lives = 3
+        self.score = 0
+        self.coins = 0
+        self.bullets = BulletPool(SHIP_BULLET_CAPACITY)
+        self.cooldown = 0
+        self.texture = texture
+        self.tex_w = tex_w
+        self.tex_h = tex_h
+        self.tex_uv = tex_uv
+        self.bullet_texture = bullet_texture
+        self.bullet_tex_w = bullet_tex_w
+        self.bullet_tex_h = bullet_tex_h
+        self.bullet_tex_uv = bullet_tex_uv
+        self.som_tiro = None
+        self.speed = 5
+        self.fire_rate = 10
+        self.powerups = {
+            "speed": {"active": False, "timer": 0, "duration": 300},
+            "shield": {"active": False, "timer": 0, "duration": 300},
+            "double_shot": {"active": False, "timer": 0, "duration": 300}
+        }
+        self.initial_speed = self.speed
+        self.initial_fire_rate = self.fire_rate
+        self.shield_texture = None
+
+    def move(self, dx):
+        self.x += dx * self.speed
+        self.x = max(SHIP_WIDTH//2, min(WIDTH-SHIP_WIDTH//2, self.x))
+
+    def shoot(self):
+        if self.cooldown == 0:
+            if self.powerups["double_shot"]["active"]:
+                self.bullets.spawn(self.x - 10, self.y + SHIP_HEIGHT//2, vy=5)
+                self.bullets.spawn(self.x + 10, self.y + SHIP_HEIGHT//2, vy=5)
+            else:
+                self.bullets.spawn(self.x, self.y + SHIP_HEIGHT//2, vy=5)
+            self.cooldown = self.fire_rate
+            if self.som_tiro:
+                self.som_tiro.play()
+
+    def update(self):
+        if self.cooldown > 0:
+            self.cooldown -= 1
+        self.bullets.move()
+        self.bullets.keep_inside(0, 0, WIDTH, HEIGHT)
+
+        for pu_type in self.powerups:
+            if self.powerups[pu_type]["active"]:
+                self.powerups[pu_type]["timer"] -= 1
+                if self.powerups[pu_type]["timer"] <= 0:
+                    self.deactivate_powerup(pu_type)
+        
+    def activate_powerup(self, pu_type):
+        if pu_type == "speed":
+            self.powerups["speed"]["active"] = True
+            self.powerups["speed"]["timer"] = self.powerups["speed"]["duration"]
+            self.speed = self.initial_speed * 1.5
+        elif pu_type == "shield":
+            self.powerups["shield"]["active"] = True
+            self.powerups["shield"]["timer"] = self.powerups["shield"]["duration"]
+        elif pu_type == "double_shot":
+            self.powerups["double_shot"]["active"] = True
+            self.powerups["double_shot"]["timer"] = self.powerups["double_shot"]["duration"]
+            self.fire_rate = self.initial_fire_rate // 2
+
+    def deactivate_powerup(self, pu_type):
+        self.powerups[pu_type]["active"] = False
+        if pu_type == "speed":
+            self.speed = self.initial_speed
+        elif pu_type == "double_shot":
+            self.fire_rate = self.initial_fire_rate
+
+    def draw(self, batch, is_lit, alpha=1.0):
+        # alpha: fração do tick atual já decorrida, para interpolar a partir da posição anterior
+        ship_x = self.prev_x + (self.x - self.prev_x) * alpha
+        if self.texture:
+            color_factor = 1.0 if is_lit else 0.5
+            x = ship_x - self.tex_w // 2
+            y = self.y - self.tex_h // 2
+            batch.add(self.texture, x, y, self.tex_w, self.tex_h, (color_factor, color_factor, color_factor, 1), self.tex_uv, blend=False)
+        else:
+            batch.add_rect(ship_x-SHIP_WIDTH//2, self.y-SHIP_HEIGHT//2, ship_x+SHIP_WIDTH//2, self.y+SHIP_HEIGHT//2, (0, 1, 1, 1))
+        
+        if self.powerups["shield"]["active"] and self.shield_texture:
+            shield_size = 80
+            sx = ship_x - shield_size / 2
+            sy = self.y - shield_size / 2
+            batch.add(self.shield_texture[0], sx, sy, shield_size, shield_size, uv=self.shield_texture[3])
+
+        # Todos os tiros de uma vez, direto dos arrays; como andam em linha reta, a posição
+        # anterior é a atual menos a velocidade
+        n = self.bullets.count
+        xs = self.bullets.x[:n]
+        ys = self.bullets.y[:n] + (alpha - 1) * self.bullets.vy[:n]
+        if self.bullet_texture:
+            batch.add_many(self.bullet_texture, xs - self.bullet_tex_w // 2, ys, self.bullet_tex_w, self.bullet_tex_h, uv=self.bullet_tex_uv)
+        else:
+            batch.add_many(None, xs - BULLET_WIDTH//2, ys, BULLET_WIDTH//2 * 2, BULLET_HEIGHT, (1, 1, 0, 1), blend=False)
+
+class AlienArchetype:
+    # Dados compartilhados por todos os aliens do mesmo tipo (textura, tiro e som)
+    __slots__ = ('texture', 'tex_w', 'tex_h', 'tex_uv', 'bullet_texture', 'bullet_tex_w', 'bullet_tex_h', 'bullet_tex_uv', 'som_tiro')
+
+    def __init__(self, texture=None, tex_w=40, tex_h=20, bullet_texture=None, bullet_tex_w=16, bullet_tex_h=16,
+                 tex_uv=FULL_UV, bullet_tex_uv=FULL_UV, som_tiro=None):
+        self.texture = texture
+        self.tex_w = tex_w
+        self.tex_h = tex_h
+        self.tex_uv = tex_uv
+        self.bullet_texture = bullet_texture
+        self.bullet_tex_w = bullet_tex_w
+        self.bullet_tex_h = bullet_tex_h
+        self.bullet_tex_uv = bullet_tex_uv
+        self.som_tiro = som_tiro
+
+class Alien:
+    # Visão fina sobre uma linha da AlienFormation: posição, estado e tiro ficam nos arrays,
+    # e o resto vem do arquétipo indicado pela coluna "kind"
+    __slots__ = ('formation', 'index', 'archetypes')
+
+    def __init__(self, formation, index, archetypes):
+        self.formation = formation
+        self.index = index
+        self.archetypes = archetypes
+
+    @property
+    def archetype(self):
+        return self.archetypes[self.formation.kind[self.index]]
+
+    @property
+    def x(self):
+        return self.formation.x[self.index]
+
+    @x.setter
+    def x(self, value):
+        self.formation.x[self.index] = value
+
+    @property
+    def y(self):
+        return self.formation.y[self.index]
+
+    @y.setter
+    def y(self, value):
+        self.formation.y[self.index] = value
+
+    @property
+    def alive(self):
+        return self.formation.alive[self.index]
+
+    @alive.setter
+    def alive(self, value):
+        self.formation.alive[self.index] = value
+
+    @property
+    def attacking(self):
+        return self.formation.attacking[self.index]
+
+    @attacking.setter
+    def attacking(self, value):
+        self.formation.attacking[self.index] = value
+
+    @property
+    def bullet(self):
+        if not self.formation.attacking[self.index]:
+            return None
+        return [self.formation.bullet_x[self.index], self.formation.bullet_y[self.index]]
+
+    def attack(self):
+        self.formation.attack(self.index, self.y-ALIEN_HEIGHT//2)
+        som_tiro = self.archetype.som_tiro
+        if som_tiro:
+            som_tiro.play()
+
+    def draw(self, batch, is_lit, alpha=1.0):
+        a = self.archetype
+        if self.alive:
+            prev_x = self.formation.prev_x[self.index]
+            alien_x = prev_x + (self.x - prev_x) * alpha
+            if a.texture:
+                color_factor = 1.0 if is_lit else 0.5
+                x = alien_x - a.tex_w // 2
+                y = self.y - a.tex_h // 2
+                batch.add(a.texture, x, y, a.tex_w, a.tex_h, (color_factor, color_factor, color_factor, 1), a.tex_uv, blend=False)
+            else:
+                batch.add_rect(alien_x-ALIEN_WIDTH//2, self.y-ALIEN_HEIGHT//2, alien_x+ALIEN_WIDTH//2, self.y+ALIEN_HEIGHT//2, (1, 0, 0, 1))
+        bullet = self.bullet
+        if bullet is not None:
+            bullet_y = bullet[1] + (1 - alpha) * ALIEN_BULLET_SPEED
+            if a.bullet_texture:
+                bx = bullet[0] - a.bullet_tex_w // 2
+                batch.add(a.bullet_texture, bx, bullet_y, a.bullet_tex_w, a.bullet_tex_h, uv=a.bullet_tex_uv)
+            else:
+                batch.add_rect(bullet[0]-BULLET_WIDTH//2, bullet_y, bullet[0]+BULLET_WIDTH//2, bullet_y+BULLET_HEIGHT, (1, 1, 1, 1))
+
+class PowerUp:
+    # Visão fina sobre uma linha do EntityStore de power-ups (válida até o próximo compact)
+    __slots__ = ('store', 'index', 'texture', 'size')
+
+    def __init__(self, store, index, texture):
+        self.store = store
+        self.index = index
+        self.texture = texture
+        self.size = POWERUP_SIZE
+
+    @property
+    def x(self):
+        return self.store.x[self.index]
+
+    @property
+    def y(self):
+        return self.store.y[self.index]
+
+    @property
+    def pu_type(self):
+        return POWERUP_TYPES[self.store.kind[self.index]]
+
+    def draw(self, batch, alpha=1.0):
+        if self.texture:
+            x = self.x - self.size // 2
+            y = self.y + (alpha - 1) * self.store.vy[self.index] - self.size // 2
+            batch.add(self.texture[0], x, y, self.size, self.size, uv=self.texture[3])
+
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_FIRE = 4
+
+def headless_texture(filename, size):
+    # Textura sem id de GL para o modo sem janela: só as dimensões importam para a lógica
+    return None, size[0], size[1], FULL_UV
+
+class ScriptedInput:
+    # Entrada roteirizada: uma sequência de bitmasks (uma por tick) ou uma função bot(state) -> bitmask
+    def __init__(self, script, loop=False):
+        self.bot = script if callable(script) else None
+        self.actions = [] if self.bot else list(script)
+        self.loop = loop
+        self.pos = 0
+
+    def read(self, state):
+        if self.bot:
+            return self.bot(state)
+        if self.pos >= len(self.actions):
+            if not self.loop or not self.actions:
+                return 0
+            self.pos = 0
+        actions = self.actions[self.pos]
+        self.pos += 1
+        return actions
+
+class RecordingInput:
+    # Repassa as entradas de outra fonte (teclado, bot) e grava cada máscara no replay
+    def __init__(self, source, replay):
+        self.source = source
+        self.replay = replay
+
+    def read(self, state):
+        actions = self.source.read(state)
+        self.replay.record(actions)
+        return actions
+
+class GameState:
+    def __init__(self, ship_attributes, ship_texture_data=None, alien_textures=None, bullet_ship_tex=None,
+                 bullet_alien_tex=None, powerup_textures=None, shield_texture=None, sounds=None,
+                 texture_loader=headless_texture, seed=None):
+        if ship_texture_data is None:
+            ship_texture_data = headless_texture('nave.png', (32, 32))
+        if not alien_textures:
+            alien_textures = [headless_texture(f, (32, 32)) for f in ALIEN_TEXTURE_FILES]
+        if bullet_alien_tex is None:
+            bullet_alien_tex = headless_texture('disparoAlien.png', (8, 16))
+        sounds = sounds or {}
+
+        # Cada subsistema sorteia do seu próprio fluxo; com a mesma semente e as mesmas entradas
+        # a partida se repete exatamente (sem semente, uma é sorteada do random global)
+        self.rng = RandomStreams(seed)
+        self.seed = self.rng.seed
+        self.formation_rng = self.rng.stream("formation")
+        self.attack_rng = self.rng.stream("attack")
+        self.powerup_rng = self.rng.stream("powerup")
+
+        self.alien_textures = alien_textures
+        self.bullet_alien_tex = bullet_alien_tex
+        self.powerup_textures = powerup_textures or {}
+        self.texture_loader = texture_loader
+        self.som_tiro_alien = sounds.get("tiro_alien")
+        self.som_explosao = sounds.get("explosao")
+        self.som_perde_vida = sounds.get("perde_vida")
+
+        ship = Ship(texture=ship_texture_data[0], tex_w=ship_texture_data[1], tex_h=ship_texture_data[2],
+                    bullet_texture=bullet_ship_tex[0] if bullet_ship_tex else None,
+                    bullet_tex_w=bullet_ship_tex[1] if bullet_ship_tex else 16,
+                    bullet_tex_h=bullet_ship_tex[2] if bullet_ship_tex else 16,
+                    tex_uv=ship_texture_data[3],
+                    bullet_tex_uv=bullet_ship_tex[3] if bullet_ship_tex else FULL_UV)
+        ship.lives = ship_attributes["lives"]
+        ship.speed = ship_attributes["speed"]
+        ship.initial_speed = ship.speed
+        ship.fire_rate = ship_attributes["fire_rate"]
+        ship.initial_fire_rate = ship.fire_rate
+        ship.som_tiro = sounds.get("tiro")
+        ship.shield_texture = shield_texture
+        self.ship = ship
+
+        # Um arquétipo por tipo de alien; as visões são criadas uma vez e reaproveitadas a cada nível
+        self.alien_archetypes = [AlienArchetype(texture=tex[0], tex_w=tex[1], tex_h=tex[2], tex_uv=tex[3],
+                                                bullet_texture=bullet_alien_tex[0],
+                                                bullet_tex_w=bullet_alien_tex[1],
+                                                bullet_tex_h=bullet_alien_tex[2],
+                                                bullet_tex_uv=bullet_alien_tex[3],
+                                                som_tiro=self.som_tiro_alien)
+                                 for tex in alien_textures]
+        self.formation = AlienFormation()
+        self.alien_views = []
+        self.aliens = []
+        self.powerup_store = EntityStore(16)
+        self.boss = None
+        self.boss_key = None
+        self.nivel = 1
+        self.attack_timer = 0
+        self.alien_dir = 1
+        self.alien_speed = 2
+        self.attack_interval = 40
+        self.powerup_spawn_counter = 0
+        self.powerup_spawn_threshold = self.powerup_rng.randint(10, 30)
+        self.ticks = 0
+        self.running = True
+        # FrameProfiler ligado (marca o fim de cada fase do tick) ou None
+        self.profiler = None
+
+        self.alien_grid = SpatialHash(ALIEN_WIDTH, ALIEN_HEIGHT)
+
+        self.spawn_formation()
+
+    def spawn_formation(self):
+        linhas = 5
+        base = 5
+        espacamento_x = 60
+        espacamento_y = 40
+        xs = []
+        ys = []
+        kinds = []
+        for l in range(linhas):
+            n_aliens = base + l
+            largura_total = (n_aliens-1) * espacamento_x
+            y = HEIGHT - 60 - l*espacamento_y
+            for i in range(n_aliens):
+                xs.append(WIDTH//2 - largura_total//2 + i*espacamento_x)
+                ys.append(y)
+                kinds.append(self.formation_rng.randrange(len(self.alien_archetypes)))
+        self.spawn_aliens(xs, ys, kinds)
+
+    def spawn_aliens(self, xs, ys, kinds):
+        # Preenche a formação de uma vez e reaproveita as visões Alien já criadas
+        formation = self.formation
+        formation.spawn_many(np.asarray(xs, np.float64), np.asarray(ys, np.float64), 0.0, 0.0, np.asarray(kinds, np.int16))
+        self.update_alien_views()
+
+    def update_alien_views(self):
+        # Uma visão Alien por linha da formação (também depois de restaurar uma fotografia do estado)
+        formation = self.formation
+        views = self.alien_views
+        for i in range(len(views), formation.count):
+            views.append(Alien(formation, i, self.alien_archetypes))
+        self.aliens = views[:formation.count]
+
+    @property
+    def powerups(self):
+        store = self.powerup_store
+        return [PowerUp(store, i, self.powerup_textures.get(POWERUP_TYPES[store.kind[i]])) for i in range(store.count)]
+
+    def spawn_boss(self, boss_key):
+        boss_config = BOSS_CONFIGS[boss_key]
+        boss_tex = self.texture_loader(boss_config["texture_file"], boss_config["texture_size"])
+        self.boss = Boss(boss_config, boss_tex, self.bullet_alien_tex, self.som_tiro_alien)
+        self.boss_key = boss_key
+
+    def lose_life(self):
+        if not self.ship.powerups["shield"]["active"]:
+            self.ship.lives -= 1
+            if self.som_perde_vida:
+                self.som_perde_vida.play()
+
+    def collide_bullets_with_aliens(self):
+        # Cada tiro acerta o primeiro alien vivo (na ordem da formação) que ele toca
+        ship = self.ship
+        formation = self.formation
+        n = formation.count
+        xs = formation.x[:n].tolist()
+        ys = formation.y[:n].tolist()
+        alive = formation.alive[:n].tolist()
+        grid = self.alien_grid
+        grid.clear()
+        for i in np.flatnonzero(formation.alive[:n]).tolist():
+            grid.insert(i, xs[i], ys[i])
+
+        half_w, half_h = ALIEN_WIDTH//2, ALIEN_HEIGHT//2
+        bullets = ship.bullets
+        m = bullets.count
+        keep = np.ones(m, dtype=bool)
+        for j, (bx, by) in enumerate(zip(bullets.x[:m].tolist(), bullets.y[:m].tolist())):
+            target = None
+            for i in grid.query(bx, by, half_w, half_h):
+                if (target is None or i < target) and alive[i] and overlaps(bx, by, xs[i], ys[i], half_w, half_h):
+                    target = i
+            if target is None:
+                continue
+
+            keep[j] = False
+            alive[target] = False
+            formation.alive[target] = False
+            ship.score += 1
+            ship.coins += 1
+            if self.som_explosao:
+                self.som_explosao.play()
+
+            self.powerup_spawn_counter += 1
+            if self.powerup_spawn_counter >= self.powerup_spawn_threshold:
+                pu_type = self.powerup_rng.choice(POWERUP_TYPES)
+                self.powerup_store.spawn(xs[target], ys[target], vy=-1, kind=POWERUP_TYPES.index(pu_type))
+                self.powerup_spawn_counter = 0
+                self.powerup_spawn_threshold = self.powerup_rng.randint(10, 30)
+        bullets.compact(keep)
+
+    # Guarda as posições do fim do tick anterior, usadas pela renderização para interpolar
+    def save_previous(self):
+        self.ship.prev_x = self.ship.x
+        self.formation.save_positions()
+        if self.boss:
+            self.boss.prev_x = self.boss.x
+            self.boss.prev_y = self.boss.y
+
+    # Avança a simulação em um tick, sem depender de janela, mixer ou relógio
+    def step(self, actions=0):
+        self.save_previous()
+        prof = self.profiler
+        ship = self.ship
+        if actions & INPUT_LEFT:
+            ship.move(-5)
+        if actions & INPUT_RIGHT:
+            ship.move(5)
+        if actions & INPUT_FIRE:
+            ship.shoot()
+
+        ship.update()
+
+        pus = self.powerup_store
+        if pus.count:
+            pus.move()
+            n = pus.count
+            picked = np.flatnonzero(box_hits(pus.x[:n], pus.y[:n], ship.x, ship.y, SHIP_WIDTH/2, SHIP_HEIGHT/2)).tolist()
+            keep = pus.y[:n] >= 0
+            for i in picked:
+                pu_type = POWERUP_TYPES[pus.kind[i]]
+                if pu_type == "life":
+                    if ship.lives < 5:
+                        ship.lives += 1
+                elif pu_type in ["speed", "shield", "double_shot"]:
+                    ship.activate_powerup(pu_type)
+                keep[i] = False
+            pus.compact(keep)
+        if prof:
+            prof.mark("ship")
+
+        formation = self.formation
+        self.attack_timer += 1
+        if formation.count and not self.boss:
+            if self.attack_timer > self.attack_interval:
+                self.attack_timer = 0
+                attackers = formation.attackers()
+                if attackers.size:
+                    self.aliens[self.attack_rng.choice(attackers)].attack()
+            edges = formation.edges()
+            borda_esquerda, borda_direita = (WIDTH, 0) if edges is None else edges
+            borda_direita += ALIEN_WIDTH//2
+            borda_esquerda -= ALIEN_WIDTH//2
+            if borda_direita >= WIDTH:
+                self.alien_dir = -1
+            if borda_esquerda <= 0:
+                self.alien_dir = 1
+            formation.advance(self.alien_dir * self.alien_speed)
+            formation.update_bullets(ALIEN_BULLET_SPEED)
+            if prof:
+                prof.mark("aliens")
+            if ship.bullets.count:
+                self.collide_bullets_with_aliens()
+            shooters = np.flatnonzero(formation.attacking[:formation.count])
+            if shooters.size:
+                hits = np.flatnonzero(box_hits(formation.bullet_x[shooters], formation.bullet_y[shooters],
+                                               ship.x, ship.y, SHIP_WIDTH//2, SHIP_HEIGHT//2)).tolist()
+                for i in hits:
+                    self.lose_life()
+                    formation.attacking[shooters[i]] = False
+            if prof:
+                prof.mark("collisions")
+
+        boss = self.boss
+        if boss:
+            boss.update(ship)
+            if prof:
+                prof.mark("boss")
+
+            bullets = ship.bullets
+            n = bullets.count
+            bx = bullets.x[:n]
+            by = bullets.y[:n]
+            inside = ((bx > boss.x - boss.tex_w / 2) & (bx < boss.x + boss.tex_w / 2) &
+                      (by > boss.y - boss.tex_h / 2) & (by < boss.y + boss.tex_h / 2))
+            for i in np.flatnonzero(inside).tolist():
+                if boss.take_damage(5):
+                    self.boss = None
+                    if self.som_explosao:
+                        self.som_explosao.play()
+                    ship.score += 100
+                    ship.coins += 10
+                    inside[i + 1:] = False
+                    break
+            bullets.compact(~inside)
+
+            boss_bullets = boss.bullets
+            n = boss_bullets.count
+            if self.boss and n:
+                hits = box_hits(boss_bullets.x[:n], boss_bullets.y[:n], ship.x, ship.y, SHIP_WIDTH / 2, SHIP_HEIGHT / 2)
+                if hits.any():
+                    for _ in range(np.count_nonzero(hits)):
+                        self.lose_life()
+                    boss_bullets.compact(~hits)
+            if prof:
+                prof.mark("collisions")
+
+        if not formation.any_alive() and not self.boss:
+            self.nivel += 1
+            self.alien_speed += 1
+            self.attack_interval = max(10, self.attack_interval - 5)
+            formation.clear()
+            self.aliens = []
+
+            self.powerup_spawn_counter = 0
+            self.powerup_spawn_threshold = self.powerup_rng.randint(10, 30)
+
+            if self.nivel == 3:
+                self.spawn_boss("boss_1")
+            elif self.nivel == 6:
+                self.spawn_boss("boss_2")
+            else:
+                self.spawn_formation()
+            if prof:
+                prof.mark("aliens")
+        if ship.lives <= 0:
+            self.running = False
+        self.ticks += 1
+
+def run_headless(ship_attributes, input_source, max_ticks=None):
+    # Roda uma partida inteira sem janela, sem mixer e sem limite de FPS
+    state = GameState(ship_attributes)
+    while state.running and (max_ticks is None or state.ticks < max_ticks):
+        state.step(input_source.read(state))
+    return state
@@ -0,0 +1,63 @@
+# headless.py
+# Roda partidas sem janela, sem mixer e sem limite de FPS (testes de carga, bots e benchmarks)
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from game import GameState, ScriptedInput, RecordingInput, SHIP_ATTRIBUTES, INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE
+from replay import Replay
+
+def simple_bot(state):
+    # Persegue o alvo mais próximo (alien vivo ou boss) e atira sem parar
+    ship = state.ship
+    target_x = None
+    if state.boss:
+        target_x = state.boss.x
+    else:
+        formation = state.formation
+        alive = np.flatnonzero(formation.alive[:formation.count])
+        if alive.size:
+            xs = formation.x[alive]
+            target_x = xs[np.lexsort((np.abs(xs - ship.x), formation.y[alive]))[0]]
+    actions = INPUT_FIRE
+    if target_x is not None:
+        if target_x < ship.x - 5:
+            actions |= INPUT_LEFT
+        elif target_x > ship.x + 5:
+            actions |= INPUT_RIGHT
+    return actions
+
+def main():
+    parser = argparse.ArgumentParser(description="Galaxian sem janela")
+    parser.add_argument("--ship", default="nave.png", choices=sorted(SHIP_ATTRIBUTES))
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--record", metavar="DIR", default=None, help="grava um replay de cada jogo nesta pasta")
+    args = parser.parse_args()
+
+    total_ticks = 0
+    start = time.perf_counter()
+    for game in range(args.games):
+        # Com --seed, o jogo i usa a semente seed + i e pode ser refeito isoladamente
+        seed = None if args.seed is None else args.seed + game
+        state = GameState(SHIP_ATTRIBUTES[args.ship], seed=seed)
+        controls = ScriptedInput(simple_bot)
+        if args.record:
+            replay = Replay(SHIP_ATTRIBUTES[args.ship], state.seed)
+            controls = RecordingInput(controls, replay)
+        while state.running and state.ticks < args.max_ticks:
+            state.step(controls.read(state))
+        if args.record:
+            replay.finish(state)
+            replay.save(os.path.join(args.record, f"jogo{game + 1}-{state.seed}.glxr"))
+        total_ticks += state.ticks
+        print(f"jogo {game + 1}: score={state.ship.score} nivel={state.nivel} vidas={state.ship.lives} ticks={state.ticks}")
+    elapsed = time.perf_counter() - start
+    print(f"{total_ticks} ticks em {elapsed:.2f}s ({total_ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# hud.py
+# HUD (vidas, nível, pontuação e moedas) desenhado numa faixa de textura no topo da tela.
+# Cada widget só é redesenhado na faixa quando o seu valor muda; com nada alterado,
+# o HUD inteiro custa um único quad por frame.
+
+from OpenGL.GL import *
+from OpenGL.GLU import *
+
+from layers import create_target, draw_target, release_target
+from render import SpriteBatch
+from text import draw_text
+
+WIDTH, HEIGHT = 800, 600
+HUD_HEIGHT = 90 # a faixa cobre y de HEIGHT - HUD_HEIGHT até HEIGHT
+
+def draw_num(batch, x, y, num, textures):
+    for digit in str(num):
+        idx = int(digit)
+        tex = textures[idx]
+        if tex:
+            batch.add(tex[0], x, y, tex[1], tex[2], uv=tex[3])
+            x += tex[1] + 2
+
+def draw_lives(batch, lives, vidas_texture):
+    if vidas_texture:
+        for i in range(lives):
+            x = 20 + i*28
+            y = HEIGHT-28
+            batch.add(vidas_texture[0], x, y, vidas_texture[1], vidas_texture[2], uv=vidas_texture[3])
+    else:
+        for i in range(lives):
+            batch.add_rect(20 + i*25, HEIGHT-30, 35 + i*25, HEIGHT-10, (1, 0, 0, 1))
+
+def num_width(num, textures):
+    return sum(textures[int(d)][1] + 2 for d in str(num))
+
+def draw_score(batch, score, numeros_texture):
+    draw_num(batch, WIDTH - num_width(score, numeros_texture) - 20, HEIGHT - 40, score, numeros_texture)
+
+def draw_nivel(batch, nivel, numeros_texture):
+    draw_num(batch, WIDTH//2 - 20, HEIGHT - 40, nivel, numeros_texture)
+
+class Hud:
+    # Área reservada (x0, y0, x1, y1) de cada widget, em coordenadas da tela
+    SLOTS = {
+        "lives": (0, HEIGHT - 45, WIDTH//2 - 40, HEIGHT),
+        "nivel": (WIDTH//2 - 40, HEIGHT - 45, WIDTH//2 + 40, HEIGHT),
+        "score": (WIDTH//2 + 40, HEIGHT - 45, WIDTH, HEIGHT),
+        "coins": (0, HEIGHT - HUD_HEIGHT, WIDTH//2 - 40, HEIGHT - 45)
+    }
+
+    def __init__(self, vidas_texture, numeros_texture):
+        self.vidas_texture = vidas_texture
+        self.numeros_texture = numeros_texture
+        self.values = {}
+        self.tex_id = None
+        self.fbo = None
+        # A faixa começa transparente: a cor é acumulada já multiplicada pelo alpha e o
+        # alpha é somado, para depois compor com (ONE, ONE_MINUS_SRC_ALPHA)
+        self.batch = SpriteBatch(blend_func=(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE_MINUS_SRC_ALPHA))
+
+    def _draw_widget(self, batch, name, value):
+        if name == "lives":
+            draw_lives(batch, value, self.vidas_texture)
+        elif name == "nivel":
+            draw_nivel(batch, value, self.numeros_texture)
+        elif name == "score":
+            draw_score(batch, value, self.numeros_texture)
+        elif name == "coins":
+            batch.flush()
+            draw_text(60, 50, f"Coins: {value}", size=24)
+
+    def _rebuild(self, changed):
+        # Limpa só as áreas dos widgets alterados e redesenha esses widgets na faixa
+        viewport = glGetIntegerv(GL_VIEWPORT)
+        clear_color = glGetFloatv(GL_COLOR_CLEAR_VALUE)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, WIDTH, HUD_HEIGHT)
+        # O jogo configura a ortho direto na MODELVIEW; aqui as duas matrizes são trocadas e restauradas
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        gluOrtho2D(0, WIDTH, HEIGHT - HUD_HEIGHT, HEIGHT)
+
+        glClearColor(0, 0, 0, 0)
+        glEnable(GL_SCISSOR_TEST)
+        for name in changed:
+            x0, y0, x1, y1 = self.SLOTS[name]
+            glScissor(x0, y0 - (HEIGHT - HUD_HEIGHT), x1 - x0, y1 - y0)
+            glClear(GL_COLOR_BUFFER_BIT)
+            self._draw_widget(self.batch, name, self.values[name])
+            self.batch.flush()
+        glDisable(GL_SCISSOR_TEST)
+        glClearColor(*clear_color)
+
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glViewport(*viewport)
+
+    def draw(self, batch, ship, nivel):
+        values = {"lives": ship.lives, "nivel": nivel, "score": ship.score, "coins": ship.coins}
+        if self.tex_id is None:
+            self.tex_id, self.fbo = create_target(WIDTH, HUD_HEIGHT)
+
+        if not self.fbo:
+            # Sem FBO, desenha tudo direto na tela como antes
+            for name, value in values.items():
+                self._draw_widget(batch, name, value)
+            batch.flush()
+            return
+
+        changed = [name for name, value in values.items() if self.values.get(name) != value]
+        if changed:
+            self.values.update(values)
+            self._rebuild(changed)
+
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+        draw_target(self.tex_id, 0, HEIGHT - HUD_HEIGHT, WIDTH, HUD_HEIGHT)
+        glDisable(GL_BLEND)
+
+    def release(self):
+        release_target(self.tex_id, self.fbo)
+        self.fbo = None
+        self.tex_id = None
+        self.values = {}
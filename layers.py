@@ -0,0 +1,94 @@
+# layers.py
+# Camadas estáticas: o que não muda de um frame para o outro (fundo, telas de menu, tela
+# de pausa) é desenhado uma vez numa textura fora da tela (FBO) e depois só copiado com um
+# único quad. A camada é redesenhada apenas quando a chave com as suas entradas muda.
+
+from OpenGL.GL import *
+
+WIDTH, HEIGHT = 800, 600
+
+def draw_tiled_bg(batch, tex_id, tw, th):
+    # Um único quad com coordenadas de textura repetidas (GL_REPEAT) cobre os mesmos
+    # ladrilhos que antes eram desenhados um a um
+    cols = -(-WIDTH // tw)
+    rows = -(-HEIGHT // th)
+    batch.add(tex_id, 0, 0, cols * tw, rows * th, uv=(0, 0, cols, rows), blend=False)
+
+def create_target(width, height):
+    # Textura RGBA vazia e um FBO que desenha nela. Sem suporte a FBO (ou com o FBO incompleto)
+    # o fbo volta None e quem chama desenha pelo caminho alternativo
+    tex_id = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, tex_id)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+    fbo = None
+    if bool(glGenFramebuffers):
+        fbo = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, tex_id, 0)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            glDeleteFramebuffers(1, [fbo])
+            fbo = None
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+    return tex_id, fbo
+
+def draw_target(tex_id, x, y, width, height):
+    # Copia a textura para a tela com um único quad
+    glEnable(GL_TEXTURE_2D)
+    glBindTexture(GL_TEXTURE_2D, tex_id)
+    glColor4f(1, 1, 1, 1)
+    glBegin(GL_QUADS)
+    glTexCoord2f(0, 0); glVertex2f(x, y)
+    glTexCoord2f(1, 0); glVertex2f(x + width, y)
+    glTexCoord2f(1, 1); glVertex2f(x + width, y + height)
+    glTexCoord2f(0, 1); glVertex2f(x, y + height)
+    glEnd()
+    glDisable(GL_TEXTURE_2D)
+
+def release_target(tex_id, fbo):
+    if fbo:
+        glDeleteFramebuffers(1, [fbo])
+    if tex_id is not None:
+        glDeleteTextures([tex_id])
+
+class StaticLayer:
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        self.width = width
+        self.height = height
+        self.key = None
+        self.tex_id = None
+        self.fbo = None
+
+    def _create(self):
+        # Sem FBO, a camada é desenhada no back buffer e copiada para a textura
+        self.tex_id, self.fbo = create_target(self.width, self.height)
+
+    def invalidate(self):
+        self.key = None
+
+    def draw(self, key, render):
+        # render() desenha a camada do zero (inclusive o glClear); só é chamada quando a chave muda
+        if self.tex_id is None:
+            self._create()
+        if key != self.key:
+            if self.fbo:
+                viewport = glGetIntegerv(GL_VIEWPORT)
+                glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+                glViewport(0, 0, self.width, self.height)
+                render()
+                glBindFramebuffer(GL_FRAMEBUFFER, 0)
+                glViewport(*viewport)
+            else:
+                render()
+                glBindTexture(GL_TEXTURE_2D, self.tex_id)
+                glCopyTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, 0, 0, self.width, self.height)
+            self.key = key
+
+        draw_target(self.tex_id, 0, 0, self.width, self.height)
+
+    def release(self):
+        release_target(self.tex_id, self.fbo)
+        self.fbo = None
+        self.tex_id = None
+        self.key = None
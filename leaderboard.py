@@ -0,0 +1,301 @@
+# leaderboard.py
+# Placar em SQLite: guarda todas as pontuações (não só as 10 melhores), com índices por
+# pontuação, data e nave. O top-N, o ranking de uma pontuação e os placares por nave ou por
+# período são consultas nos índices e continuam rápidos com milhões de linhas.
+
+import json
+import math
+import os
+import sqlite3
+import time
+
+DB_FILE = 'scores.db'
+HIGHSCORES_FILE = 'highscores.json' # formato antigo, importado uma vez
+TOP_SIZE = 10
+DAY = 86400 # segundos; as contagens por período são por dia UTC
+
+# Períodos dos placares, em segundos antes de agora
+PERIODS = {
+    "day": 24 * 3600,
+    "week": 7 * 24 * 3600,
+    "month": 30 * 24 * 3600
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    initials TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    ship TEXT,
+    created REAL NOT NULL
+);
+-- Empates ficam na ordem de chegada (rowid crescente), como no highscores.json
+CREATE INDEX IF NOT EXISTS scores_score ON scores (score DESC);
+CREATE INDEX IF NOT EXISTS scores_ship ON scores (ship, score DESC);
+-- Cobre os filtros por período (e por nave) sem ler as linhas da tabela
+CREATE INDEX IF NOT EXISTS scores_created_score ON scores (created, score, ship);
+CREATE INDEX IF NOT EXISTS scores_initials ON scores (initials, created);
+-- Quantas vezes cada pontuação aparece: o ranking geral soma algumas centenas de linhas
+-- daqui em vez de contar milhões de linhas no índice
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    n INTEGER NOT NULL
+);
+-- O mesmo por nave, e por dia (UTC) para os placares por período; ship = '' conta todas as naves
+CREATE TABLE IF NOT EXISTS ship_score_counts (
+    ship TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (ship, score)
+);
+CREATE TABLE IF NOT EXISTS day_score_counts (
+    ship TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (ship, day, score)
+);
+CREATE TRIGGER IF NOT EXISTS scores_insert AFTER INSERT ON scores BEGIN
+    INSERT INTO score_counts (score, n) VALUES (new.score, 1)
+        ON CONFLICT (score) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS scores_delete AFTER DELETE ON scores BEGIN
+    UPDATE score_counts SET n = n - 1 WHERE score = old.score;
+END;
+CREATE TRIGGER IF NOT EXISTS scores_insert_days AFTER INSERT ON scores BEGIN
+    INSERT INTO day_score_counts (ship, day, score, n) VALUES ('', CAST(new.created / 86400 AS INTEGER), new.score, 1)
+        ON CONFLICT (ship, day, score) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS scores_delete_days AFTER DELETE ON scores BEGIN
+    UPDATE day_score_counts SET n = n - 1
+        WHERE ship = '' AND day = CAST(old.created / 86400 AS INTEGER) AND score = old.score;
+END;
+CREATE TRIGGER IF NOT EXISTS scores_insert_ship AFTER INSERT ON scores WHEN new.ship IS NOT NULL BEGIN
+    INSERT INTO ship_score_counts (ship, score, n) VALUES (new.ship, new.score, 1)
+        ON CONFLICT (ship, score) DO UPDATE SET n = n + 1;
+    INSERT INTO day_score_counts (ship, day, score, n) VALUES (new.ship, CAST(new.created / 86400 AS INTEGER), new.score, 1)
+        ON CONFLICT (ship, day, score) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS scores_delete_ship AFTER DELETE ON scores WHEN old.ship IS NOT NULL BEGIN
+    UPDATE ship_score_counts SET n = n - 1 WHERE ship = old.ship AND score = old.score;
+    UPDATE day_score_counts SET n = n - 1
+        WHERE ship = old.ship AND day = CAST(old.created / 86400 AS INTEGER) AND score = old.score;
+END;
+-- Pontuações enviadas com o replay da partida; só entram em scores depois que o
+-- verifier.py refaz a partida e chega ao mesmo resultado
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    initials TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    ship TEXT,
+    created REAL NOT NULL,
+    seed INTEGER NOT NULL,
+    replay BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    score_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS submissions_status ON submissions (status, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class Leaderboard:
+    def __init__(self, path=DB_FILE, import_file=HIGHSCORES_FILE):
+        self.path = path
+        self.import_file = import_file
+        # A conexão só é aberta no primeiro uso (o modo sem janela nunca cria o arquivo)
+        self.conn = None
+
+    def _db(self):
+        if self.conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.executescript(SCHEMA)
+            self.conn = conn
+            if self.import_file:
+                self.import_json(self.import_file)
+        return self.conn
+
+    def import_json(self, path):
+        # Importa o highscores.json antigo uma única vez; as entradas ficam com a data do arquivo
+        conn = self._db()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'imported_json'").fetchone():
+            return 0
+        entries = []
+        created = time.time()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    entries = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Erro: não foi possível importar {path}: {e}")
+                return 0
+            created = os.path.getmtime(path)
+        with conn:
+            conn.executemany("INSERT INTO scores (initials, score, ship, created) VALUES (?, ?, NULL, ?)",
+                             [(entry['initials'], entry['score'], created) for entry in entries])
+            conn.execute("INSERT INTO meta (key, value) VALUES ('imported_json', ?)", (path,))
+        return len(entries)
+
+    def add(self, initials, score, ship=None, created=None):
+        conn = self._db()
+        with conn:
+            cursor = conn.execute("INSERT INTO scores (initials, score, ship, created) VALUES (?, ?, ?, ?)",
+                                  (initials, score, ship, time.time() if created is None else created))
+        return cursor.lastrowid
+
+    def add_many(self, entries):
+        # entries: (initials, score, ship, created), numa única transação
+        conn = self._db()
+        with conn:
+            conn.executemany("INSERT INTO scores (initials, score, ship, created) VALUES (?, ?, ?, ?)", entries)
+
+    def submit(self, initials, replay, ship=None, created=None):
+        # Envia a pontuação final do replay (já finalizado) para verificação
+        if replay.assisted:
+            raise ValueError("partidas com volta no tempo ou save-state não entram no placar")
+        conn = self._db()
+        with conn:
+            cursor = conn.execute("INSERT INTO submissions (initials, score, ship, created, seed, replay) "
+                                  "VALUES (?, ?, ?, ?, ?, ?)",
+                                  (initials, replay.final[0], ship, time.time() if created is None else created,
+                                   replay.seed, replay.to_bytes()))
+        return cursor.lastrowid
+
+    def pending(self, n=1000, after_id=0):
+        # Próximas submissões ainda não verificadas, em ordem de chegada
+        rows = self._db().execute("SELECT id, initials, score, ship, created, seed, replay FROM submissions "
+                                  "WHERE status = 'pending' AND id > ? ORDER BY id LIMIT ?", (after_id, n))
+        return [dict(row) for row in rows]
+
+    def submission(self, submission_id):
+        row = self._db().execute("SELECT id, initials, score, ship, created, seed, replay, status FROM submissions "
+                                 "WHERE id = ?", (submission_id,)).fetchone()
+        return dict(row) if row else None
+
+    def resolve(self, results):
+        # results: (id da submissão, aceita, nave tirada do replay); as aceitas entram no placar
+        # com a nave que foi simulada, tudo numa transação
+        conn = self._db()
+        with conn:
+            for submission_id, accepted, ship in results:
+                score_id = None
+                if accepted:
+                    initials, score, created = conn.execute("SELECT initials, score, created FROM submissions "
+                                                            "WHERE id = ?", (submission_id,)).fetchone()
+                    score_id = conn.execute("INSERT INTO scores (initials, score, ship, created) VALUES (?, ?, ?, ?)",
+                                            (initials, score, ship, created)).lastrowid
+                conn.execute("UPDATE submissions SET status = ?, score_id = ? WHERE id = ?",
+                             ("accepted" if accepted else "rejected", score_id, submission_id))
+
+    def _filters(self, ship, period, since, until):
+        where = []
+        args = []
+        if ship is not None:
+            where.append("ship = ?")
+            args.append(ship)
+        if period is not None:
+            if since is not None:
+                raise ValueError("use period ou since, não os dois")
+            since = time.time() - PERIODS[period]
+        if since is not None:
+            where.append("created >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("created < ?")
+            args.append(until)
+        return (" WHERE " + " AND ".join(where)) if where else "", args
+
+    def top(self, n=TOP_SIZE, ship=None, period=None, since=None, until=None):
+        # Lista de dicts com initials, score, ship e created, da maior pontuação para a menor
+        where, args = self._filters(ship, period, since, until)
+        rows = self._db().execute(f"SELECT initials, score, ship, created FROM scores{where} "
+                                  f"ORDER BY score DESC, id LIMIT ?", args + [n])
+        return [dict(row) for row in rows]
+
+    def rank(self, score, ship=None, period=None, since=None, until=None):
+        # Posição que a pontuação teria no placar (1 = primeiro lugar)
+        conn = self._db()
+        if period is not None:
+            if since is not None:
+                raise ValueError("use period ou since, não os dois")
+            since = time.time() - PERIODS[period]
+        if since is None and until is None:
+            if ship is None:
+                row = conn.execute("SELECT COALESCE(SUM(n), 0) FROM score_counts WHERE score > ?", (score,))
+            else:
+                row = conn.execute("SELECT COALESCE(SUM(n), 0) FROM ship_score_counts WHERE ship = ? AND score > ?",
+                                   (ship, score))
+            return row.fetchone()[0] + 1
+        return self._count_between(score, ship, since, until) + 1
+
+    def _count_between(self, score, ship, since, until):
+        # Pontuações maiores que score com since <= created < until: os dias inteiros do intervalo
+        # vêm de day_score_counts e só as pontas (no máximo um dia de cada lado) são contadas em
+        # scores. O dia de cada linha é calculado como nos triggers, então nada é contado duas vezes
+        conn = self._db()
+        first_day = math.floor(since / DAY) + 1 if since is not None else None
+        end_day = math.floor(until / DAY) if until is not None else None
+        # O "+" impede o SQLite de trocar o índice de created pelo de (ship, score)
+        ship_where = " AND +ship = ?" if ship is not None else ""
+        ship_args = [ship] if ship is not None else []
+
+        def count_rows(low, high, where="", args=()):
+            conditions = ["+score > ?"]
+            values = [score]
+            if low is not None:
+                conditions.append("created >= ?")
+                values.append(low)
+            if high is not None:
+                conditions.append("created < ?")
+                values.append(high)
+            return conn.execute(f"SELECT COUNT(*) FROM scores WHERE {' AND '.join(conditions)}{where}{ship_where}",
+                                values + list(args) + ship_args).fetchone()[0]
+
+        if first_day is not None and end_day is not None and first_day >= end_day:
+            # Intervalo curto: conta direto
+            return count_rows(since, until)
+
+        conditions = ["ship = ?", "score > ?"]
+        values = [ship if ship is not None else "", score]
+        if first_day is not None:
+            conditions.append("day >= ?")
+            values.append(first_day)
+        if end_day is not None:
+            conditions.append("day < ?")
+            values.append(end_day)
+        total = conn.execute(f"SELECT COALESCE(SUM(n), 0) FROM day_score_counts WHERE {' AND '.join(conditions)}",
+                             values).fetchone()[0]
+        if first_day is not None:
+            total += count_rows(since, first_day * DAY + 1, " AND CAST(created / 86400 AS INTEGER) < ?", [first_day])
+        if end_day is not None:
+            total += count_rows(end_day * DAY - 1, until, " AND CAST(created / 86400 AS INTEGER) >= ?", [end_day])
+        return total
+
+    def qualifies(self, score, n=TOP_SIZE):
+        # Entra no top-N se menos de n pontuações forem maiores ou iguais (empates ficam com quem chegou antes)
+        count = self._db().execute("SELECT COUNT(*) FROM (SELECT 1 FROM scores WHERE score >= ? LIMIT ?)",
+                                   (score, n)).fetchone()[0]
+        return count < n
+
+    def history(self, initials=None, n=50, offset=0):
+        # Pontuações mais recentes primeiro, de todos ou de umas iniciais
+        where, args = ("WHERE initials = ? ", [initials]) if initials is not None else ("", [])
+        rows = self._db().execute(f"SELECT initials, score, ship, created FROM scores {where}"
+                                  f"ORDER BY created DESC, id DESC LIMIT ? OFFSET ?", args + [n, offset])
+        return [dict(row) for row in rows]
+
+    def count(self):
+        return self._db().execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+leaderboard = Leaderboard()
@@ -5,28 +5,22 @@ from OpenGL.GLU import *
 import os
 import json
 
+from text import draw_text, text_size
+from render import SpriteBatch
+from layers import StaticLayer, draw_tiled_bg
+
 WIDTH, HEIGHT = 800, 600
 
-def draw_tiled_bg(tex_id, tw, th):
-    glEnable(GL_TEXTURE_2D)
-    glBindTexture(GL_TEXTURE_2D, tex_id)
-    glColor3f(1, 1, 1)
-    for x in range(0, WIDTH, tw):
-        for y in range(0, HEIGHT, th):
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex2f(x, y)
-            glTexCoord2f(1, 0); glVertex2f(x + tw, y)
-            glTexCoord2f(1, 1); glVertex2f(x + tw, y + th)
-            glTexCoord2f(0, 1); glVertex2f(x, y + th)
-            glEnd()
-    glDisable(GL_TEXTURE_2D)
-
-def draw_text(x, y, text, size=24):
-    font = pygame.font.SysFont('Arial', size)
-    text_surface = font.render(text, True, (255, 255, 255), (0, 0, 0))
-    text_data = pygame.image.tostring(text_surface, "RGBA", True)
-    glRasterPos2i(x, HEIGHT - y - text_surface.get_height())
-    glDrawPixels(text_surface.get_width(), text_surface.get_height(), GL_RGBA, GL_UNSIGNED_BYTE, text_data)
+# As telas de menu só mudam quando a seleção ou os dados mostrados mudam: ficam numa camada
+# estática compartilhada, redesenhada apenas quando a chave da tela muda
+screen_layer = StaticLayer()
+batch = SpriteBatch()
+
+def draw_background(bg_texture):
+    glClear(GL_COLOR_BUFFER_BIT)
+    if bg_texture:
+        draw_tiled_bg(batch, bg_texture[0], bg_texture[1], bg_texture[2])
+        batch.flush()
 
 def show_menu(bg_texture, clock):
     run_menu = True
@@ -50,35 +44,30 @@ def show_menu(bg_texture, clock):
                     elif options[selected_option] == "Quit":
                         return "quit"
                         
-        glClear(GL_COLOR_BUFFER_BIT)
-        
-        if bg_texture:
-            draw_tiled_bg(bg_texture[0], bg_texture[1], bg_texture[2])
-        
-        draw_text(WIDTH // 2 - 120, HEIGHT // 2 - 100, "GALAXIAN", size=48)
-        
-        for i, option in enumerate(options):
-            color = (255, 255, 255) if i == selected_option else (150, 150, 150)
-            
-            font = pygame.font.SysFont('Arial', 32)
-            text_surface = font.render(option, True, color, (0, 0, 0))
-            text_data = pygame.image.tostring(text_surface, "RGBA", True)
-            
-            x = WIDTH // 2 - text_surface.get_width() // 2
-            y = HEIGHT // 2 + 50 + i * 40
-            
-            glRasterPos2i(x, HEIGHT - y - text_surface.get_height())
-            glDrawPixels(text_surface.get_width(), text_surface.get_height(), GL_RGBA, GL_UNSIGNED_BYTE, text_data)
-        
+        def render():
+            draw_background(bg_texture)
+            draw_text(WIDTH // 2 - 120, HEIGHT // 2 - 100, "GALAXIAN", size=48)
+
+            for i, option in enumerate(options):
+                color = (255, 255, 255) if i == selected_option else (150, 150, 150)
+
+                x = WIDTH // 2 - text_size(option, 32)[0] // 2
+                y = HEIGHT // 2 + 50 + i * 40
+                draw_text(x, y, option, 32, color)
+
+        screen_layer.draw(("menu", bg_texture, selected_option), render)
         pygame.display.flip()
         clock.tick(30)
         
-def show_game_over(bg_texture, clock, highscores, score):
+def show_game_over(bg_texture, clock, highscores, score, refresh=None):
+    # refresh(), chamado a cada frame, devolve o placar novo quando ele muda (ou None)
     run_game_over = True
     selected_option = 0
     options = ["Back to Menu", "Quit"]
     
     while run_game_over:
+        if refresh:
+            highscores = refresh() or highscores
         for event in pygame.event.get():
             if event.type == QUIT:
                 return "quit", score
@@ -93,34 +82,27 @@ def show_game_over(bg_texture, clock, highscores, score):
                     elif options[selected_option] == "Quit":
                         return "quit", score
                         
-        glClear(GL_COLOR_BUFFER_BIT)
-        
-        if bg_texture:
-            draw_tiled_bg(bg_texture[0], bg_texture[1], bg_texture[2])
-        
-        draw_text(WIDTH // 2 - 160, HEIGHT // 2 - 180, "GAME OVER", size=48)
-        
-        draw_text(WIDTH // 2 - 100, HEIGHT // 2 - 120, "HIGH SCORES", size=32)
-        y_offset = HEIGHT // 2 - 80
-        for i, score_entry in enumerate(highscores[:3]):
-            rank = i + 1
-            score_text = f"{rank}. {score_entry['initials']} - {score_entry['score']}"
-            draw_text(WIDTH // 2 - 100, y_offset, score_text, size=24)
-            y_offset += 30
-            
-        for i, option in enumerate(options):
-            color = (255, 255, 255) if i == selected_option else (150, 150, 150)
-            
-            font = pygame.font.SysFont('Arial', 32)
-            text_surface = font.render(option, True, color, (0, 0, 0))
-            text_data = pygame.image.tostring(text_surface, "RGBA", True)
-            
-            x = WIDTH // 2 - text_surface.get_width() // 2
-            y = HEIGHT // 2 + 100 + i * 40
-            
-            glRasterPos2i(x, HEIGHT - y - text_surface.get_height())
-            glDrawPixels(text_surface.get_width(), text_surface.get_height(), GL_RGBA, GL_UNSIGNED_BYTE, text_data)
-        
+        def render():
+            draw_background(bg_texture)
+            draw_text(WIDTH // 2 - 160, HEIGHT // 2 - 180, "GAME OVER", size=48)
+
+            draw_text(WIDTH // 2 - 100, HEIGHT // 2 - 120, "HIGH SCORES", size=32)
+            y_offset = HEIGHT // 2 - 80
+            for i, score_entry in enumerate(highscores[:3]):
+                rank = i + 1
+                score_text = f"{rank}. {score_entry['initials']} - {score_entry['score']}"
+                draw_text(WIDTH // 2 - 100, y_offset, score_text, size=24)
+                y_offset += 30
+
+            for i, option in enumerate(options):
+                color = (255, 255, 255) if i == selected_option else (150, 150, 150)
+
+                x = WIDTH // 2 - text_size(option, 32)[0] // 2
+                y = HEIGHT // 2 + 100 + i * 40
+                draw_text(x, y, option, 32, color)
+
+        top_scores = tuple((entry['initials'], entry['score']) for entry in highscores[:3])
+        screen_layer.draw(("game_over", bg_texture, selected_option, top_scores), render)
         pygame.display.flip()
         clock.tick(30)
 
@@ -167,88 +149,51 @@ def show_shop(bg_texture, clock, player_data, coin_texture, ship_textures):
                         save_player_data(player_data)
                         return "menu", player_data
         
-        glClear(GL_COLOR_BUFFER_BIT)
-        if bg_texture:
-            draw_tiled_bg(bg_texture[0], bg_texture[1], bg_texture[2])
-        
-        draw_text(WIDTH // 2 - 60, 50, "SHOP", size=48)
-        draw_text(60, 50, f"Coins: {player_data['coins']}", size=24)
-        
-        y_start = 150
-        line_spacing = 100
-        
-        for i, item in enumerate(options):
-            y_pos = y_start + i * line_spacing
-            
-            color = (255, 255, 255) if i == selected_option else (150, 150, 150)
-            
-            if item["name"] == "Back to Menu":
-                font = pygame.font.SysFont('Arial', 32)
-                text_surface = font.render("Back to Menu", True, color, (0, 0, 0))
-                text_data = pygame.image.tostring(text_surface, "RGBA", True)
-                x = WIDTH // 2 - text_surface.get_width() // 2
-                glRasterPos2i(x, HEIGHT - y_pos - text_surface.get_height())
-                glDrawPixels(text_surface.get_width(), text_surface.get_height(), GL_RGBA, GL_UNSIGNED_BYTE, text_data)
-                continue
-                
-            ship = item
-            is_unlocked = ship["file"] in player_data["unlocked_ships"]
-            
-            glEnable(GL_TEXTURE_2D)
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            
-            ship_tex_id = ship_textures[ship["file"]][0]
-            glBindTexture(GL_TEXTURE_2D, ship_tex_id)
-            
-            if i == selected_option:
-                glColor4f(1, 1, 1, 1)
-            else:
-                glColor4f(0.6, 0.6, 0.6, 1)
-            
-            ship_x = WIDTH // 2 - 250
-            ship_y = HEIGHT - (y_pos + 30 + 32)
-            
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex2f(ship_x, ship_y)
-            glTexCoord2f(1, 0); glVertex2f(ship_x + 32, ship_y)
-            glTexCoord2f(1, 1); glVertex2f(ship_x + 32, ship_y + 32)
-            glTexCoord2f(0, 1); glVertex2f(ship_x, ship_y + 32)
-            glEnd()
-            
-            glDisable(GL_TEXTURE_2D)
-            glDisable(GL_BLEND)
-
-            font = pygame.font.SysFont('Arial', 32)
-            text_surface = font.render(ship["name"], True, color, (0, 0, 0))
-            text_data = pygame.image.tostring(text_surface, "RGBA", True)
-            glRasterPos2i(WIDTH // 2 - 150, HEIGHT - y_pos - text_surface.get_height())
-            glDrawPixels(text_surface.get_width(), text_surface.get_height(), GL_RGBA, GL_UNSIGNED_BYTE, text_data)
-            
-            draw_text(WIDTH // 2 - 150, y_pos + 30, f"Speed: {ship['speed']}", size=18)
-            draw_text(WIDTH // 2 - 150, y_pos + 50, f"Lives: {ship['lives']}", size=18)
-            draw_text(WIDTH // 2 - 150, y_pos + 70, f"Fire Rate: {100/ship['fire_rate']:.0f}%", size=18)
-            
-            if is_unlocked:
-                draw_text(WIDTH // 2 + 50, y_pos, "OWNED", size=24)
-            else:
-                glPushMatrix()
-                glTranslate(WIDTH // 2 + 50, HEIGHT - (y_pos + 10), 0)
-                glScale(20, 20, 1)
-                glEnable(GL_TEXTURE_2D)
-                glEnable(GL_BLEND)
-                glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-                glBindTexture(GL_TEXTURE_2D, coin_texture[0])
-                glBegin(GL_QUADS)
-                glTexCoord2f(0, 0); glVertex2f(-0.5, -0.5)
-                glTexCoord2f(1, 0); glVertex2f(0.5, -0.5)
-                glTexCoord2f(1, 1); glVertex2f(0.5, 0.5)
-                glTexCoord2f(0, 1); glVertex2f(-0.5, 0.5)
-                glEnd()
-                glDisable(GL_TEXTURE_2D)
-                glDisable(GL_BLEND)
-                glPopMatrix()
-                draw_text(WIDTH // 2 + 70, y_pos, str(ship["price"]), size=24)
-        
+        def render():
+            draw_background(bg_texture)
+            draw_text(WIDTH // 2 - 60, 50, "SHOP", size=48)
+            draw_text(60, 50, f"Coins: {player_data['coins']}", size=24)
+
+            y_start = 150
+            line_spacing = 100
+
+            for i, item in enumerate(options):
+                y_pos = y_start + i * line_spacing
+
+                color = (255, 255, 255) if i == selected_option else (150, 150, 150)
+
+                if item["name"] == "Back to Menu":
+                    x = WIDTH // 2 - text_size("Back to Menu", 32)[0] // 2
+                    draw_text(x, y_pos, "Back to Menu", 32, color)
+                    continue
+
+                ship = item
+                is_unlocked = ship["file"] in player_data["unlocked_ships"]
+
+                # Ícones vão para o lote (desenhado no fim); não se sobrepõem aos textos
+                ship_tex = ship_textures[ship["file"]]
+                shade = 1 if i == selected_option else 0.6
+                ship_x = WIDTH // 2 - 250
+                ship_y = HEIGHT - (y_pos + 30 + 32)
+                batch.add(ship_tex[0], ship_x, ship_y, 32, 32, (shade, shade, shade, 1), ship_tex[3])
+
+                draw_text(WIDTH // 2 - 150, y_pos, ship["name"], 32, color)
+
+                draw_text(WIDTH // 2 - 150, y_pos + 30, f"Speed: {ship['speed']}", size=18)
+                draw_text(WIDTH // 2 - 150, y_pos + 50, f"Lives: {ship['lives']}", size=18)
+                draw_text(WIDTH // 2 - 150, y_pos + 70, f"Fire Rate: {100/ship['fire_rate']:.0f}%", size=18)
+
+                if is_unlocked:
+                    draw_text(WIDTH // 2 + 50, y_pos, "OWNED", size=24)
+                else:
+                    coin_x = WIDTH // 2 + 50
+                    coin_y = HEIGHT - (y_pos + 10)
+                    batch.add(coin_texture[0], coin_x - 10, coin_y - 10, 20, 20, uv=coin_texture[3])
+                    draw_text(WIDTH // 2 + 70, y_pos, str(ship["price"]), size=24)
+            batch.flush()
+
+        shop_key = ("shop", bg_texture, selected_option, player_data["coins"],
+                    tuple(player_data["unlocked_ships"]), player_data["current_ship"])
+        screen_layer.draw(shop_key, render)
         pygame.display.flip()
         clock.tick(30)
\ No newline at end of file
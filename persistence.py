@@ -0,0 +1,123 @@
+# persistence.py
+# Dados salvos do jogo (player_data.json, highscores.json) mantidos em memória e gravados
+# em segundo plano. Cada gravação vai para um arquivo temporário que depois substitui o
+# original com os.replace, então um travamento no meio nunca deixa um JSON pela metade.
+# Várias gravações seguidas do mesmo arquivo viram uma só.
+
+import atexit
+import json
+import os
+import threading
+
+# "always": fsync do arquivo e da pasta (sobrevive a queda de energia)
+# "file": fsync só do arquivo; "never": confia no sistema operacional
+FSYNC_POLICY = "always"
+COALESCE_DELAY = 0.05 # segundos esperando mais gravações antes de escrever
+
+def atomic_write(path, text, fsync=FSYNC_POLICY):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        if fsync != "never":
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if fsync == "always" and hasattr(os, "O_DIRECTORY"):
+        # Garante que a troca de nome também foi para o disco
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+class JsonStore:
+    def __init__(self, fsync=FSYNC_POLICY, delay=COALESCE_DELAY):
+        self.fsync = fsync
+        self.delay = delay
+        # Caminho -> dados atuais (servidos nas leituras) e caminho -> JSON ainda não gravado
+        self.cache = {}
+        self.pending = {}
+        self.writing = False
+        self.closed = False
+        self.cond = threading.Condition()
+        self.thread = None
+
+    def load(self, path, default=None):
+        # Só a primeira leitura de cada arquivo vai ao disco. Retorna None se o arquivo não
+        # existir (ou estiver corrompido) e não houver default
+        with self.cond:
+            if path in self.cache:
+                return self.cache[path]
+        data = default
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Erro: não foi possível ler {path}: {e}")
+        if data is not None:
+            with self.cond:
+                data = self.cache.setdefault(path, data)
+        return data
+
+    def save(self, path, data, indent=None):
+        # O JSON é gerado aqui, então mudanças posteriores em data não afetam esta gravação
+        text = json.dumps(data, indent=indent)
+        with self.cond:
+            self.cache[path] = data
+            self.pending[path] = text
+            if self.closed:
+                # Depois do close (ex.: durante o atexit), grava direto
+                self._write_pending()
+                return
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+                self.thread.start()
+            self.cond.notify_all()
+
+    def _write_pending(self):
+        # Chamado com o lock; libera durante a escrita para não travar quem está salvando
+        pending, self.pending = self.pending, {}
+        self.writing = True
+        self.cond.release()
+        try:
+            for path, text in pending.items():
+                try:
+                    atomic_write(path, text, self.fsync)
+                except OSError as e:
+                    print(f"Erro: não foi possível salvar {path}: {e}")
+        finally:
+            self.cond.acquire()
+            self.writing = False
+            self.cond.notify_all()
+
+    def _run(self):
+        with self.cond:
+            while True:
+                while not self.pending and not self.closed:
+                    self.cond.wait()
+                if not self.pending:
+                    return
+                if self.delay and not self.closed:
+                    self.cond.wait(self.delay)
+                self._write_pending()
+
+    def flush(self):
+        # Espera até tudo que foi salvo estar no disco
+        with self.cond:
+            if self.thread is None and self.pending:
+                self._write_pending()
+            while self.pending or self.writing:
+                self.cond.wait()
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.flush()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+store = JsonStore()
+atexit.register(store.close)
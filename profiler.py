@@ -0,0 +1,144 @@
+# profiler.py
+# Profiler de frames: mede quanto cada fase do loop do jogo (entrada, nave, aliens, colisões,
+# boss, desenho, texto, flip...) custou em cada frame e mostra na tela um gráfico dos últimos
+# frames com o detalhamento por fase. Desligado, o custo é um "if" por fase.
+
+import csv
+import os
+import time
+
+import numpy as np
+from OpenGL.GL import *
+
+from text import draw_text
+
+WIDTH, HEIGHT = 800, 600
+PROFILE_DIR = 'profiles'
+PROFILE_HISTORY = 600 # frames guardados para o gráfico e para o CSV
+
+# Fases na ordem em que acontecem no frame, com a cor usada no gráfico
+PHASES = (
+    ("input", (0.6, 0.6, 0.6)),
+    ("ship", (0.2, 0.6, 1.0)),
+    ("aliens", (0.2, 0.9, 0.3)),
+    ("collisions", (1.0, 0.9, 0.2)),
+    ("boss", (1.0, 0.3, 0.3)),
+    ("stars", (0.5, 0.5, 1.0)),
+    ("draw", (1.0, 0.6, 0.1)),
+    ("text", (0.9, 0.4, 0.9)),
+    ("overlay", (0.4, 0.4, 0.4)),
+    ("flip", (0.2, 0.9, 0.9)),
+    ("wait", (0.15, 0.15, 0.15))
+)
+PHASE_INDEX = {name: i for i, (name, _) in enumerate(PHASES)}
+
+GRAPH_FRAMES = 240 # um pixel de largura por frame
+GRAPH_HEIGHT = 100
+GRAPH_MS = 50 # altura do gráfico em milissegundos
+GRAPH_X = WIDTH - GRAPH_FRAMES - 10
+GRAPH_Y = 10
+LABEL_UPDATE_FRAMES = 30 # o texto muda poucas vezes por segundo para não encher o cache de texturas
+
+class FrameProfiler:
+    def __init__(self, history=PROFILE_HISTORY):
+        self.enabled = False
+        self.history = history
+        # Segundos por fase de cada frame, num anel: a linha do frame n é n % history
+        self.times = np.zeros((history, len(PHASES)))
+        self.frames = 0
+        self.current = [0.0] * len(PHASES)
+        self.last = 0.0
+        self.labels = []
+
+        # Vértices e cores das barras do gráfico, preenchidos a cada desenho
+        self.xy = np.zeros((GRAPH_FRAMES, len(PHASES), 4, 2), np.float32)
+        colors = np.array([color for _, color in PHASES], np.float32)
+        self.rgb = np.ascontiguousarray(np.broadcast_to(colors[None, :, None, :], (GRAPH_FRAMES, len(PHASES), 4, 3)))
+        x = GRAPH_X + np.arange(GRAPH_FRAMES, dtype=np.float32)
+        self.xy[:, :, 0, 0] = x[:, None]
+        self.xy[:, :, 1, 0] = x[:, None] + 1
+        self.xy[:, :, 2, 0] = x[:, None] + 1
+        self.xy[:, :, 3, 0] = x[:, None]
+
+    def toggle(self):
+        self.enabled = not self.enabled
+
+    def begin_frame(self):
+        self.current = [0.0] * len(PHASES)
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        # O tempo desde a marca anterior vai para a fase que acabou de terminar
+        now = time.perf_counter()
+        self.current[PHASE_INDEX[phase]] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        self.times[self.frames % self.history] = self.current
+        self.frames += 1
+        if self.frames % LABEL_UPDATE_FRAMES == 1:
+            self._update_labels()
+
+    def recent(self, n):
+        # Últimos n frames gravados, do mais antigo para o mais recente
+        n = min(n, self.frames, self.history)
+        rows = np.arange(self.frames - n, self.frames) % self.history
+        return self.times[rows]
+
+    def _update_labels(self):
+        recent = self.recent(60)
+        if not len(recent):
+            return
+        means = recent.mean(axis=0) * 1e3
+        total = recent.sum(axis=1) * 1e3
+        self.labels = [(f"frame {total.mean():5.1f} ms  p99 {np.percentile(total, 99):5.1f} ms", (255, 255, 255))]
+        for (name, color), ms in zip(PHASES, means):
+            self.labels.append((f"{name:<10} {ms:6.2f} ms", tuple(int(c * 255) for c in color)))
+
+    def draw(self, batch):
+        recent = self.recent(GRAPH_FRAMES)
+        n = len(recent)
+        # Fundo e linhas de referência de 60 e 30 fps
+        batch.add_rect(GRAPH_X, GRAPH_Y, GRAPH_X + GRAPH_FRAMES, GRAPH_Y + GRAPH_HEIGHT, (0, 0, 0, 0.6), blend=True)
+        for ms in (1000 / 60, 1000 / 30):
+            y = GRAPH_Y + ms * GRAPH_HEIGHT / GRAPH_MS
+            batch.add_rect(GRAPH_X, y, GRAPH_X + GRAPH_FRAMES, y + 1, (1, 1, 1, 0.5), blend=True)
+        batch.flush()
+
+        if n:
+            # Barras empilhadas: cada fase começa onde a anterior terminou
+            scale = 1e3 * GRAPH_HEIGHT / GRAPH_MS
+            top = np.minimum(np.cumsum(recent, axis=1) * scale, GRAPH_HEIGHT) + GRAPH_Y
+            bottom = np.empty_like(top)
+            bottom[:, 0] = GRAPH_Y
+            bottom[:, 1:] = top[:, :-1]
+            xy = self.xy[GRAPH_FRAMES - n:]
+            xy[:, :, 0, 1] = bottom
+            xy[:, :, 1, 1] = bottom
+            xy[:, :, 2, 1] = top
+            xy[:, :, 3, 1] = top
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(2, GL_FLOAT, 0, xy)
+            glColorPointer(3, GL_FLOAT, 0, self.rgb[GRAPH_FRAMES - n:])
+            glDrawArrays(GL_QUADS, 0, n * len(PHASES) * 4)
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+
+        y = HEIGHT - GRAPH_Y - GRAPH_HEIGHT - 16 * len(self.labels) - 6
+        for label, color in self.labels:
+            draw_text(GRAPH_X, y, label, size=14, color=color)
+            y += 16
+
+    def dump_csv(self, directory=PROFILE_DIR):
+        # Grava os frames guardados (até PROFILE_HISTORY) em milissegundos, um por linha
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime("frames-%Y%m%d-%H%M%S.csv"))
+        recent = self.recent(self.history) * 1e3
+        first = self.frames - len(recent)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + [name + "_ms" for name, _ in PHASES])
+            for i, row in enumerate(recent):
+                writer.writerow([first + i, f"{row.sum():.3f}"] + [f"{ms:.3f}" for ms in row])
+        return path
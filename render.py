@@ -0,0 +1,115 @@
+# render.py
+# Renderização em lote: os quads são agrupados por textura em arrays de vértices
+# e cada grupo é desenhado com uma única chamada glDrawArrays
+
+import numpy as np
+from OpenGL.GL import *
+
+FULL_UV = (0.0, 0.0, 1.0, 1.0)
+WHITE = (1.0, 1.0, 1.0, 1.0)
+
+class QuadBuffer:
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.capacity = 0
+        self.xy = np.zeros((0, 2), np.float32)
+        self.uv = np.zeros((0, 2), np.float32)
+        self.rgba = np.zeros((0, 4), np.float32)
+        self.reserve(capacity)
+
+    def reserve(self, k):
+        needed = self.count + k
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2, 64)
+        for name, width in (("xy", 2), ("uv", 2), ("rgba", 4)):
+            column = np.zeros((capacity * 4, width), np.float32)
+            column[:self.count * 4] = getattr(self, name)[:self.count * 4]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+class SpriteBatch:
+    def __init__(self, blend_func=None):
+        # blend_func: 4 fatores para glBlendFuncSeparate (ex.: ao desenhar numa textura com transparência)
+        self.blend_func = blend_func
+        # (id da textura ou None, usa blend) -> QuadBuffer, reaproveitados entre frames
+        self.buffers = {}
+        # Grupos usados desde o último flush, na ordem em que apareceram (define a ordem de desenho)
+        self.order = []
+
+    def _buffer(self, tex_id, blend):
+        key = (tex_id, blend)
+        buf = self.buffers.get(key)
+        if buf is None:
+            buf = self.buffers[key] = QuadBuffer()
+        if not buf.count:
+            self.order.append(key)
+        return buf
+
+    def add(self, tex_id, x, y, w, h, color=WHITE, uv=FULL_UV, blend=True):
+        buf = self._buffer(tex_id, blend)
+        buf.reserve(1)
+        i = buf.count * 4
+        u0, v0, u1, v1 = uv
+        buf.xy[i:i + 4] = ((x, y), (x + w, y), (x + w, y + h), (x, y + h))
+        buf.uv[i:i + 4] = ((u0, v0), (u1, v0), (u1, v1), (u0, v1))
+        buf.rgba[i:i + 4] = color
+        buf.count += 1
+
+    def add_rect(self, x1, y1, x2, y2, color, blend=False):
+        # Equivalente a glRectf, sem textura
+        self.add(None, x1, y1, x2 - x1, y2 - y1, color, blend=blend)
+
+    def add_many(self, tex_id, xs, ys, w, h, color=WHITE, uv=FULL_UV, blend=True):
+        # Vários quads do mesmo tamanho de uma vez (xs e ys são arrays com o canto inferior esquerdo)
+        k = len(xs)
+        if not k:
+            return
+        buf = self._buffer(tex_id, blend)
+        buf.reserve(k)
+        i = buf.count * 4
+        u0, v0, u1, v1 = uv
+        xy = buf.xy[i:i + k * 4].reshape(k, 4, 2)
+        xy[:, 0, 0] = xs
+        xy[:, 0, 1] = ys
+        xy[:, 1, 0] = xs + w
+        xy[:, 1, 1] = ys
+        xy[:, 2, 0] = xs + w
+        xy[:, 2, 1] = ys + h
+        xy[:, 3, 0] = xs
+        xy[:, 3, 1] = ys + h
+        buf.uv[i:i + k * 4].reshape(k, 4, 2)[:] = ((u0, v0), (u1, v0), (u1, v1), (u0, v1))
+        buf.rgba[i:i + k * 4] = color
+        buf.count += k
+
+    def flush(self):
+        if not self.order:
+            return
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        for tex_id, blend in self.order:
+            buf = self.buffers[(tex_id, blend)]
+            n = buf.count * 4
+            if blend:
+                glEnable(GL_BLEND)
+                if self.blend_func:
+                    glBlendFuncSeparate(*self.blend_func)
+                else:
+                    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+            if tex_id:
+                glEnable(GL_TEXTURE_2D)
+                glBindTexture(GL_TEXTURE_2D, tex_id)
+                glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+                glTexCoordPointer(2, GL_FLOAT, 0, buf.uv[:n])
+            glVertexPointer(2, GL_FLOAT, 0, buf.xy[:n])
+            glColorPointer(4, GL_FLOAT, 0, buf.rgba[:n])
+            glDrawArrays(GL_QUADS, 0, n)
+            if tex_id:
+                glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+                glDisable(GL_TEXTURE_2D)
+            if blend:
+                glDisable(GL_BLEND)
+            buf.count = 0
+        self.order = []
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
@@ -0,0 +1,174 @@
+# replay.py
+# Gravação e reprodução de partidas. Com a semente da partida e a máscara de entrada de
+# cada tick, a simulação sem janela refaz o jogo inteiro até o mesmo placar e estado.
+#
+# Formato binário (little-endian):
+#   cabeçalho  "GLXR", versão (u8), flags (u8), semente (u64), ticks (u32)
+#              flags: ASSISTED se a partida usou volta no tempo ou save-state
+#   nave       speed (f64), lives (u8), fire_rate (u8)
+#   resultado  score (u32), coins (u32), nivel (u16), lives (i16), digest do estado (u32)
+#   entradas   sequências (máscara, repetições) em varint LEB128: (repetições << 3) | máscara
+
+import argparse
+import os
+import struct
+import sys
+import zlib
+
+import numpy as np
+
+from game import GameState, ScriptedInput
+
+MAGIC = b"GLXR"
+VERSION = 2
+HEADER = struct.Struct("<4sBBQI")
+ASSISTED = 1
+SHIP = struct.Struct("<dBB")
+FINAL = struct.Struct("<IIHhI")
+MASK_BITS = 3
+
+def state_digest(state):
+    # CRC32 do que define a partida: nave, formação, tiros, power-ups e boss
+    ship = state.ship
+    crc = zlib.crc32(struct.pack("<dqqqqqq", ship.x, ship.score, ship.coins, ship.lives, ship.cooldown,
+                                 state.nivel, state.ticks))
+    stores = [ship.bullets, state.formation, state.powerup_store]
+    if state.boss:
+        boss = state.boss
+        crc = zlib.crc32(struct.pack("<ddqq", boss.x, boss.y, boss.health, boss.cooldown), crc)
+        stores.append(boss.bullets)
+    for store in stores:
+        for name in store.COLUMNS:
+            crc = zlib.crc32(np.ascontiguousarray(getattr(store, name)[:store.count]).tobytes(), crc)
+    return crc
+
+def _write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("entradas do replay corrompidas")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+class Replay:
+    def __init__(self, ship_attributes, seed, inputs=None, final=None, assisted=False):
+        self.ship_attributes = dict(ship_attributes)
+        self.seed = seed
+        self.inputs = bytearray(inputs or b"")
+        # Volta no tempo ou save-state: o replay continua exato, mas a partida não vale placar
+        self.assisted = assisted
+        # (score, coins, nivel, lives, digest) ao fim da gravação
+        self.final = final
+
+    def record(self, actions):
+        self.inputs.append(actions)
+
+    def finish(self, state):
+        ship = state.ship
+        self.final = (ship.score, ship.coins, state.nivel, ship.lives, state_digest(state))
+
+    def to_bytes(self):
+        attrs = self.ship_attributes
+        out = bytearray(HEADER.pack(MAGIC, VERSION, ASSISTED if self.assisted else 0, self.seed, len(self.inputs)))
+        out += SHIP.pack(attrs["speed"], attrs["lives"], attrs["fire_rate"])
+        out += FINAL.pack(*(self.final or (0, 0, 0, 0, 0)))
+        inputs = self.inputs
+        i = 0
+        while i < len(inputs):
+            mask = inputs[i]
+            run = 1
+            while i + run < len(inputs) and inputs[i + run] == mask:
+                run += 1
+            _write_varint(out, (run << MASK_BITS) | mask)
+            i += run
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data, max_ticks=None):
+        # max_ticks recusa replays longos demais antes de decodificar as entradas (replays
+        # enviados por terceiros não podem prender o verificador)
+        if len(data) < 5 or data[:4] != MAGIC or data[4] != VERSION:
+            raise ValueError("arquivo de replay inválido ou de outra versão")
+        if len(data) < HEADER.size + SHIP.size + FINAL.size:
+            raise ValueError("arquivo de replay truncado")
+        _, _, flags, seed, ticks = HEADER.unpack_from(data, 0)
+        if max_ticks is not None and ticks > max_ticks:
+            raise ValueError(f"replay longo demais: {ticks} ticks (máximo {max_ticks})")
+        pos = HEADER.size
+        speed, lives, fire_rate = SHIP.unpack_from(data, pos)
+        pos += SHIP.size
+        final = FINAL.unpack_from(data, pos)
+        pos += FINAL.size
+        inputs = bytearray()
+        while len(inputs) < ticks:
+            value, pos = _read_varint(data, pos)
+            run = value >> MASK_BITS
+            if not run or len(inputs) + run > ticks:
+                raise ValueError("entradas do replay corrompidas")
+            inputs += bytes([value & ((1 << MASK_BITS) - 1)]) * run
+        return cls({"speed": speed, "lives": lives, "fire_rate": fire_rate}, seed, inputs, final,
+                   bool(flags & ASSISTED))
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path, max_ticks=None):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read(), max_ticks)
+
+def simulate(replay, max_ticks=None):
+    state = GameState(replay.ship_attributes, seed=replay.seed)
+    controls = ScriptedInput(list(replay.inputs))
+    ticks = len(replay.inputs) if max_ticks is None else min(len(replay.inputs), max_ticks)
+    while state.running and state.ticks < ticks:
+        state.step(controls.read(state))
+    return state
+
+def verify(replay):
+    state = simulate(replay)
+    ship = state.ship
+    result = (ship.score, ship.coins, state.nivel, ship.lives, state_digest(state))
+    return result == tuple(replay.final), state
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduz e confere replays do Galaxian")
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args()
+
+    failures = 0
+    for path in args.files:
+        try:
+            replay = Replay.load(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Erro: não foi possível ler {path}: {e}")
+            failures += 1
+            continue
+        ok, state = verify(replay)
+        status = ("OK" if ok else "DIVERGIU") + (" (assistida)" if replay.assisted else "")
+        print(f"{path}: {status} score={state.ship.score} nivel={state.nivel} ticks={state.ticks} "
+              f"(gravado: score={replay.final[0]} nivel={replay.final[2]})")
+        failures += not ok
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# rng.py
+# Fluxos de números aleatórios independentes por subsistema, todos derivados de uma semente.
+# Assim, mudar o consumo de um subsistema (ex.: estrelas) não altera o sorteio dos outros.
+
+import hashlib
+import random
+import struct
+from array import array
+
+# Estado de um fluxo em bytes: versão (u8), gauss_next (bool + f64) e as 625 palavras do
+# Mersenne Twister (u32)
+STATE = struct.Struct("<B?d")
+MT_WORDS = 625
+STATE_SIZE = STATE.size + MT_WORDS * 4
+
+def derive_seed(seed, name):
+    digest = hashlib.sha256(f"{seed}:{name}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+class StreamRandom(random.Random):
+    # random.Random que conta as mudanças de estado, para que dump() (usado pelas fotografias
+    # do estado em snapshot.py) só serialize de novo um fluxo que foi usado desde a última vez.
+    # Sobrescrever random e getrandbits juntos mantém os mesmos sorteios do random.Random
+    def __init__(self, seed=None):
+        self.changes = 0
+        self.saved = None # (changes, bytes) do último dump/load
+        random.Random.__init__(self, seed)
+
+    def seed(self, *args, **kwargs):
+        self.changes += 1
+        random.Random.seed(self, *args, **kwargs)
+
+    def setstate(self, state):
+        self.changes += 1
+        random.Random.setstate(self, state)
+
+    def random(self):
+        self.changes += 1
+        return random.Random.random(self)
+
+    def getrandbits(self, k):
+        self.changes += 1
+        return random.Random.getrandbits(self, k)
+
+    def gauss(self, mu=0.0, sigma=1.0):
+        self.changes += 1
+        return random.Random.gauss(self, mu, sigma)
+
+    def dump(self):
+        saved = self.saved
+        if saved is None or saved[0] != self.changes:
+            version, words, gauss_next = self.getstate()
+            data = STATE.pack(version, gauss_next is not None, gauss_next or 0.0) + array('I', words).tobytes()
+            saved = self.saved = (self.changes, data)
+        return saved[1]
+
+    def load(self, data):
+        data = bytes(data)
+        saved = self.saved
+        if saved is not None and saved[0] == self.changes and saved[1] == data:
+            return
+        version, has_gauss, gauss_next = STATE.unpack_from(data)
+        words = array('I')
+        words.frombytes(data[STATE.size:STATE_SIZE])
+        self.setstate((version, tuple(words), gauss_next if has_gauss else None))
+        self.saved = (self.changes, data)
+
+class RandomStreams:
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.randrange(2**63)
+        self.seed = seed
+        self.streams = {}
+
+    def stream(self, name):
+        rng = self.streams.get(name)
+        if rng is None:
+            rng = self.streams[name] = StreamRandom(derive_seed(self.seed, name))
+        return rng
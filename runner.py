@@ -0,0 +1,296 @@
+# runner.py
+# Roda muitos jogos sem janela (ou replays) em paralelo num pool de processos. Os resultados
+# chegam conforme os jogos terminam e vão direto para um arquivo JSONL; o resumo por grupo
+# usa memória fixa (médias acumuladas e uma amostra limitada), então o lote pode ter milhões
+# de jogos. Um jogo que levanta exceção ou derruba o processo vira um resultado com "error".
+#
+# Varreduras de balanceamento: --boss boss_1.health=150,200,250 e --ship-attr speed=4,5,6
+# rodam todas as combinações, com --games jogos por combinação.
+
+import os
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from game import GameState, ScriptedInput, SHIP_ATTRIBUTES
+from boss import BOSS_CONFIGS
+from headless import simple_bot
+from replay import Replay, simulate, state_digest
+
+MAX_TICKS = 20000
+SAMPLE_SIZE = 1024 # pontuações guardadas por grupo para os percentis do resumo
+IN_FLIGHT_PER_WORKER = 4 # jobs enviados por processo antes de esperar resultados
+
+def run_job(job):
+    # Roda no processo do pool. job: dict com "id" e "seed", "ship", "ship_attrs", "boss",
+    # "max_ticks" (jogo com o bot), ou "replay" (caminho de um replay) ou "replay_data" (bytes);
+    # "max_ticks" também limita o tamanho dos replays
+    start = time.perf_counter()
+    result = {"id": job["id"], "group": job.get("group", "")}
+    saved = {key: BOSS_CONFIGS[key] for key in job.get("boss", {})}
+    try:
+        # As variações de boss valem só para este job
+        for key, changes in job.get("boss", {}).items():
+            BOSS_CONFIGS[key] = dict(BOSS_CONFIGS[key], **changes)
+
+        max_ticks = job.get("max_ticks", MAX_TICKS)
+        if "replay" in job or "replay_data" in job:
+            # Replays com mais de max_ticks entradas são recusados (viram um resultado com erro)
+            if "replay" in job:
+                replay = Replay.load(job["replay"], max_ticks)
+            else:
+                replay = Replay.from_bytes(job["replay_data"], max_ticks)
+            state = simulate(replay, max_ticks)
+            ship = state.ship
+            result["verified"] = (ship.score, ship.coins, state.nivel, ship.lives, state_digest(state)) == tuple(replay.final)
+            result["ship_attributes"] = replay.ship_attributes
+            result["assisted"] = replay.assisted
+            tick_times = None
+        else:
+            attrs = dict(SHIP_ATTRIBUTES[job["ship"]], **job.get("ship_attrs", {}))
+            state = GameState(attrs, seed=job["seed"])
+            controls = ScriptedInput(simple_bot)
+            tick_times = np.zeros(max_ticks, np.int64)
+            perf_counter_ns = time.perf_counter_ns
+            while state.running and state.ticks < max_ticks:
+                actions = controls.read(state)
+                t = perf_counter_ns()
+                state.step(actions)
+                tick_times[state.ticks - 1] = perf_counter_ns() - t
+            tick_times = tick_times[:state.ticks] / 1e3
+
+        result.update(seed=state.seed, score=state.ship.score, nivel=state.nivel, ticks=state.ticks)
+        if tick_times is not None and len(tick_times):
+            result.update(tick_mean_us=round(float(tick_times.mean()), 2),
+                          tick_p50_us=round(float(np.percentile(tick_times, 50)), 2),
+                          tick_p99_us=round(float(np.percentile(tick_times, 99)), 2))
+    except Exception:
+        result["error"] = traceback.format_exc()
+    finally:
+        BOSS_CONFIGS.update(saved)
+    result["elapsed"] = round(time.perf_counter() - start, 4)
+    return result
+
+class GroupStats:
+    # Estatísticas em memória fixa: média e variância acumuladas (Welford) e uma amostra
+    # uniforme das pontuações (reservoir sampling) para os percentis
+    def __init__(self, sample_size=SAMPLE_SIZE, seed=0):
+        self.games = 0
+        self.errors = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max_score = None
+        self.nivel_total = 0
+        self.max_nivel = 0
+        self.ticks = 0
+        # Só os jogos com o bot medem o tempo por tick; replays contam só se conferem ou não
+        self.timed_ticks = 0
+        self.tick_us_total = 0.0
+        self.replays = 0
+        self.unverified = 0
+        self.sample = []
+        self.sample_size = sample_size
+        self.rng = random.Random(seed)
+
+    def add(self, result):
+        if "error" in result:
+            self.errors += 1
+            return
+        score = result["score"]
+        self.games += 1
+        delta = score - self.mean
+        self.mean += delta / self.games
+        self.m2 += delta * (score - self.mean)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        self.nivel_total += result["nivel"]
+        self.max_nivel = max(self.max_nivel, result["nivel"])
+        self.ticks += result["ticks"]
+        if "tick_mean_us" in result:
+            self.timed_ticks += result["ticks"]
+            self.tick_us_total += result["tick_mean_us"] * result["ticks"]
+        if "verified" in result:
+            self.replays += 1
+            self.unverified += not result["verified"]
+        if len(self.sample) < self.sample_size:
+            self.sample.append(score)
+        else:
+            i = self.rng.randrange(self.games)
+            if i < self.sample_size:
+                self.sample[i] = score
+
+    def summary(self):
+        if not self.games:
+            return {"games": 0, "errors": self.errors}
+        summary = {
+            "games": self.games,
+            "errors": self.errors,
+            "score_mean": round(self.mean, 2),
+            "score_std": round(math.sqrt(self.m2 / self.games), 2),
+            "score_p50": float(np.percentile(self.sample, 50)),
+            "score_p90": float(np.percentile(self.sample, 90)),
+            "score_max": self.max_score,
+            "nivel_mean": round(self.nivel_total / self.games, 2),
+            "nivel_max": self.max_nivel,
+            "ticks": self.ticks
+        }
+        if self.timed_ticks:
+            summary["tick_mean_us"] = round(self.tick_us_total / self.timed_ticks, 2)
+        if self.replays:
+            summary["replays"] = self.replays
+            summary["unverified"] = self.unverified
+        return summary
+
+def run_jobs(jobs, workers=None, in_flight=None):
+    # Gera os resultados na ordem em que terminam. Só in_flight jobs ficam pendentes ao
+    # mesmo tempo, então jobs pode ser um gerador enorme. Se um processo morrer, o pool é
+    # recriado e cada job que estava nele roda de novo num pool só dele: quem derrubar o
+    # próprio pool é o culpado e vira um resultado com erro, sem levar os outros junto
+    workers = workers or os.cpu_count()
+    in_flight = in_flight or workers * IN_FLIGHT_PER_WORKER
+    jobs = iter(jobs)
+    suspects = []
+    pool = ProcessPoolExecutor(max_workers=workers)
+    # future -> (job, pool exclusivo ou None se estiver no pool compartilhado)
+    pending = {}
+    try:
+        while True:
+            isolated = sum(1 for _, own in pending.values() if own)
+            while suspects and isolated < workers:
+                job = suspects.pop()
+                own = ProcessPoolExecutor(max_workers=1)
+                pending[own.submit(run_job, job)] = (job, own)
+                isolated += 1
+            for job in itertools.islice(jobs, in_flight - (len(pending) - isolated)):
+                pending[pool.submit(run_job, job)] = (job, None)
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                job, own = pending.pop(future)
+                if own:
+                    own.shutdown(wait=False)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    if own:
+                        result = {"id": job["id"], "group": job.get("group", ""), "seed": job.get("seed"),
+                                  "error": "o processo do jogo morreu"}
+                    else:
+                        broken = True
+                        suspects.append(job)
+                        continue
+                yield result
+            if broken:
+                # Todos os jobs do pool compartilhado se perderam junto com ele
+                for future, (job, own) in list(pending.items()):
+                    if not own:
+                        del pending[future]
+                        suspects.append(job)
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        for _, own in pending.values():
+            if own:
+                own.shutdown(wait=False, cancel_futures=True)
+
+def parse_sweep(specs):
+    # ["boss_1.health=150,200", ...] -> lista de (chave, valores)
+    sweep = []
+    for spec in specs:
+        key, _, values = spec.partition("=")
+        if not values:
+            raise argparse.ArgumentTypeError(f"variação inválida: {spec} (use chave=v1,v2,...)")
+        sweep.append((key, [json.loads(value) for value in values.split(",")]))
+    return sweep
+
+def game_jobs(ships, boss_sweep, ship_sweep, games, seed, max_ticks):
+    # Todas as combinações de nave x variações; a semente do jogo i de cada combinação é seed + i,
+    # então as combinações são comparadas nos mesmos jogos
+    job_id = 0
+    keys = [key for key, _ in boss_sweep + ship_sweep]
+    for ship in ships:
+        for values in itertools.product(*[values for _, values in boss_sweep + ship_sweep]):
+            boss = {}
+            ship_attrs = {}
+            for key, value in zip(keys, values):
+                if "." in key:
+                    boss_key, field = key.split(".", 1)
+                    boss.setdefault(boss_key, {})[field] = value
+                else:
+                    ship_attrs[key] = value
+            group = " ".join([ship] + [f"{key}={value}" for key, value in zip(keys, values)])
+            for i in range(games):
+                yield {"id": job_id, "group": group, "seed": seed + i, "ship": ship, "ship_attrs": ship_attrs,
+                       "boss": boss, "max_ticks": max_ticks}
+                job_id += 1
+
+def main():
+    parser = argparse.ArgumentParser(description="Jogos sem janela em paralelo (varreduras de balanceamento e replays)")
+    parser.add_argument("--games", type=int, default=100, help="jogos por combinação")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("--ship", action="append", choices=sorted(SHIP_ATTRIBUTES),
+                        help="nave (pode repetir; padrão: nave.png)")
+    parser.add_argument("--all-ships", action="store_true")
+    parser.add_argument("--boss", action="append", default=[], metavar="BOSS.CAMPO=V1,V2",
+                        help=f"variação de BOSS_CONFIGS ({', '.join(BOSS_CONFIGS)})")
+    parser.add_argument("--ship-attr", action="append", default=[], metavar="CAMPO=V1,V2",
+                        help="variação dos atributos da nave (speed, lives, fire_rate)")
+    parser.add_argument("--replays", nargs="+", help="refaz estes replays em vez de jogar")
+    parser.add_argument("--output", default="-", help="resultados em JSONL (padrão: saída padrão)")
+    args = parser.parse_args()
+
+    if args.replays:
+        jobs = ({"id": i, "group": "replays", "replay": path, "max_ticks": args.max_ticks}
+                for i, path in enumerate(args.replays))
+    else:
+        ships = sorted(SHIP_ATTRIBUTES) if args.all_ships else (args.ship or ["nave.png"])
+        try:
+            boss_sweep = parse_sweep(args.boss)
+            ship_sweep = parse_sweep(args.ship_attr)
+        except (argparse.ArgumentTypeError, json.JSONDecodeError) as e:
+            parser.error(str(e))
+        for key, _ in boss_sweep:
+            if key.split(".")[0] not in BOSS_CONFIGS or "." not in key:
+                parser.error(f"boss desconhecido: {key}")
+        jobs = game_jobs(ships, boss_sweep, ship_sweep, args.games, args.seed, args.max_ticks)
+
+    out = sys.stdout if args.output == "-" else open(args.output, 'w')
+    groups = {}
+    finished = 0
+    ticks = 0
+    start = time.perf_counter()
+    try:
+        for result in run_jobs(jobs, args.workers):
+            out.write(json.dumps(result) + "\n")
+            groups.setdefault(result["group"], GroupStats()).add(result)
+            finished += 1
+            ticks += result.get("ticks", 0)
+            if "error" in result:
+                print(f"Erro no jogo {result['id']}: {result['error'].strip().splitlines()[-1]}", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    for group, stats in groups.items():
+        print(f"{group}: {json.dumps(stats.summary())}", file=sys.stderr)
+    print(f"{finished} jogos, {ticks} ticks em {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s "
+          f"com {args.workers} processos)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
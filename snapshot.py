@@ -0,0 +1,176 @@
+# snapshot.py
+# Fotografias binárias do estado completo da partida (nave, formação, tiros, power-ups com
+# os timers, boss e os tiros dele, nível, timers e a posição de cada fluxo aleatório), para
+# save-states, voltar no tempo e rollback. Só struct e os bytes dos arrays: nada de JSON ou
+# pickle, então tirar e restaurar uma fotografia custa microssegundos.
+#
+# Formato (little-endian):
+#   cabeçalho  "GLXS", versão (u8), semente (u64)
+#   jogo       nível, attack_timer, alien_dir, alien_speed, attack_interval, contador e limite
+#              de power-ups, ticks (i64), running (bool), boss (i8, índice em BOSS_CONFIGS ou -1)
+#   nave       x, prev_x (f64), vidas, score, coins, cooldown (i64), speed (f64), fire_rate (i64),
+#              speed e fire_rate iniciais, e (ativo, timer) de cada power-up
+#   boss       x, y, prev_x, prev_y (f64), vida, vida máxima (i64), speed (f64), max_cooldown,
+#              move_dir, cooldown (i64), só se houver boss
+#   stores     formação, tiros da nave, power-ups e tiros do boss: count (u32) e as count
+#              primeiras linhas de cada coluna
+#   aleatório  quantidade (u8) e, por fluxo: nome (u8 + bytes) e o estado (StreamRandom.dump)
+
+import struct
+
+import numpy as np
+
+from boss import BOSS_CONFIGS
+from rng import STATE_SIZE
+
+MAGIC = b"GLXS"
+VERSION = 1
+HEADER = struct.Struct("<4sBQ")
+GAME = struct.Struct("<qqqqqqqq?b")
+POWERUP_KEYS = ("speed", "shield", "double_shot")
+SHIP = struct.Struct("<ddqqqqdqdq" + "?q" * len(POWERUP_KEYS))
+BOSS = struct.Struct("<ddddqqdqqq")
+COUNT = struct.Struct("<I")
+
+BOSS_KEYS = list(BOSS_CONFIGS)
+# classe do store -> (nome, bytes por linha) de cada coluna
+_LAYOUTS = {}
+
+def _layout(store):
+    layout = _LAYOUTS.get(type(store))
+    if layout is None:
+        layout = _LAYOUTS[type(store)] = [(name, np.dtype(dtype).itemsize) for name, dtype in store.COLUMNS.items()]
+    return layout
+
+def _stores(state):
+    stores = [state.formation, state.ship.bullets, state.powerup_store]
+    if state.boss:
+        stores.append(state.boss.bullets)
+    return stores
+
+def snapshot(state):
+    ship = state.ship
+    boss = state.boss
+    powerups = ship.powerups
+    parts = [
+        HEADER.pack(MAGIC, VERSION, state.seed),
+        GAME.pack(state.nivel, state.attack_timer, state.alien_dir, state.alien_speed, state.attack_interval,
+                  state.powerup_spawn_counter, state.powerup_spawn_threshold, state.ticks, state.running,
+                  BOSS_KEYS.index(state.boss_key) if boss else -1),
+        SHIP.pack(ship.x, ship.prev_x, ship.lives, ship.score, ship.coins, ship.cooldown, ship.speed,
+                  ship.fire_rate, ship.initial_speed, ship.initial_fire_rate,
+                  *[value for key in POWERUP_KEYS for value in (powerups[key]["active"], powerups[key]["timer"])])
+    ]
+    if boss:
+        parts.append(BOSS.pack(boss.x, boss.y, boss.prev_x, boss.prev_y, boss.health, boss.max_health,
+                               boss.speed, boss.max_cooldown, boss.move_dir, boss.cooldown))
+    for store in _stores(state):
+        n = store.count
+        parts.append(COUNT.pack(n))
+        for name in store.COLUMNS:
+            parts.append(getattr(store, name)[:n].tobytes())
+
+    streams = state.rng.streams
+    parts.append(bytes([len(streams)]))
+    for name, rng in streams.items():
+        # Um fluxo que não sorteou nada desde a última fotografia reaproveita os mesmos bytes
+        name = name.encode()
+        parts.append(bytes([len(name)]) + name)
+        parts.append(rng.dump())
+    return b"".join(parts)
+
+def restore(state, data):
+    # Sobrescreve o estado da partida com a fotografia, reaproveitando os arrays já alocados
+    data = memoryview(data)
+    magic, version, seed = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("fotografia de estado inválida ou de outra versão")
+    pos = HEADER.size
+    state.seed = state.rng.seed = seed
+
+    (state.nivel, state.attack_timer, state.alien_dir, state.alien_speed, state.attack_interval,
+     state.powerup_spawn_counter, state.powerup_spawn_threshold, state.ticks, state.running,
+     boss_index) = GAME.unpack_from(data, pos)
+    pos += GAME.size
+
+    ship = state.ship
+    values = SHIP.unpack_from(data, pos)
+    pos += SHIP.size
+    (ship.x, ship.prev_x, ship.lives, ship.score, ship.coins, ship.cooldown, ship.speed,
+     ship.fire_rate, ship.initial_speed, ship.initial_fire_rate) = values[:10]
+    for i, key in enumerate(POWERUP_KEYS):
+        ship.powerups[key]["active"], ship.powerups[key]["timer"] = values[10 + 2 * i:12 + 2 * i]
+
+    if boss_index < 0:
+        state.boss = None
+    else:
+        boss_key = BOSS_KEYS[boss_index]
+        if state.boss is None or state.boss_key != boss_key:
+            state.spawn_boss(boss_key)
+        boss = state.boss
+        (boss.x, boss.y, boss.prev_x, boss.prev_y, boss.health, boss.max_health, boss.speed,
+         boss.max_cooldown, boss.move_dir, boss.cooldown) = BOSS.unpack_from(data, pos)
+        pos += BOSS.size
+
+    for store in _stores(state):
+        n, = COUNT.unpack_from(data, pos)
+        pos += COUNT.size
+        if n > store.capacity:
+            store._resize(max(n, store.capacity * 2))
+        for name, itemsize in _layout(store):
+            size = n * itemsize
+            memoryview(getattr(store, name)).cast('B')[:size] = data[pos:pos + size]
+            pos += size
+        store.count = n
+    state.update_alien_views()
+
+    num_streams = data[pos]
+    pos += 1
+    for _ in range(num_streams):
+        size = data[pos]
+        name = bytes(data[pos + 1:pos + 1 + size]).decode()
+        pos += 1 + size
+        state.rng.stream(name).load(data[pos:pos + STATE_SIZE])
+        pos += STATE_SIZE
+    return state
+
+class SnapshotRing:
+    # As últimas capacity fotografias em memória, da mais antiga para a mais nova
+    def __init__(self, capacity):
+        self.slots = [None] * capacity
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, data):
+        # Com o anel cheio, a nova fotografia ocupa o lugar da mais antiga
+        capacity = len(self.slots)
+        self.slots[(self.start + self.count) % capacity] = data
+        if self.count < capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % capacity
+
+    def latest(self, back=0):
+        # back=0 é a mais nova, back=1 a anterior, ...
+        if back >= self.count:
+            return None
+        return self.slots[(self.start + self.count - 1 - back) % len(self.slots)]
+
+    def rewind(self, steps):
+        # Descarta as steps fotografias mais novas e devolve a que ficou por último (ou None).
+        # Assim o que for gravado depois de restaurá-la continua a linha do tempo dela
+        if not self.count:
+            return None
+        steps = min(steps, self.count - 1)
+        for _ in range(steps):
+            self.count -= 1
+            self.slots[(self.start + self.count) % len(self.slots)] = None
+        return self.latest()
+
+    def clear(self):
+        self.slots = [None] * len(self.slots)
+        self.start = 0
+        self.count = 0
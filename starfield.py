@@ -0,0 +1,69 @@
+# starfield.py
+# Campo de estrelas em arrays NumPy: um passo vetorizado por tick e uma única chamada
+# de desenho para todas as estrelas, em camadas de paralaxe (as distantes são menores,
+# mais lentas e mais escuras).
+
+import numpy as np
+from OpenGL.GL import *
+
+WIDTH, HEIGHT = 800, 600
+
+# (fração das estrelas, velocidade mín/máx, tamanho mín/máx, brilho), do fundo para a frente
+STAR_LAYERS = (
+    (0.5, 1.0, 1.6, 1.0, 1.3, 0.6),
+    (0.3, 1.6, 2.3, 1.2, 1.7, 0.8),
+    (0.2, 2.3, 3.0, 1.5, 2.0, 1.0),
+)
+
+class Starfield:
+    def __init__(self, count, layers=STAR_LAYERS, seed=None):
+        # Gerador próprio: as estrelas não consomem números do random do jogo
+        self.rng = np.random.default_rng(seed)
+        self.count = count
+        rng = self.rng
+
+        # Quantidade por camada; a última fica com o resto do arredondamento
+        sizes = [int(count * layer[0]) for layer in layers[:-1]]
+        sizes.append(count - sum(sizes))
+        speed = []
+        size = []
+        color = []
+        for n, (_, speed_min, speed_max, size_min, size_max, brightness) in zip(sizes, layers):
+            speed.append(rng.uniform(speed_min, speed_max, n))
+            size.append(rng.uniform(size_min, size_max, n))
+            color.append(rng.random((n, 3)) * brightness)
+
+        # Ordenadas por camada, então o desenho já sai do fundo para a frente
+        self.x = rng.integers(0, WIDTH + 1, count).astype(np.float64)
+        self.y = rng.integers(0, HEIGHT + 1, count).astype(np.float64)
+        self.speed = np.concatenate(speed)
+        self.size = np.concatenate(size)
+
+        # Cada estrela é um quad de lado "size" centrado na posição; a cor não muda mais
+        corners = np.array([(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5)], np.float32)
+        self.offsets = (self.size[:, None, None] * corners).astype(np.float32)
+        self.rgb = np.repeat(np.concatenate(color).astype(np.float32), 4, axis=0)
+        self.xy = np.zeros((count, 4, 2), np.float32)
+
+    def update(self):
+        self.y -= self.speed
+        wrapped = np.flatnonzero(self.y < 0)
+        if wrapped.size:
+            self.y[wrapped] = HEIGHT
+            self.x[wrapped] = self.rng.integers(0, WIDTH + 1, wrapped.size)
+
+    def draw(self, alpha=1.0):
+        if not self.count:
+            return
+        # Como no resto do jogo, alpha interpola a partir da posição do tick anterior
+        xy = self.xy
+        np.add(self.offsets[:, :, 0], self.x[:, None], out=xy[:, :, 0], casting='unsafe')
+        np.add(self.offsets[:, :, 1], (self.y + (1 - alpha) * self.speed)[:, None], out=xy[:, :, 1], casting='unsafe')
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, xy)
+        glColorPointer(3, GL_FLOAT, 0, self.rgb)
+        glDrawArrays(GL_QUADS, 0, self.count * 4)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import GameState, SHIP_ATTRIBUTES, INPUT_LEFT, INPUT_FIRE
+from replay import Replay
+
+def _recorded():
+    state = GameState(SHIP_ATTRIBUTES["nave.png"], seed=7)
+    replay = Replay(SHIP_ATTRIBUTES["nave.png"], state.seed)
+    for tick in range(600):
+        # Entradas variadas para o trecho de entradas ter muitas sequências
+        actions = INPUT_FIRE if tick % 7 else INPUT_LEFT
+        replay.record(actions)
+        state.step(actions)
+    replay.finish(state)
+    return replay.to_bytes()
+
+def test_round_trip():
+    data = _recorded()
+    assert Replay.from_bytes(data).to_bytes() == data
+
+@pytest.mark.parametrize("cut", [1, 3, 200])
+def test_truncated_replay_is_rejected(cut):
+    data = _recorded()
+    assert len(data) > 200
+    with pytest.raises(ValueError):
+        Replay.from_bytes(data[:-cut])
+
+def test_short_header_is_rejected():
+    data = _recorded()
+    for size in (0, 3, 5, 20):
+        with pytest.raises(ValueError):
+            Replay.from_bytes(data[:size])
@@ -0,0 +1,85 @@
+# text.py
+# Cache de fontes e de textos já renderizados. Cada texto vira uma textura de GL
+# reaproveitada entre frames; as menos usadas são descartadas quando passa do limite de memória.
+
+from collections import OrderedDict
+
+import pygame
+from OpenGL.GL import *
+
+WIDTH, HEIGHT = 800, 600
+FONT_NAME = 'Arial'
+TEXT_CACHE_BYTES = 8 * 1024 * 1024
+
+_fonts = {}
+
+def get_font(size):
+    # SysFont procura a fonte no sistema a cada chamada; aqui isso acontece uma vez por tamanho
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.SysFont(FONT_NAME, size)
+    return font
+
+class TextCache:
+    def __init__(self, max_bytes=TEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        # (texto, tamanho, cor, fundo) -> (tex_id, largura, altura), do menos para o mais recente
+        self.entries = OrderedDict()
+
+    def get(self, text, size, color, background):
+        key = (text, size, color, background)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+
+        if background is None:
+            surface = get_font(size).render(text, True, color)
+        else:
+            surface = get_font(size).render(text, True, color, background)
+        width, height = surface.get_size()
+        text_data = pygame.image.tostring(surface, "RGBA", True)
+
+        tex_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        # NEAREST com o quad alinhado aos pixels copia a imagem exatamente como o glDrawPixels fazia
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
+
+        entry = self.entries[key] = (tex_id, width, height)
+        self.used_bytes += width * height * 4
+        while self.used_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (old_id, old_w, old_h) = self.entries.popitem(last=False)
+            glDeleteTextures([old_id])
+            self.used_bytes -= old_w * old_h * 4
+        return entry
+
+    def clear(self):
+        if self.entries:
+            glDeleteTextures([tex_id for tex_id, _, _ in self.entries.values()])
+        self.entries.clear()
+        self.used_bytes = 0
+
+text_cache = TextCache()
+
+def text_size(text, size=24):
+    return get_font(size).size(text)
+
+def draw_text(x, y, text, size=24, color=(255, 255, 255), background=(0, 0, 0)):
+    # (x, y) é o canto superior esquerdo com y crescendo para baixo, como nas telas do jogo
+    tex_id, width, height = text_cache.get(text, size, color, background)
+    x0 = x
+    y0 = HEIGHT - y - height
+    glEnable(GL_TEXTURE_2D)
+    glBindTexture(GL_TEXTURE_2D, tex_id)
+    glColor4f(1, 1, 1, 1)
+    glBegin(GL_QUADS)
+    glTexCoord2f(0, 0); glVertex2f(x0, y0)
+    glTexCoord2f(1, 0); glVertex2f(x0 + width, y0)
+    glTexCoord2f(1, 1); glVertex2f(x0 + width, y0 + height)
+    glTexCoord2f(0, 1); glVertex2f(x0, y0 + height)
+    glEnd()
+    glDisable(GL_TEXTURE_2D)
+    return width, height
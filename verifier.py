@@ -0,0 +1,133 @@
+# verifier.py
+# Verificação das pontuações enviadas: cada submissão traz o replay da partida (semente e
+# entradas). A partida é refeita sem janela, em paralelo nos processos do runner, e a
+# pontuação só entra no placar se o resultado for exatamente o mesmo.
+#
+#   python verifier.py --submit replays/*.glxr --initials ABC   (envia replays)
+#   python verifier.py --workers 64                              (verifica tudo que está pendente)
+#   python verifier.py --ids 12 --workers 0                      (só a submissão 12; é o que o jogo roda)
+
+import os
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import json
+import struct
+import sys
+import time
+
+from game import SHIP_ATTRIBUTES, SIM_RATE
+from leaderboard import Leaderboard, leaderboard
+from replay import Replay
+from runner import run_job, run_jobs
+
+PAGE_SIZE = 1000 # submissões lidas do banco de cada vez
+RESOLVE_BATCH = 100 # resultados gravados por transação
+MAX_REPLAY_TICKS = SIM_RATE * 3600 # uma hora de jogo; replays maiores são recusados sem simular
+
+def ship_name(ship_attributes):
+    # O replay guarda os atributos da nave; o nome é o da nave com os mesmos atributos
+    for name, attrs in SHIP_ATTRIBUTES.items():
+        if all(attrs[key] == ship_attributes[key] for key in ("speed", "lives", "fire_rate")):
+            return name
+    return None
+
+def replay_job(row):
+    return {"id": row["id"], "group": "submissions", "replay_data": row["replay"], "max_ticks": MAX_REPLAY_TICKS}
+
+def judge(result, score, claimed_ship):
+    # (aceita, nave simulada). A nave do placar é a que o replay simulou, não o nome enviado:
+    # replays com atributos que não são de nenhuma nave, ou de outra nave, são recusados, assim
+    # como os de partidas assistidas (volta no tempo ou save-state)
+    ship = ship_name(result["ship_attributes"]) if "error" not in result else None
+    accepted = ("error" not in result and result["verified"] and not result["assisted"] and
+                result["score"] == score and ship is not None and ship == claimed_ship)
+    return accepted, ship
+
+def verify_pending(board=leaderboard, workers=None, ids=None):
+    # Verifica as submissões pendentes (só as de ids, se dado). workers=0 verifica neste processo
+    # (uma submissão só, como a do jogo local, não compensa subir um pool). Devolve o relatório
+    claimed = {}
+
+    def jobs():
+        if ids is not None:
+            for submission_id in ids:
+                row = board.submission(submission_id)
+                if row and row["status"] == 'pending':
+                    claimed[row["id"]] = (row["score"], row["ship"])
+                    yield replay_job(row)
+            return
+        # Lê as pendentes aos poucos, então a memória não depende do tamanho da fila
+        after_id = 0
+        while True:
+            rows = board.pending(PAGE_SIZE, after_id)
+            if not rows:
+                return
+            for row in rows:
+                claimed[row["id"]] = (row["score"], row["ship"])
+                yield replay_job(row)
+            after_id = rows[-1]["id"]
+
+    report = {"submissions": 0, "accepted": 0, "rejected": 0, "errors": 0, "ticks": 0}
+    resolved = []
+    start = time.perf_counter()
+    results = map(run_job, jobs()) if workers == 0 else run_jobs(jobs(), workers)
+    for result in results:
+        accepted, ship = judge(result, *claimed.pop(result["id"]))
+        report["submissions"] += 1
+        report["accepted"] += accepted
+        report["rejected"] += not accepted
+        report["errors"] += "error" in result
+        report["ticks"] += result.get("ticks", 0)
+        resolved.append((result["id"], accepted, ship))
+        if len(resolved) >= RESOLVE_BATCH:
+            board.resolve(resolved)
+            resolved = []
+    if resolved:
+        board.resolve(resolved)
+
+    elapsed = time.perf_counter() - start
+    report["elapsed"] = round(elapsed, 3)
+    report["submissions_per_s"] = round(report["submissions"] / max(elapsed, 1e-9), 1)
+    report["ticks_per_s"] = round(report["ticks"] / max(elapsed, 1e-9))
+    # Quantas vezes mais rápido que jogar as mesmas partidas em tempo real
+    report["realtime_factor"] = round(report["ticks"] / SIM_RATE / max(elapsed, 1e-9), 1)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica as pontuações enviadas refazendo os replays")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processos (0 = neste processo)")
+    parser.add_argument("--submit", nargs="+", metavar="REPLAY", help="envia estes replays em vez de verificar")
+    parser.add_argument("--initials", default="AAA")
+    parser.add_argument("--ids", nargs="+", type=int, help="verifica só estas submissões")
+    parser.add_argument("--db", help="banco de dados do placar (padrão: o do jogo)")
+    args = parser.parse_args()
+
+    board = Leaderboard(args.db, import_file=None) if args.db else leaderboard
+
+    if args.submit:
+        submitted = 0
+        for path in args.submit:
+            try:
+                replay = Replay.load(path)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Erro: não foi possível ler {path}: {e}")
+                continue
+            try:
+                board.submit(args.initials, replay, ship_name(replay.ship_attributes))
+            except ValueError as e:
+                print(f"Erro: {path}: {e}")
+                continue
+            submitted += 1
+        print(f"{submitted} replays enviados")
+        return
+
+    report = verify_pending(board, args.workers, args.ids)
+    print(json.dumps(report))
+    print(f"{report['submissions']} submissões em {report['elapsed']:.2f}s ({report['submissions_per_s']}/s): "
+          f"{report['accepted']} aceitas, {report['rejected']} rejeitadas ({report['errors']} com erro), "
+          f"{report['realtime_factor']}x o tempo real", file=sys.stderr)
+    board.close()
+
+if __name__ == '__main__':
+    main()